@@ -17,7 +17,8 @@ if TYPE_CHECKING:
 
 @admin.register(Regime)
 class RegimeAdmin(admin.ModelAdmin):
-    list_display = ("name", "background_image", "pk")
+    list_display = ("name", "category", "rarity_rank", "background_image", "pk")
+    list_filter = ("category",)
     search_fields = ("name",)
 
     @admin.display()
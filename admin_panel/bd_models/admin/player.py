@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 from asgiref.sync import async_to_sync
 from django.contrib import admin, messages
 from django.contrib.admin.utils import quote
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils.html import format_html
 from django_admin_action_forms import action_with_form
@@ -13,7 +14,14 @@ from django_admin_inline_paginator.admin import TabularInlinePaginated
 from admin_panel.webhook import notify_admins
 
 from ..forms import BlacklistActionForm, BlacklistedListFilter
-from ..models import BallInstance, BlacklistedID, BlacklistHistory, GuildConfig, Player
+from ..models import (
+    BallInstance,
+    BlacklistedID,
+    BlacklistHistory,
+    BrawlerTrophies,
+    GuildConfig,
+    Player,
+)
 from ..utils import BlacklistTabular
 
 if TYPE_CHECKING:
@@ -38,21 +46,43 @@ class BallInstanceTabular(TabularInlinePaginated):
 
     @admin.display(description="Server")
     def server(self, obj: BallInstance):
-        guild = GuildConfig.objects.get(guild_id=obj.server_id)
-        opts = guild._meta
+        if not obj.server_id:
+            return "-"
+        # the same servers come back on every row, cache their primary key (0 if unknown)
+        guild_pk = cache.get_or_set(
+            f"guildconfig-pk-{obj.server_id}",
+            lambda: GuildConfig.objects.filter(guild_id=obj.server_id)
+            .values_list("pk", flat=True)
+            .first()
+            or 0,
+            timeout=300,
+        )
+        if not guild_pk:
+            return str(obj.server_id)
+        opts = GuildConfig._meta
         admin_url = reverse(
             "%s:%s_%s_change" % (self.admin_site.name, opts.app_label, opts.model_name),
             None,
-            (quote(guild.pk),),
+            (quote(guild_pk),),
         )
         # Display a link to the admin page.
-        return format_html(f'<a href="{admin_url}">{guild}</a>')
+        return format_html(f'<a href="{admin_url}">{obj.server_id}</a>')
+
+
+class BrawlerTrophiesTabular(admin.TabularInline):
+    model = BrawlerTrophies
+    fk_name = "player"
+    extra = 0
+    ordering = ("-trophies",)
+    fields = ("ball", "trophies")
+    autocomplete_fields = ("ball",)
+    classes = ("collapse",)
 
 
 @admin.register(Player)
 class PlayerAdmin(admin.ModelAdmin):
     save_on_top = True
-    inlines = (BlacklistTabular, BallInstanceTabular)
+    inlines = (BlacklistTabular, BrawlerTrophiesTabular, BallInstanceTabular)
 
     list_display = ("discord_id", "pk", "blacklisted")
     list_filter = (BlacklistedListFilter,)
@@ -3,7 +3,6 @@
 from typing import TYPE_CHECKING
 
 import django.db.models.deletion
-from bd_models.models import Economy, Regime, Special
 from django.db import migrations, models
 
 if TYPE_CHECKING:
@@ -12,6 +11,10 @@ if TYPE_CHECKING:
 
 
 def default_models_forward(apps: "Apps", schema_editor: "BaseDatabaseSchemaEditor"):
+    # historical models, later migrations add columns that do not exist yet at this point
+    Economy = apps.get_model("bd_models", "Economy")
+    Regime = apps.get_model("bd_models", "Regime")
+    Special = apps.get_model("bd_models", "Special")
     default_economies = {
         "Capitalist": "capitalist.png",
         "Communist": "communist.png",
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bd_models", "0007_player_trade_cooldown_policy"),
+    ]
+
+    # the unique index is built concurrently by migration 0017
+    operations = [
+        migrations.AddField(
+            model_name="ballinstance",
+            name="spawn_id",
+            field=models.BigIntegerField(
+                blank=True,
+                help_text="ID of the spawn message, a spawn can only be caught once",
+                null=True,
+            ),
+        ),
+    ]
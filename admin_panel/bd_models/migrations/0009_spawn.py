@@ -0,0 +1,90 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bd_models", "0008_ballinstance_spawn_id"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="ballinstance",
+            name="spawn_id",
+            field=models.BigIntegerField(
+                blank=True,
+                help_text="ID of the spawn it was caught from, a spawn can only be caught once",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="Spawn",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "attack_bonus",
+                    models.IntegerField(blank=True, help_text="Forced attack bonus", null=True),
+                ),
+                (
+                    "health_bonus",
+                    models.IntegerField(blank=True, help_text="Forced health bonus", null=True),
+                ),
+                ("fakespawn", models.BooleanField()),
+                ("counted", models.BooleanField(help_text="Counts as a daily catch")),
+                (
+                    "user_timeout",
+                    models.IntegerField(
+                        blank=True,
+                        help_text="Timeout in seconds for users trying to catch it",
+                        null=True,
+                    ),
+                ),
+                (
+                    "algo",
+                    models.CharField(
+                        blank=True, help_text="Spawn algorithm", max_length=64, null=True
+                    ),
+                ),
+                ("caught", models.BooleanField()),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                (
+                    "ball",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="bd_models.ball"
+                    ),
+                ),
+                (
+                    "ballinstance",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Existing instance transferred to the catcher",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="bd_models.ballinstance",
+                    ),
+                ),
+                (
+                    "special",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Special forced on this spawn, otherwise rolled when caught",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="bd_models.special",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "spawn",
+                "managed": True,
+            },
+        ),
+    ]
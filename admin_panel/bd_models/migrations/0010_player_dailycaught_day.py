@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bd_models", "0009_spawn"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="player",
+            name="dailycaught_day",
+            field=models.DateField(
+                blank=True,
+                help_text="Catch day the daily counter applies to, outdated counters are 0",
+                null=True,
+            ),
+        ),
+        # The counters were reset globally until now, so they all belong to the current catch
+        # day. dailycaught is not tracked by the migrations, hence the raw SQL.
+        migrations.RunSQL(
+            "UPDATE player SET dailycaught_day = "
+            "(now() AT TIME ZONE 'UTC' - interval '9 hours')::date WHERE dailycaught > 0",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
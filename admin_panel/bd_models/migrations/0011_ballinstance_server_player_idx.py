@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # the table is too large to be locked while the index is built
+    atomic = False
+
+    dependencies = [
+        ("bd_models", "0010_player_dailycaught_day"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=["server_id", "player"], name="ballinstance_server_player_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bd_models", "0011_ballinstance_server_player_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BrawlerTrophies",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "trophies",
+                    models.IntegerField(
+                        default=0, validators=[django.core.validators.MinValueValidator(0)]
+                    ),
+                ),
+                (
+                    "ball",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="bd_models.ball"
+                    ),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="bd_models.player"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "brawler trophies",
+                "db_table": "brawlertrophies",
+                "managed": True,
+                "indexes": [
+                    models.Index(fields=["ball", "trophies"], name="brawlertrophies_ranking_idx")
+                ],
+                "unique_together": {("player", "ball")},
+            },
+        ),
+        # player.brawler_trophies is not tracked by the migrations, hence the raw SQL. Keys are
+        # ball IDs, entries that are not a number or point to a deleted ball are dropped.
+        migrations.RunSQL(
+            """
+            INSERT INTO brawlertrophies (player_id, ball_id, trophies)
+            SELECT
+                player.id,
+                entry.key::integer,
+                GREATEST((entry.value #>> '{}')::numeric::integer, 0)
+            FROM player, jsonb_each(player.brawler_trophies) AS entry
+            WHERE entry.key ~ '^[0-9]+$'
+                AND jsonb_typeof(entry.value) = 'number'
+                AND EXISTS (SELECT 1 FROM ball WHERE ball.id = entry.key::integer)
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            "ALTER TABLE player DROP COLUMN IF EXISTS brawler_trophies",
+            reverse_sql=[
+                "ALTER TABLE player ADD COLUMN brawler_trophies jsonb DEFAULT '{}'::jsonb",
+                """
+                UPDATE player SET brawler_trophies = trophies.entries
+                FROM (
+                    SELECT player_id, jsonb_object_agg(ball_id::text, trophies) AS entries
+                    FROM brawlertrophies
+                    GROUP BY player_id
+                ) AS trophies
+                WHERE player.id = trophies.player_id
+                """,
+            ],
+        ),
+    ]
@@ -0,0 +1,200 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Applies a list of (player, ball, special, delta) changes to the projection. Rows are written
+# sorted so that concurrent transactions lock them in the same order.
+APPLY_FUNCTION = """
+CREATE FUNCTION inventory_apply(
+    player_ids bigint[], ball_ids bigint[], special_ids bigint[], deltas integer[]
+) RETURNS void LANGUAGE sql AS $$
+    WITH changes AS (
+        SELECT player_id, ball_id, special_id, SUM(delta)::integer AS delta
+        FROM unnest(player_ids, ball_ids, special_ids, deltas)
+            AS change(player_id, ball_id, special_id, delta)
+        GROUP BY player_id, ball_id, special_id
+        HAVING SUM(delta) <> 0
+    ), counts AS (
+        INSERT INTO inventorycount AS entry (player_id, ball_id, special_id, count)
+        SELECT player_id, ball_id, special_id, delta
+        FROM changes
+        ORDER BY player_id, ball_id, special_id
+        ON CONFLICT (player_id, ball_id, special_id)
+        DO UPDATE SET count = entry.count + EXCLUDED.count
+    )
+    INSERT INTO inventorytotal AS entry (player_id, total, specials)
+    SELECT
+        player_id,
+        SUM(delta),
+        COALESCE(SUM(delta) FILTER (WHERE special_id IS NOT NULL), 0)
+    FROM changes
+    GROUP BY player_id
+    ORDER BY player_id
+    ON CONFLICT (player_id)
+    DO UPDATE SET
+        total = entry.total + EXCLUDED.total,
+        specials = entry.specials + EXCLUDED.specials;
+
+    DELETE FROM inventorycount WHERE player_id = ANY(player_ids) AND count = 0;
+    DELETE FROM inventorytotal WHERE player_id = ANY(player_ids) AND total = 0;
+$$
+"""
+
+# Statement-level, so a bulk deletion or transfer is applied at once. Updates are only counted
+# when they change the owner, the ball or the special.
+TRACK_FUNCTION = """
+CREATE FUNCTION inventory_track() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM inventory_apply(
+            array_agg(player_id)::bigint[],
+            array_agg(ball_id)::bigint[],
+            array_agg(special_id)::bigint[],
+            array_agg(1)
+        )
+        FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM inventory_apply(
+            array_agg(player_id)::bigint[],
+            array_agg(ball_id)::bigint[],
+            array_agg(special_id)::bigint[],
+            array_agg(-1)
+        )
+        FROM old_rows;
+    ELSE
+        PERFORM inventory_apply(
+            array_agg(player_id)::bigint[],
+            array_agg(ball_id)::bigint[],
+            array_agg(special_id)::bigint[],
+            array_agg(delta)
+        )
+        FROM (
+            SELECT old_rows.player_id, old_rows.ball_id, old_rows.special_id, -1 AS delta
+            FROM old_rows JOIN new_rows USING (id)
+            WHERE (old_rows.player_id, old_rows.ball_id, old_rows.special_id)
+                IS DISTINCT FROM (new_rows.player_id, new_rows.ball_id, new_rows.special_id)
+            UNION ALL
+            SELECT new_rows.player_id, new_rows.ball_id, new_rows.special_id, 1
+            FROM old_rows JOIN new_rows USING (id)
+            WHERE (old_rows.player_id, old_rows.ball_id, old_rows.special_id)
+                IS DISTINCT FROM (new_rows.player_id, new_rows.ball_id, new_rows.special_id)
+        ) AS changes;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = [
+    "CREATE TRIGGER inventory_insert AFTER INSERT ON ballinstance "
+    "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION inventory_track()",
+    "CREATE TRIGGER inventory_update AFTER UPDATE ON ballinstance "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION inventory_track()",
+    "CREATE TRIGGER inventory_delete AFTER DELETE ON ballinstance "
+    "REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION inventory_track()",
+]
+
+# no instance can change between the initial fill and the creation of the triggers
+FILL = [
+    "LOCK TABLE ballinstance IN SHARE MODE",
+    "INSERT INTO inventorycount (player_id, ball_id, special_id, count) "
+    "SELECT player_id, ball_id, special_id, COUNT(*) FROM ballinstance "
+    "GROUP BY player_id, ball_id, special_id",
+    "INSERT INTO inventorytotal (player_id, total, specials) "
+    "SELECT player_id, COUNT(*), COUNT(special_id) FROM ballinstance GROUP BY player_id",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bd_models", "0012_brawlertrophies"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InventoryCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("count", models.IntegerField()),
+                (
+                    "ball",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        to="bd_models.ball",
+                    ),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        to="bd_models.player",
+                    ),
+                ),
+                (
+                    "special",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        to="bd_models.special",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "inventorycount",
+                "managed": True,
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("player", "ball", "special"),
+                        name="inventorycount_unique",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="InventoryTotal",
+            fields=[
+                (
+                    "player",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        serialize=False,
+                        to="bd_models.player",
+                    ),
+                ),
+                ("total", models.IntegerField()),
+                ("specials", models.IntegerField(help_text="Instances with a special")),
+            ],
+            options={
+                "db_table": "inventorytotal",
+                "managed": True,
+            },
+        ),
+        migrations.RunSQL(
+            [*FILL, APPLY_FUNCTION, TRACK_FUNCTION, *TRIGGERS],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS inventory_insert ON ballinstance",
+                "DROP TRIGGER IF EXISTS inventory_update ON ballinstance",
+                "DROP TRIGGER IF EXISTS inventory_delete ON ballinstance",
+                "DROP FUNCTION IF EXISTS inventory_track()",
+                "DROP FUNCTION IF EXISTS inventory_apply(bigint[], bigint[], bigint[], integer[])",
+            ],
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+# the classification and rarity order that were hardcoded in the bot until now
+CATEGORIES = {
+    2: (22, 23, 24, 25, 26, 27, 35, 37, 38, 39, 40),
+    3: (28,),
+    4: (29,),
+    5: (30, 31, 32),
+    6: (33,),
+    7: (19, 20, 21),
+}
+RARITY_ORDER = (35, 34, 19, 20, 21, 27, 33, 40, 37, 36, 26, 16, 25, 39, 8, 24, 7, 23, 38, 6, 22, 5)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bd_models", "0013_inventorycount_inventorytotal"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="regime",
+            name="category",
+            field=models.SmallIntegerField(
+                choices=[
+                    (1, "Brawler"),
+                    (2, "Skin"),
+                    (3, "Gadget"),
+                    (4, "Star Power"),
+                    (5, "Gear"),
+                    (6, "Hypercharge"),
+                    (7, "Other (not part of any collection)"),
+                ],
+                default=1,
+                help_text="What the balls of this regime are, used by collections and messages",
+            ),
+        ),
+        migrations.AddField(
+            model_name="regime",
+            name="rarity_rank",
+            field=models.IntegerField(
+                blank=True,
+                help_text=(
+                    "Position when sorting by rarity, rarest first. Regimes without one are last"
+                ),
+                null=True,
+            ),
+        ),
+        migrations.RunSQL(
+            [
+                ("UPDATE regime SET category = %s WHERE id = ANY(%s)", [category, list(ids)])
+                for category, ids in CATEGORIES.items()
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            [
+                (
+                    "UPDATE regime SET rarity_rank = ranks.rank FROM unnest(%s::bigint[]) "
+                    "WITH ORDINALITY AS ranks(id, rank) WHERE regime.id = ranks.id",
+                    [list(RARITY_ORDER)],
+                )
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,230 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+from typing import TYPE_CHECKING
+
+import django.db.models.functions.comparison
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+if TYPE_CHECKING:
+    from django.apps.registry import Apps
+    from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+# regimes without a rarity rank are sorted last
+NO_RARITY_RANK = 2**31 - 1
+
+# Computed on the instance itself when it is created or changes ball or bonuses. Only listed
+# columns fire the trigger, the catalog triggers below can update the keys without it.
+INSTANCE_FUNCTION = f"""
+CREATE FUNCTION ballinstance_sort_keys() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    SELECT
+        ball.country,
+        COALESCE(regime.rarity_rank, {NO_RARITY_RANK}),
+        ball.health + NEW.health_bonus,
+        ball.attack + NEW.attack_bonus
+    INTO NEW.sort_country, NEW.sort_rarity, NEW.sort_health, NEW.sort_attack
+    FROM ball
+    JOIN regime ON regime.id = ball.regime_id
+    WHERE ball.id = NEW.ball_id;
+    RETURN NEW;
+END
+$$
+"""
+
+# editing a ball or a regime from the admin panel rewrites the keys of its instances
+BALL_FUNCTION = f"""
+CREATE FUNCTION ball_sort_keys() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE ballinstance SET
+        sort_country = NEW.country,
+        sort_rarity = COALESCE(
+            (SELECT rarity_rank FROM regime WHERE id = NEW.regime_id), {NO_RARITY_RANK}
+        ),
+        sort_health = NEW.health + health_bonus,
+        sort_attack = NEW.attack + attack_bonus
+    WHERE ball_id = NEW.id;
+    RETURN NULL;
+END
+$$
+"""
+
+REGIME_FUNCTION = f"""
+CREATE FUNCTION regime_sort_keys() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE ballinstance SET sort_rarity = COALESCE(NEW.rarity_rank, {NO_RARITY_RANK})
+    FROM ball
+    WHERE ball.id = ballinstance.ball_id AND ball.regime_id = NEW.id;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = [
+    "CREATE TRIGGER ballinstance_sort_keys "
+    "BEFORE INSERT OR UPDATE OF ball_id, health_bonus, attack_bonus ON ballinstance "
+    "FOR EACH ROW EXECUTE FUNCTION ballinstance_sort_keys()",
+    "CREATE TRIGGER ball_sort_keys AFTER UPDATE OF country, regime_id, health, attack ON ball "
+    "FOR EACH ROW WHEN ((OLD.country, OLD.regime_id, OLD.health, OLD.attack) "
+    "IS DISTINCT FROM (NEW.country, NEW.regime_id, NEW.health, NEW.attack)) "
+    "EXECUTE FUNCTION ball_sort_keys()",
+    "CREATE TRIGGER regime_sort_keys AFTER UPDATE OF rarity_rank ON regime "
+    "FOR EACH ROW WHEN (OLD.rarity_rank IS DISTINCT FROM NEW.rarity_rank) "
+    "EXECUTE FUNCTION regime_sort_keys()",
+]
+
+# instances created from now on already go through the trigger
+FILL = f"""
+UPDATE ballinstance SET
+    sort_country = ball.country,
+    sort_rarity = COALESCE(regime.rarity_rank, {NO_RARITY_RANK}),
+    sort_health = ball.health + ballinstance.health_bonus,
+    sort_attack = ball.attack + ballinstance.attack_bonus
+FROM ball
+JOIN regime ON regime.id = ball.regime_id
+WHERE ball.id = ballinstance.ball_id AND ballinstance.id >= %s AND ballinstance.id < %s
+"""
+
+# Each batch is committed on its own: the rows are only locked for one batch, and the
+# statement-level inventory_update trigger only reads the transition tables of one batch.
+FILL_BATCH_SIZE = 10_000
+
+
+def fill_sort_keys(apps: "Apps", schema_editor: "BaseDatabaseSchemaEditor"):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM ballinstance")
+        first, last = cursor.fetchone()
+        if first is None:
+            return
+        for start in range(first, last + 1, FILL_BATCH_SIZE):
+            cursor.execute(FILL, [start, start + FILL_BATCH_SIZE])
+
+
+class Migration(migrations.Migration):
+    # the table is too large to be locked while the indexes are built
+    atomic = False
+
+    dependencies = [
+        ("bd_models", "0014_regime_category_rarity_rank"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ballinstance",
+            name="sort_country",
+            field=models.CharField(default="", editable=False, max_length=48),
+        ),
+        migrations.AddField(
+            model_name="ballinstance",
+            name="sort_rarity",
+            field=models.IntegerField(
+                default=0,
+                editable=False,
+                help_text="Rarity rank of the regime, regimes without one are last",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ballinstance",
+            name="sort_health",
+            field=models.IntegerField(
+                default=0, editable=False, help_text="Ball health plus the bonus"
+            ),
+        ),
+        migrations.AddField(
+            model_name="ballinstance",
+            name="sort_attack",
+            field=models.IntegerField(
+                default=0, editable=False, help_text="Ball attack plus the bonus"
+            ),
+        ),
+        migrations.RunSQL(
+            [INSTANCE_FUNCTION, BALL_FUNCTION, REGIME_FUNCTION, *TRIGGERS],
+            reverse_sql=[
+                "DROP TRIGGER IF EXISTS ballinstance_sort_keys ON ballinstance",
+                "DROP TRIGGER IF EXISTS ball_sort_keys ON ball",
+                "DROP TRIGGER IF EXISTS regime_sort_keys ON regime",
+                "DROP FUNCTION IF EXISTS ballinstance_sort_keys()",
+                "DROP FUNCTION IF EXISTS ball_sort_keys()",
+                "DROP FUNCTION IF EXISTS regime_sort_keys()",
+            ],
+        ),
+        migrations.RunPython(fill_sort_keys, reverse_code=migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=("player", "-favorite", "id"), name="ballinstance_favorite_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=("player", "catch_date", "id"), name="ballinstance_catch_date_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=("player", "health_bonus", "id"), name="ballinstance_health_bonus_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=("player", "attack_bonus", "id"), name="ballinstance_attack_bonus_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                "player",
+                models.F("health_bonus") + models.F("attack_bonus"),
+                "id",
+                name="ballinstance_stats_bonus_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                "player",
+                django.db.models.functions.comparison.Coalesce(
+                    "special", models.Value(2147483647)
+                ),
+                "id",
+                name="ballinstance_special_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=("player", "sort_country", "id"), name="ballinstance_country_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=("player", "sort_rarity", "sort_country", "id"),
+                name="ballinstance_rarity_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=("player", "sort_health", "id"), name="ballinstance_health_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=("player", "sort_attack", "id"), name="ballinstance_attack_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                "player",
+                models.F("sort_health") + models.F("sort_attack"),
+                "id",
+                name="ballinstance_total_stats_idx",
+            ),
+        ),
+    ]
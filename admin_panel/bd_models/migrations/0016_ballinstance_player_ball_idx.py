@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("bd_models", "0015_ballinstance_sort_keys"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="ballinstance",
+            index=models.Index(
+                fields=("player", "ball", "id"), name="ballinstance_player_ball_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # the table is too large to be locked while the index is built
+    atomic = False
+
+    dependencies = [
+        ("bd_models", "0016_ballinstance_player_ball_idx"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ballinstance_spawn_id_uniq "
+                    "ON ballinstance (spawn_id)",
+                    reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS ballinstance_spawn_id_uniq",
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="ballinstance",
+                    name="spawn_id",
+                    field=models.BigIntegerField(
+                        blank=True,
+                        help_text=(
+                            "ID of the spawn it was caught from, a spawn can only be caught once"
+                        ),
+                        null=True,
+                        unique=True,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -6,12 +6,18 @@ from typing import Any, Iterable, cast
 from django.contrib import admin
 from django.core.cache import cache
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
 from django.utils.safestring import SafeText, mark_safe
 from django.utils.timezone import now
 from django.core.validators import MaxValueValidator, MinValueValidator
 
 from ballsdex.settings import settings
 
+# instances without a special are sorted after the specials, same as NO_SPECIAL_ORDER in
+# ballsdex/core/utils/sorting.py
+NO_SPECIAL_ORDER = 2**31 - 1
+
 
 def transform_media(path: str) -> str:
     return path.replace("/static/uploads/", "").replace(
@@ -93,13 +99,17 @@ class Player(models.Model):
     default=0,
     db_index=True,
     )
+    dailycaught_day = models.DateField(
+        blank=True,
+        null=True,
+        help_text="Catch day the daily counter applies to, outdated counters are 0",
+    )
     trophies = models.BigIntegerField(
     help_text="User Trophies",
     default=0,
     db_index=True,
     validators=[MaxValueValidator((1 << 63) - 1), MinValueValidator(0)],
     )
-    brawler_trophies = models.JSONField(default=dict, blank=True)
     donation_policy = models.SmallIntegerField(
         choices=DonationPolicy.choices, help_text="How you want to handle donations"
     )
@@ -152,9 +162,29 @@ class Economy(models.Model):
         verbose_name_plural = "economies"
 
 
+class RegimeCategory(models.IntegerChoices):
+    BRAWLER = 1
+    SKIN = 2
+    GADGET = 3
+    STAR_POWER = 4
+    GEAR = 5
+    HYPERCHARGE = 6
+    OTHER = 7, "Other (not part of any collection)"
+
+
 class Regime(models.Model):
     name = models.CharField(max_length=64)
     background = models.ImageField(max_length=200, help_text="1428x2000 PNG image")
+    category = models.SmallIntegerField(
+        choices=RegimeCategory.choices,
+        default=RegimeCategory.BRAWLER,
+        help_text="What the balls of this regime are, used by collections and messages",
+    )
+    rarity_rank = models.IntegerField(
+        blank=True,
+        null=True,
+        help_text="Position when sorting by rarity, rarest first. Regimes without one are last",
+    )
 
     def __str__(self) -> str:
         return self.name
@@ -323,6 +353,25 @@ class BallInstance(models.Model):
         blank=True, null=True, help_text="If the instance was locked for a trade and when"
     )
     spawned_time = models.DateTimeField(blank=True, null=True)
+    spawn_id = models.BigIntegerField(
+        blank=True,
+        null=True,
+        unique=True,
+        help_text="ID of the spawn it was caught from, a spawn can only be caught once",
+    )
+    # copied from the ball and its regime by database triggers, see migration 0015
+    sort_country = models.CharField(max_length=48, default="", editable=False)
+    sort_rarity = models.IntegerField(
+        default=0,
+        editable=False,
+        help_text="Rarity rank of the regime, regimes without one are last",
+    )
+    sort_health = models.IntegerField(
+        default=0, editable=False, help_text="Ball health plus the bonus"
+    )
+    sort_attack = models.IntegerField(
+        default=0, editable=False, help_text="Ball attack plus the bonus"
+    )
 
     def __getattribute__(self, name: str) -> Any:
         if name == "ball":
@@ -360,6 +409,47 @@ class BallInstance(models.Model):
         managed = True
         db_table = "ballinstance"
         unique_together = (("player", "id"),)
+        indexes = [
+            models.Index(fields=("server_id", "player"), name="ballinstance_server_player_idx"),
+            # autocompletion of instances, see ballsdex/core/utils/search.py
+            models.Index(fields=("player", "ball", "id"), name="ballinstance_player_ball_idx"),
+            # one per sorting method of the bot, see ballsdex/core/utils/sorting.py
+            models.Index(fields=("player", "-favorite", "id"), name="ballinstance_favorite_idx"),
+            models.Index(
+                fields=("player", "catch_date", "id"), name="ballinstance_catch_date_idx"
+            ),
+            models.Index(
+                fields=("player", "health_bonus", "id"), name="ballinstance_health_bonus_idx"
+            ),
+            models.Index(
+                fields=("player", "attack_bonus", "id"), name="ballinstance_attack_bonus_idx"
+            ),
+            models.Index(
+                "player",
+                F("health_bonus") + F("attack_bonus"),
+                "id",
+                name="ballinstance_stats_bonus_idx",
+            ),
+            models.Index(
+                "player",
+                Coalesce("special", Value(NO_SPECIAL_ORDER)),
+                "id",
+                name="ballinstance_special_idx",
+            ),
+            models.Index(fields=("player", "sort_country", "id"), name="ballinstance_country_idx"),
+            models.Index(
+                fields=("player", "sort_rarity", "sort_country", "id"),
+                name="ballinstance_rarity_idx",
+            ),
+            models.Index(fields=("player", "sort_health", "id"), name="ballinstance_health_idx"),
+            models.Index(fields=("player", "sort_attack", "id"), name="ballinstance_attack_idx"),
+            models.Index(
+                "player",
+                F("sort_health") + F("sort_attack"),
+                "id",
+                name="ballinstance_total_stats_idx",
+            ),
+        ]
         verbose_name = f"{settings.collectible_name} instance"
 
 
@@ -452,3 +542,113 @@ class Block(models.Model):
     class Meta:
         managed = True
         db_table = "block"
+
+
+class Spawn(models.Model):
+    ball = models.ForeignKey(Ball, on_delete=models.CASCADE)
+    ball_id: int
+    special = models.ForeignKey(
+        Special,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        help_text="Special forced on this spawn, otherwise rolled when caught",
+    )
+    special_id: int | None
+    attack_bonus = models.IntegerField(blank=True, null=True, help_text="Forced attack bonus")
+    health_bonus = models.IntegerField(blank=True, null=True, help_text="Forced health bonus")
+    ballinstance = models.ForeignKey(
+        BallInstance,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        help_text="Existing instance transferred to the catcher",
+    )
+    ballinstance_id: int | None
+    fakespawn = models.BooleanField()
+    counted = models.BooleanField(help_text="Counts as a daily catch")
+    user_timeout = models.IntegerField(
+        blank=True, null=True, help_text="Timeout in seconds for users trying to catch it"
+    )
+    algo = models.CharField(max_length=64, blank=True, null=True, help_text="Spawn algorithm")
+    caught = models.BooleanField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return str(self.pk)
+
+    class Meta:
+        managed = True
+        db_table = "spawn"
+
+
+class BrawlerTrophies(models.Model):
+    player = models.ForeignKey(Player, on_delete=models.CASCADE)
+    player_id: int
+    ball = models.ForeignKey(Ball, on_delete=models.CASCADE)
+    ball_id: int
+    trophies = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+
+    def __str__(self) -> str:
+        return str(self.pk)
+
+    class Meta:
+        managed = True
+        db_table = "brawlertrophies"
+        verbose_name_plural = "brawler trophies"
+        unique_together = (("player", "ball"),)
+        indexes = [
+            models.Index(fields=["ball", "trophies"], name="brawlertrophies_ranking_idx")
+        ]
+
+
+class InventoryCount(models.Model):
+    # maintained by triggers on ballinstance, without constraints since rows may outlive them
+    player = models.ForeignKey(
+        Player, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False
+    )
+    player_id: int
+    ball = models.ForeignKey(
+        Ball, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False
+    )
+    ball_id: int
+    special = models.ForeignKey(
+        Special,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        blank=True,
+        null=True,
+    )
+    special_id: int | None
+    count = models.IntegerField()
+
+    def __str__(self) -> str:
+        return str(self.pk)
+
+    class Meta:
+        managed = True
+        db_table = "inventorycount"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["player", "ball", "special"],
+                name="inventorycount_unique",
+                nulls_distinct=False,
+            )
+        ]
+
+
+class InventoryTotal(models.Model):
+    player = models.OneToOneField(
+        Player, on_delete=models.DO_NOTHING, db_constraint=False, primary_key=True
+    )
+    player_id: int
+    total = models.IntegerField()
+    specials = models.IntegerField(help_text="Instances with a special")
+
+    def __str__(self) -> str:
+        return str(self.player_id)
+
+    class Meta:
+        managed = True
+        db_table = "inventorytotal"
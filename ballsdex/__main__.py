@@ -84,7 +84,8 @@ def parse_cli_flags(arguments: list[str]) -> CLIFlags:
     )
     parser.add_argument("--debug", action="store_true", help="Enable debug logs")
     parser.add_argument("--dev", action="store_true", help="Enable developer mode")
-    parser.add_argument("--enable-catch-reset", action="store_true", help="Enables the Daily Catch Reset")
+    # daily catches are now reset lazily, the flag is kept to not break existing setups
+    parser.add_argument("--enable-catch-reset", action="store_true", help=argparse.SUPPRESS)
     args = parser.parse_args(arguments, namespace=CLIFlags())
     return args
 
@@ -319,6 +320,12 @@ def main():
             patch_gateway(settings.gateway_url)
             logging.getLogger("discord.gateway").addFilter(RemoveWSBehindMsg())
 
+        if cli_flags.enable_catch_reset:
+            log.warning(
+                "--enable-catch-reset is deprecated and does nothing, "
+                "daily catches now start over on their own."
+            )
+
         prefix = settings.prefix
 
         try:
@@ -335,7 +342,6 @@ def main():
             disable_message_content=cli_flags.disable_message_content,
             disable_time_check=cli_flags.disable_time_check,
             skip_tree_sync=cli_flags.skip_tree_sync,
-            enable_catch_reset=cli_flags.enable_catch_reset,
         )
 
         loop.run_until_complete(init_sentry())
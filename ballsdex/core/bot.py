@@ -12,8 +12,6 @@ from typing import TYPE_CHECKING, Self, cast, Tuple
 import aiohttp
 import discord
 import discord.gateway
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from functools import partial
 from aiohttp import ClientTimeout
 from cachetools import TTLCache
 from discord import app_commands
@@ -41,10 +39,21 @@ from ballsdex.core.models import (
     regimes,
     specials,
 )
+from ballsdex.core.utils.catalog import catalog
+from ballsdex.core.utils.catch_names import catch_name_index
+from ballsdex.core.utils.counters import counter_buffer
+from ballsdex.core.utils.display import display_cache
+from ballsdex.core.utils.guild_configs import guild_configs
+from ballsdex.core.utils.owned_balls import owned_balls
+from ballsdex.core.utils.players import player_cache
+from ballsdex.core.utils.search import ball_search_index
+from ballsdex.core.utils.specials import special_schedule
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
     from discord.ext.commands.bot import PrefixType
+
+    from ballsdex.packages.countryballs.extra_spawns import SpawnScheduler
     
 log = logging.getLogger("ballsdex.core.bot")
 http_counter = Histogram("discord_http_requests", "HTTP requests", ["key", "code"])
@@ -138,7 +147,6 @@ class BallsDexBot(commands.AutoShardedBot):
         disable_time_check: bool = False,
         skip_tree_sync: bool = False,
         dev: bool = False,
-        enable_catch_reset: bool = False,
         **options,
     ):
         # An explaination for the used intents
@@ -165,7 +173,6 @@ class BallsDexBot(commands.AutoShardedBot):
         super().__init__(command_prefix, intents=intents, tree_cls=CommandTree, **options)
         self.tree.disable_time_check = disable_time_check  # type: ignore
         self.skip_tree_sync = skip_tree_sync
-        self.enable_catch_reset = enable_catch_reset
 
         self.dev = dev
         self.prometheus_server: PrometheusServer | None = None
@@ -181,6 +188,7 @@ class BallsDexBot(commands.AutoShardedBot):
         self.catch_log: set[int] = set()
         self.command_log: set[int] = set()
         self.locked_balls = TTLCache(maxsize=99999, ttl=60 * 30)
+        self.spawn_scheduler: SpawnScheduler | None = None
 
         self.owner_ids: set[int]
 
@@ -242,11 +250,16 @@ class BallsDexBot(commands.AutoShardedBot):
         balls.clear()
         for ball in await Ball.all():
             balls[ball.pk] = ball
+        catch_name_index.accent_insensitive = settings.catch_accent_insensitive
+        catch_name_index.typo_tolerant = settings.catch_typo_tolerant
+        catch_name_index.rebuild(balls.values())
+        ball_search_index.rebuild(balls.values())
         table.add_row(settings.collectible_name.title() + "s", str(len(balls)))
 
         regimes.clear()
         for regime in await Regime.all():
             regimes[regime.pk] = regime
+        catalog.rebuild(balls.values(), regimes)
         table.add_row("Regimes", str(len(regimes)))
 
         economies.clear()
@@ -257,8 +270,11 @@ class BallsDexBot(commands.AutoShardedBot):
         specials.clear()
         for special in await Special.all():
             specials[special.pk] = special
+        special_schedule.rebuild(specials.values())
         table.add_row("Special events", str(len(specials)))
 
+        display_cache.rebuild(self, balls.values(), specials.values())
+
         self.blacklist = set()
         for blacklisted_id in await BlacklistedID.all().only("discord_id"):
             self.blacklist.add(blacklisted_id.discord_id)
@@ -269,6 +285,11 @@ class BallsDexBot(commands.AutoShardedBot):
             self.blacklist_guild.add(blacklisted_id.discord_id)
         table.add_row("Blacklisted guilds", str(len(self.blacklist_guild)))
 
+        # fetched again on demand, picks up the changes made from the admin panel
+        guild_configs.clear()
+        player_cache.clear()
+        owned_balls.clear()
+
         log.info("Cache loaded, summary displayed below:")
         console = Console()
         console.print(table)
@@ -292,6 +313,7 @@ class BallsDexBot(commands.AutoShardedBot):
 
     async def setup_hook(self) -> None:
         await self.tree.set_translator(Translator())
+        counter_buffer.start()
         log.info("Starting up with %s shards...", self.shard_count)
         if settings.gateway_url is None:
             return
@@ -305,6 +327,15 @@ class BallsDexBot(commands.AutoShardedBot):
             log.warning("Gateway proxy is not ready yet, waiting 30 more seconds...")
             await asyncio.sleep(30)
 
+    async def close(self) -> None:
+        if self.spawn_scheduler:
+            self.spawn_scheduler.stop()
+        try:
+            await counter_buffer.stop()
+        except Exception:
+            log.exception("Failed to write the pending player counters")
+        await super().close()
+
     async def on_ready(self):
         if self.cogs != {}:
             return  # bot is reconnecting, no need to setup again
@@ -389,28 +420,19 @@ class BallsDexBot(commands.AutoShardedBot):
             f"\n    [bold][red]{settings.bot_name} bot[/red] [green]"
             "is now operational![/green][/bold]\n"
         )
-        if self.enable_catch_reset:
-            from ballsdex.packages.countryballs.dailycaughtreset import dailycaughtreset
-            log.info("Attempting to enable the Daily Catch Reset...")
-            try:
-                scheduler = AsyncIOScheduler()
-                scheduler.add_job(partial(dailycaughtreset, self), 'cron', hour=9, minute=0)
-                scheduler.start()
-                log.info("Successfully enabled the Daily Catch Reset!")
-            except Exception:
-                log.error("Failed to enable the Daily Catch Reset.", exc_info=True)
-        else:
-            log.warning("Daily Catch Reset is not enabled, you may need to reset the catches manually unless you enable it with '--enable-catch-reset' flag.")
-        from ballsdex.packages.countryballs.extra_spawns import pay_to_win_spawner, basic_spawner
+        from ballsdex.packages.countryballs.extra_spawns import (
+            EXTRA_SPAWN_SCHEDULES,
+            SpawnScheduler,
+        )
         log.info("Attempting to enable the extra spawns...")
         try:
-            asyncio.create_task(pay_to_win_spawner(self))
-            log.info("P2W spawner is successfully enabled!")
-            asyncio.create_task(basic_spawner(self))
-            log.info("Basic spawner is successfully enabled!")
+            self.spawn_scheduler = SpawnScheduler(self, EXTRA_SPAWN_SCHEDULES)
+            self.spawn_scheduler.start()
+            log.info(
+                f"Extra spawns enabled: {', '.join(x.name for x in EXTRA_SPAWN_SCHEDULES)}"
+            )
         except Exception as e:
-            log.critical("Failed to enable one of the extra spawns.", exc_info=e)
-            
+            log.critical("Failed to enable the extra spawns.", exc_info=e)
 
     async def blacklist_check(self, interaction: discord.Interaction[Self]) -> bool:
         blacklisted_emoji = await interaction.client.fetch_application_emoji(1389157054811476081)
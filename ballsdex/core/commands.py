@@ -8,7 +8,8 @@ from discord.ext import commands
 from tortoise import Tortoise
 
 from ballsdex.core.dev import pagify, send_interactive
-from ballsdex.core.models import Ball
+from ballsdex.core.models import Ball, balls
+from ballsdex.core.utils.catch_names import catch_name_index
 from ballsdex.settings import settings
 
 log = logging.getLogger("ballsdex.core.commands")
@@ -112,6 +113,55 @@ class Core(commands.Cog):
         t2 = time.time()
         await ctx.send(f"Analyzed database in {round((t2 - t1) * 1000)}ms.")
 
+    @commands.command()
+    @commands.is_owner()
+    async def benchcatchnames(self, ctx: commands.Context, rounds: int = 20):
+        """
+        Benchmark the catch name index with every accepted name of the catalog.
+
+        Each name is checked once as a correct guess and once as a wrong guess, and compared
+        with normalizing all the names of the ball on every guess.
+        """
+        t1 = time.perf_counter()
+        catch_name_index.rebuild(balls.values())
+        build_time = time.perf_counter() - t1
+
+        guesses = [
+            (ball, name)
+            for ball in balls.values()
+            for name in catch_name_index.accepted_names(ball)
+        ]
+        if not guesses:
+            await ctx.send(f"No {settings.plural_collectible_name} found.")
+            return
+
+        t1 = time.perf_counter()
+        for _ in range(rounds):
+            for ball, name in guesses:
+                catch_name_index.match(ball, name)
+        hit_time = time.perf_counter() - t1
+
+        t1 = time.perf_counter()
+        for _ in range(rounds):
+            for ball, name in guesses:
+                catch_name_index.match(ball, name + "##")
+        miss_time = time.perf_counter() - t1
+
+        t1 = time.perf_counter()
+        for _ in range(rounds):
+            for ball, name in guesses:
+                catch_name_index.normalize(name) in catch_name_index.index_ball(ball)
+        rebuild_time = time.perf_counter() - t1
+
+        total = rounds * len(guesses)
+        await ctx.send(
+            f"Indexed {len(guesses)} names of {len(balls)} {settings.plural_collectible_name} "
+            f"in {round(build_time * 1000, 2)}ms.\n"
+            f"Correct guess: {round(hit_time / total * 1e6, 2)}µs\n"
+            f"Wrong guess: {round(miss_time / total * 1e6, 2)}µs\n"
+            f"Without index: {round(rebuild_time / total * 1e6, 2)}µs"
+        )
+
     @commands.command()
     @commands.is_owner()
     async def migrateemotes(self, ctx: commands.Context):
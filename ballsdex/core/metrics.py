@@ -16,6 +16,24 @@ log = logging.getLogger("ballsdex.core.metrics")
 caught_balls = Counter(
     "caught_cb", "Caught countryballs", ["country", "special", "guild_size", "spawn_algo"]
 )
+scheduled_spawn_lag = Histogram(
+    "scheduled_spawn_lag",
+    "Delay between the planned and actual run of a spawn schedule",
+    ["schedule"],
+)
+scheduled_spawn_duration = Histogram(
+    "scheduled_spawn_duration", "Time taken by one run of a spawn schedule", ["schedule"]
+)
+scheduled_spawn_failures = Counter(
+    "scheduled_spawn_failures", "Failed runs of a spawn schedule", ["schedule"]
+)
+# the p50 and p99 are read with histogram_quantile, Discord gives up on a choice after 3 seconds
+autocomplete_duration = Histogram(
+    "autocomplete_duration",
+    "Time taken to answer an autocompletion",
+    ["transformer"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 3.0, float("inf")),
+)
 
 
 class PrometheusServer:
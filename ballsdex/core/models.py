@@ -1,18 +1,19 @@
 from __future__ import annotations
 
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from enum import IntEnum
 from io import BytesIO
 from typing import TYPE_CHECKING, Iterable, Tuple, Type
 
 import discord
 from discord.utils import format_dt
-from tortoise import exceptions, fields, models, signals, timezone, validators
+from tortoise import Tortoise, exceptions, fields, models, signals, timezone, validators
 from tortoise.contrib.postgres.indexes import PostgreSQLIndex
 from tortoise.expressions import Q
 
 from ballsdex.core.image_generator.image_gen import draw_card
+from ballsdex.core.utils.display import SPECIAL_FALLBACK_EMOJI, display_cache
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -26,6 +27,9 @@ regimes: dict[int, Regime] = {}
 economies: dict[int, Economy] = {}
 specials: dict[int, Special] = {}
 
+# hour (UTC) at which the daily catch counters start over
+DAILY_RESET_HOUR = 9
+
 plevel_emojis=[
     1366783166941102081,
     1366783917314674698,
@@ -86,24 +90,6 @@ PRO_SKIN_REGIMES = [
 CHINA_SKIN_REGIMES = [
     37
 ]
-RARITY_EMOJIS = {
-    "Rare": 1330493249235714189,
-    "Super Rare": 1330493410884456528,
-    "Epic": 1330493427011555460,
-    "Mythic": 1330493448469483580,
-    "Legendary": 1330493465221529713,
-    "Ultra Legendary": 1368271368382320761,
-    "Rare Skin": 1329613491216322613,
-    "Super Rare Skin": 1329613550746075178,
-    "Epic Skin": 1329613562376622122,
-    "Mythic Skin": 1329613573843980378,
-    "Legendary Skin": 1329613584644182048,
-    "Ultimate Skin": 1374258318297665556,
-    "Hypercharge Skin": 1329613598720393337,
-    "Super Pro Skin": 1329613550746075178,
-    "Mythic Pro Skin": 1329613573843980378,
-    "Hyper Pro Skin": 1329613598720393337
-}
 SKIN_THEMES = {
     10: 1385477217269583892,
     14: 1329613598720393337,
@@ -147,6 +133,16 @@ FAME_SPECIALS = [
     14,
     15
 ]
+
+
+def bonus_stat(base: int, bonus: int) -> int:
+    """
+    Return the health or attack of an instance from the one of its ball and its bonus, in
+    percents.
+    """
+    return base + int(base * bonus * 0.01)
+
+
 async def lower_catch_names(
     model: Type[Ball],
     instance: Ball,
@@ -194,9 +190,28 @@ class GuildConfig(models.Model):
         default=False,
     )
 
+class RegimeCategory(IntEnum):
+    BRAWLER = 1
+    SKIN = 2
+    GADGET = 3
+    STAR_POWER = 4
+    GEAR = 5
+    HYPERCHARGE = 6
+    OTHER = 7  # not part of any collection
+
+
 class Regime(models.Model):
     name = fields.CharField(max_length=64)
     background = fields.CharField(max_length=200, description="1428x2000 PNG image")
+    category = fields.IntEnumField(
+        RegimeCategory,
+        description="What the balls of this regime are, used by collections and messages",
+        default=RegimeCategory.BRAWLER,
+    )
+    rarity_rank = fields.IntField(
+        null=True,
+        description="Position when sorting by rarity, rarest first. Regimes without one are last",
+    )
 
     def __str__(self):
         return self.name
@@ -349,13 +364,37 @@ class BallInstance(models.Model):
         default=None,
     )
     extra_data = fields.JSONField(default={})
+    spawn_id = fields.BigIntField(
+        description="ID of the spawn it was caught from, a spawn can only be caught once",
+        null=True,
+        unique=True,
+    )
+    # copied from the ball and its regime by database triggers so that each sorting method is
+    # an index scan, the values written from here are ignored
+    sort_country = fields.CharField(max_length=48, default="")
+    sort_rarity = fields.IntField(
+        default=0, description="Rarity rank of the regime, regimes without one are last"
+    )
+    sort_health = fields.IntField(default=0, description="Ball health plus the bonus")
+    sort_attack = fields.IntField(default=0, description="Ball attack plus the bonus")
 
     class Meta:
         unique_together = ("player", "id")
+        # the indexes on expressions (stats bonus, total stats, specials) and the descending
+        # favorites index are only declared in the admin panel migrations
         indexes = [
             PostgreSQLIndex(fields=("ball_id",)),
             PostgreSQLIndex(fields=("player_id",)),
             PostgreSQLIndex(fields=("special_id",)),
+            PostgreSQLIndex(fields=("server_id", "player_id")),
+            PostgreSQLIndex(fields=("player_id", "ball_id", "id")),
+            PostgreSQLIndex(fields=("player_id", "catch_date", "id")),
+            PostgreSQLIndex(fields=("player_id", "health_bonus", "id")),
+            PostgreSQLIndex(fields=("player_id", "attack_bonus", "id")),
+            PostgreSQLIndex(fields=("player_id", "sort_country", "id")),
+            PostgreSQLIndex(fields=("player_id", "sort_rarity", "sort_country", "id")),
+            PostgreSQLIndex(fields=("player_id", "sort_health", "id")),
+            PostgreSQLIndex(fields=("player_id", "sort_attack", "id")),
         ]
 
     @property
@@ -368,13 +407,11 @@ class BallInstance(models.Model):
 
     @property
     def attack(self) -> int:
-        bonus = int(self.countryball.attack * self.attack_bonus * 0.01)
-        return self.countryball.attack + bonus
+        return bonus_stat(self.countryball.attack, self.attack_bonus)
 
     @property
     def health(self) -> int:
-        bonus = int(self.countryball.health * self.health_bonus * 0.01)
-        return self.countryball.health + bonus
+        return bonus_stat(self.countryball.health, self.health_bonus)
 
     @property
     def special_card(self) -> str | None:
@@ -392,6 +429,21 @@ class BallInstance(models.Model):
     def __str__(self) -> str:
         return self.to_string()
 
+    @property
+    def power_level(self) -> str:
+        """
+        Level shown next to the instance, "?" when its bonuses do not match any level.
+        """
+        if "Buzz Lightyear" in self.countryball.country:
+            return "∞"
+        if (
+            not (0 <= self.attack_bonus <= 100)
+            or not (0 <= self.health_bonus <= 100)
+            or self.attack_bonus != self.health_bonus
+        ):
+            return "?"
+        return str(int((self.attack_bonus + 10) / 10))
+
     def to_string(self, bot: discord.Client | None = None, is_trade: bool = False) -> str:
         emotes = ""
         if bot and self.pk in bot.locked_balls and not is_trade:  # type: ignore
@@ -403,27 +455,21 @@ class BallInstance(models.Model):
         if self.specialcard:
             emotes += self.special_emoji(bot)
         country = (
-            self.countryball.country
+            display_cache.ball(self.countryball).name
             if isinstance(self.countryball, Ball)
             else f"<Ball {self.ball_id}>"
         )
         return f"{emotes}#{self.pk:0X} {country}"
 
     def special_emoji(self, bot: discord.Client | None, use_custom_emoji: bool = True) -> str:
-        if self.specialcard:
-            if not use_custom_emoji:
-                return "⚡ "
-            special_emoji = ""
-            try:
-                emoji_id = int(self.specialcard.emoji)
-                special_emoji = bot.get_emoji(emoji_id) if bot else "⚡ "
-            except ValueError:
-                special_emoji = self.specialcard.emoji
-            except TypeError:
-                return ""
-            if special_emoji:
-                return f"{special_emoji} "
-        return ""
+        if not self.specialcard:
+            return ""
+        if not use_custom_emoji:
+            return SPECIAL_FALLBACK_EMOJI
+        fragments = display_cache.special(self.specialcard)
+        if fragments.custom_emoji and not bot:
+            return SPECIAL_FALLBACK_EMOJI
+        return fragments.emoji_text
 
     def description(
         self,
@@ -434,27 +480,15 @@ class BallInstance(models.Model):
         is_trade: bool = False,
     ) -> str:
         text = self.to_string(bot, is_trade=is_trade)
-        if "Buzz Lightyear" in self.countryball.country:
-                descplevel = "∞"
-        elif (
-                 not (0 <= self.attack_bonus <= 100) or
-                 not (0 <= self.health_bonus <= 100) or
-                 self.attack_bonus != self.health_bonus
-             ):
-                descplevel = "?"
-        else:
-                descplevel = int((self.attack_bonus + 10) / 10)
         if not short:
-            text += f" (Power Level {descplevel})"
+            text += f" (Power Level {self.power_level})"
         if include_emoji:
             if not bot:
                 raise TypeError(
                     "You need to provide the bot argument when using with include_emoji=True"
                 )
             if isinstance(self.countryball, Ball):
-                emoji = bot.get_emoji(self.countryball.emoji_id)
-                if emoji:
-                    text = f"{emoji} {text}"
+                text = display_cache.ball(self.countryball).emoji_text + text
         return text
 
     def draw_card(self) -> BytesIO:
@@ -502,14 +536,13 @@ class BallInstance(models.Model):
         special_name = ""
         special_wiki_link = ""
         formatted_special_text = ""
-        rarity_emoji = ""
         skin_theme = ""
         skin_theme_emoji = ""
         skin_type = ""
         skin_type_emoji = ""
         formatted_second_row = ""
-        if self.ball.regime.name in RARITY_EMOJIS.keys():
-            rarity_emoji = interaction.client.get_emoji(RARITY_EMOJIS.get(self.ball.regime.name))
+        fragments = display_cache.ball(self.countryball)
+        rarity_emoji = fragments.rarity_emoji
         if self.countryball.economy_id in SKIN_THEMES.keys():
             skin_theme = f"[{self.ball.economy.name}](https://brawldex.fandom.com/wiki/{self.ball.economy.name.replace(" ", "_")})"
             skin_theme_emoji = interaction.client.get_emoji(SKIN_THEMES.get(self.countryball.economy_id))
@@ -536,7 +569,7 @@ class BallInstance(models.Model):
             special_name = f"[{self.specialcard.name}](<{special_wiki_link}>)"
             special_emoji = self.special.emoji
             formatted_special_text = f"({special_name} {special_emoji})"
-        emoji = interaction.client.get_emoji(self.countryball.emoji_id)
+        emoji = fragments.emoji or ""
         plevel = int((self.attack_bonus + 10) / 10)
         if "Buzz Lightyear" in self.countryball.country:
             plevel_emoji = interaction.client.get_emoji(1367815787078877244)
@@ -548,9 +581,7 @@ class BallInstance(models.Model):
             plevel_emoji = interaction.client.get_emoji(1366788841549336777)
         else:
             plevel_emoji = interaction.client.get_emoji(plevel_emojis[plevel-1])
-        formatted_brawler_name = self.countryball.country
-        if " " in self.countryball.country:
-            formatted_brawler_name = self.countryball.country.replace(" ", "_")
+        formatted_brawler_name = fragments.wiki_name
         if formatted_second_row != "":
             content = (
                 f"[{self.countryball.country}](<https://brawldex.fandom.com/wiki/{formatted_brawler_name}>) {emoji}{plevel_emoji}{rarity_emoji} {formatted_special_text}\n"
@@ -586,6 +617,53 @@ class BallInstance(models.Model):
         return self.locked is not None and (self.locked + timedelta(minutes=30)) > timezone.now()
 
 
+class Spawn(models.Model):
+    """
+    State of a spawned countryball, loaded when its catch button is used. This lets spawns
+    survive restarts without keeping a view in memory.
+    """
+
+    id: int
+    ball_id: int
+    special_id: int | None
+    ballinstance_id: int | None
+
+    ball: fields.ForeignKeyRelation[Ball] = fields.ForeignKeyField(
+        "models.Ball", related_name="spawns"
+    )
+    special: fields.ForeignKeyRelation[Special] | None = fields.ForeignKeyField(
+        "models.Special",
+        null=True,
+        default=None,
+        on_delete=fields.SET_NULL,
+        related_name="spawns",
+        description="Special forced on this spawn, otherwise rolled when caught",
+    )
+    attack_bonus = fields.IntField(null=True, description="Forced attack bonus")
+    health_bonus = fields.IntField(null=True, description="Forced health bonus")
+    ballinstance: fields.ForeignKeyRelation[BallInstance] | None = fields.ForeignKeyField(
+        "models.BallInstance",
+        null=True,
+        default=None,
+        related_name="spawns",
+        description="Existing instance transferred to the catcher",
+    )
+    fakespawn = fields.BooleanField(default=False)
+    counted = fields.BooleanField(default=True, description="Counts as a daily catch")
+    user_timeout = fields.IntField(
+        null=True, description="Timeout in seconds for users trying to catch it"
+    )
+    algo = fields.CharField(max_length=64, null=True, description="Spawn algorithm")
+    caught = fields.BooleanField(default=False)
+    expires_at = fields.DatetimeField()
+
+    def __str__(self) -> str:
+        return str(self.pk)
+
+    class Meta:
+        indexes = [PostgreSQLIndex(fields=("expires_at",))]
+
+
 class DonationPolicy(IntEnum):
     ALWAYS_ACCEPT = 1
     REQUEST_APPROVAL = 2
@@ -615,6 +693,14 @@ class TradeCooldownPolicy(IntEnum):
     BYPASS = 2
 
 
+def catch_day(when: datetime | None = None) -> date:
+    """
+    Return the catch day of a moment, days change at `DAILY_RESET_HOUR` UTC.
+    """
+    when = when or datetime.now(UTC)
+    return (when.astimezone(UTC) - timedelta(hours=DAILY_RESET_HOUR)).date()
+
+
 class Player(models.Model):
     discord_id = fields.BigIntField(
         description="Discord user ID", unique=True, validators=[DiscordSnowflakeValidator()]
@@ -640,13 +726,15 @@ class Player(models.Model):
     validators=[validators.MaxValueValidator(1000), validators.MinValueValidator(0)],
     default=0,
     )
+    dailycaught_day: fields.Field[date] | None = fields.DateField(
+        null=True, description="Catch day the daily counter applies to, outdated counters are 0"
+    )
     trophies = fields.IntField(
     description="User Trophies",
     default=0,
     index=True,
     validators=[validators.MaxValueValidator((1 << 63) - 1), validators.MinValueValidator(0)],
     )
-    brawler_trophies = fields.JSONField(default={}, null=True)
     donation_policy = fields.IntEnumField(
         DonationPolicy,
         description="How you want to handle donations",
@@ -674,10 +762,20 @@ class Player(models.Model):
     )
     extra_data = fields.JSONField(default=dict)
     balls: fields.BackwardFKRelation[BallInstance]
+    brawler_trophies: fields.BackwardFKRelation[BrawlerTrophies]
+    inventory: fields.BackwardFKRelation[InventoryCount]
 
     def __str__(self) -> str:
         return str(self.discord_id)
 
+    @property
+    def current_dailycaught(self) -> int:
+        """
+        The number of counted catches of the current catch day. The stored counter is only
+        reset by the next catch, so it may be from a previous day.
+        """
+        return self.dailycaught if self.dailycaught_day == catch_day() else 0
+
     async def is_friend(self, other_player: "Player") -> bool:
         return await Friendship.filter(
             (Q(player1=self) & Q(player2=other_player))
@@ -691,6 +789,117 @@ class Player(models.Model):
     def can_be_mentioned(self) -> bool:
         return self.mention_policy == MentionPolicy.ALLOW
 
+    async def get_brawler_trophies(self) -> dict[int, int]:
+        """
+        Return the trophies of the player with each brawler, keyed by ball ID. Brawlers without
+        trophies are missing.
+        """
+        return dict(
+            await BrawlerTrophies.filter(player_id=self.pk).values_list("ball_id", "trophies")
+        )
+
+    async def add_brawler_trophies(self, ball_id: int, trophies: int) -> int:
+        """
+        Add trophies to those of the player with a brawler, in a single statement safe against
+        concurrent updates.
+
+        Returns
+        -------
+        int
+            The new trophy count of the player with this brawler.
+        """
+        connection = Tortoise.get_connection("default")
+        _, rows = await connection.execute_query(
+            "INSERT INTO brawlertrophies (player_id, ball_id, trophies) VALUES ($1, $2, $3) "
+            "ON CONFLICT (player_id, ball_id) "
+            "DO UPDATE SET trophies = brawlertrophies.trophies + EXCLUDED.trophies "
+            "RETURNING trophies",
+            [self.pk, ball_id, trophies],
+        )
+        return rows[0]["trophies"]
+
+
+class BrawlerTrophies(models.Model):
+    """
+    The trophies of a player with one brawler. Only the regimes listed in
+    `countryball.TROPHY_REGIMES` earn trophies.
+    """
+
+    player_id: int
+    ball_id: int
+
+    player: fields.ForeignKeyRelation[Player] = fields.ForeignKeyField(
+        "models.Player", related_name="brawler_trophies"
+    )
+    ball: fields.ForeignKeyRelation[Ball] = fields.ForeignKeyField(
+        "models.Ball", related_name="brawler_trophies"
+    )
+    trophies = fields.IntField(default=0, validators=[validators.MinValueValidator(0)])
+
+    def __str__(self) -> str:
+        return str(self.pk)
+
+    @classmethod
+    async def top(cls, ball_id: int, limit: int) -> list[tuple[int, int]]:
+        """
+        Return the players with the most trophies with a brawler, as ``(player_id, trophies)``
+        tuples ordered by descending trophies.
+        """
+        return await (
+            cls.filter(ball_id=ball_id, trophies__gt=0)
+            .order_by("-trophies", "player_id")
+            .limit(limit)
+            .values_list("player_id", "trophies")
+        )  # type: ignore
+
+    class Meta:
+        unique_together = ("player", "ball")
+        # per-brawler rankings
+        indexes = [PostgreSQLIndex(fields=("ball_id", "trophies"))]
+
+
+class InventoryCount(models.Model):
+    """
+    Number of instances of a ball, with a special or not, owned by a player.
+
+    Maintained by triggers on the ``ballinstance`` table in the same transaction as the change,
+    never write it directly. Rows reaching 0 are deleted. See `ballsdex.core.utils.inventory`.
+    """
+
+    player_id: int
+    ball_id: int
+    special_id: int | None
+
+    player: fields.ForeignKeyRelation[Player] = fields.ForeignKeyField(
+        "models.Player", related_name="inventory", db_constraint=False
+    )
+    ball: fields.ForeignKeyRelation[Ball] = fields.ForeignKeyField(
+        "models.Ball", related_name="inventory", db_constraint=False
+    )
+    special: fields.ForeignKeyRelation[Special] | None = fields.ForeignKeyField(
+        "models.Special", null=True, related_name="inventory", db_constraint=False
+    )
+    count = fields.IntField()
+
+    def __str__(self) -> str:
+        return str(self.pk)
+
+    class Meta:
+        unique_together = ("player", "ball", "special")
+
+
+class InventoryTotal(models.Model):
+    """
+    Number of instances owned by a player, maintained like `InventoryCount`.
+    """
+
+    player_id = fields.BigIntField(pk=True)
+    total = fields.IntField()
+    specials = fields.IntField(description="Instances with a special")
+
+    def __str__(self) -> str:
+        return str(self.player_id)
+
 
 class BlacklistedID(models.Model):
     discord_id = fields.BigIntField(
@@ -0,0 +1,70 @@
+from collections import defaultdict
+from typing import Iterable, Mapping
+
+from ballsdex.core.models import Ball, Regime, RegimeCategory
+
+# how a ball of each category is called in messages
+CATEGORY_NOUNS = {
+    RegimeCategory.BRAWLER: "brawler",
+    RegimeCategory.SKIN: "skin",
+    RegimeCategory.GADGET: "gadget",
+    RegimeCategory.STAR_POWER: "star power",
+    RegimeCategory.GEAR: "gear",
+    RegimeCategory.HYPERCHARGE: "hypercharge",
+    RegimeCategory.OTHER: "brawler",
+}
+
+
+class Catalog:
+    """
+    Classification of the balls by the category of their regime. It is set from the admin
+    panel, adding a regime does not require code changes.
+
+    Rebuilt by `BallsDexBot.load_cache`. Balls and regimes created afterwards are classified
+    as brawlers until the next reload.
+    """
+
+    def __init__(self):
+        self.regime_categories: dict[int, RegimeCategory] = {}
+        self.members: dict[RegimeCategory, frozenset[int]] = {}
+        self.enabled: dict[RegimeCategory, frozenset[int]] = {}
+
+    def rebuild(self, balls: Iterable[Ball], regimes: Mapping[int, Regime]):
+        self.regime_categories = {x: RegimeCategory(y.category) for x, y in regimes.items()}
+        members: defaultdict[RegimeCategory, set[int]] = defaultdict(set)
+        enabled: defaultdict[RegimeCategory, set[int]] = defaultdict(set)
+        for ball in balls:
+            category = self.category(ball)
+            members[category].add(ball.pk)
+            if ball.enabled:
+                enabled[category].add(ball.pk)
+        self.members = {x: frozenset(members[x]) for x in RegimeCategory}
+        self.enabled = {x: frozenset(enabled[x]) for x in RegimeCategory}
+
+    def category(self, ball: Ball) -> RegimeCategory:
+        return self.regime_categories.get(ball.regime_id, RegimeCategory.BRAWLER)
+
+    def noun(self, ball: Ball) -> str:
+        """
+        How this ball is called in messages, like "brawler" or "skin".
+        """
+        return CATEGORY_NOUNS[self.category(ball)]
+
+    def is_skin(self, ball: Ball) -> bool:
+        return self.category(ball) == RegimeCategory.SKIN
+
+    def ball_ids(self, category: RegimeCategory, *, enabled_only: bool = True) -> frozenset[int]:
+        """
+        Return the IDs of the balls of a category, only the enabled ones by default.
+        """
+        return (self.enabled if enabled_only else self.members).get(category, frozenset())
+
+    def regime_ids(self, category: RegimeCategory) -> list[int]:
+        """
+        Return the IDs of the regimes of a category, to filter queries with a single
+        ``ball__regime_id__in`` predicate.
+        """
+        return [x for x, y in self.regime_categories.items() if y == category]
+
+
+catalog = Catalog()
@@ -0,0 +1,126 @@
+import unicodedata
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from ballsdex.core.models import Ball
+
+# typo tolerance is not applied to names shorter than this, too many guesses would match
+MIN_TYPO_LENGTH = 5
+
+# fancy unicode characters that mobile keyboards insert instead of the plain ones
+QUOTES_TABLE = str.maketrans({"’": "'", "‘": "'", "“": '"', "”": '"'})
+
+
+def normalize_name(text: str, *, strip_accents: bool = False) -> str:
+    """
+    Normalize a name for comparison: unicode compatibility forms, case folding, fancy quotes
+    and repeated or enclosing whitespace.
+
+    Parameters
+    ----------
+    text: str
+        The text to normalize.
+    strip_accents: bool
+        Also remove the diacritics, so that "Pokémon" and "pokemon" are equal.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold().translate(QUOTES_TABLE)
+    if strip_accents:
+        text = "".join(
+            x for x in unicodedata.normalize("NFKD", text) if not unicodedata.combining(x)
+        )
+    return " ".join(text.split())
+
+
+def deletions(text: str) -> list[tuple[int, str]]:
+    """
+    All the strings obtained by removing a single character from the text, with the position
+    of the removed character.
+    """
+    return [(i, text[:i] + text[i + 1 :]) for i in range(len(text))]
+
+
+class CatchNameIndex:
+    """
+    The accepted names of every ball, normalized once into frozen sets so that checking a guess
+    is a single hash lookup.
+
+    The index is rebuilt by `BallsDexBot.load_cache`, which also applies the options from the
+    ``catch`` section of config.yml. Balls missing from it, for instance created after the last
+    load, are indexed on first use.
+
+    Parameters
+    ----------
+    accent_insensitive: bool
+        Ignore diacritics in names and guesses.
+    typo_tolerant: bool
+        Also accept guesses one character away (missing, extra or wrong character) from a name
+        of at least `MIN_TYPO_LENGTH` characters.
+    """
+
+    def __init__(self, *, accent_insensitive: bool = False, typo_tolerant: bool = False):
+        self.accent_insensitive = accent_insensitive
+        self.typo_tolerant = typo_tolerant
+        self.names: dict[int, frozenset[str]] = {}
+        # names long enough for typos, and each of their deletions with the removed positions
+        self.typo_names: dict[int, frozenset[str]] = {}
+        self.typo_deletions: dict[int, dict[str, frozenset[int]]] = {}
+
+    def normalize(self, text: str) -> str:
+        return normalize_name(text, strip_accents=self.accent_insensitive)
+
+    def index_ball(self, ball: "Ball") -> frozenset[str]:
+        raw_names = [ball.country]
+        if ball.catch_names:
+            raw_names.extend(ball.catch_names.split(";"))
+        if ball.translations:
+            raw_names.extend(ball.translations.split(";"))
+        names = frozenset(x for x in map(self.normalize, raw_names) if x)
+        self.names[ball.pk] = names
+
+        if self.typo_tolerant:
+            long_names = frozenset(x for x in names if len(x) >= MIN_TYPO_LENGTH)
+            positions: dict[str, set[int]] = {}
+            for name in long_names:
+                for i, variant in deletions(name):
+                    positions.setdefault(variant, set()).add(i)
+            self.typo_names[ball.pk] = long_names
+            self.typo_deletions[ball.pk] = {x: frozenset(y) for x, y in positions.items()}
+        return names
+
+    def rebuild(self, balls: Iterable["Ball"]):
+        self.names.clear()
+        self.typo_names.clear()
+        self.typo_deletions.clear()
+        for ball in balls:
+            self.index_ball(ball)
+
+    def accepted_names(self, ball: "Ball") -> frozenset[str]:
+        names = self.names.get(ball.pk)
+        if names is None:
+            names = self.index_ball(ball)
+        return names
+
+    def match(self, ball: "Ball", text: str) -> bool:
+        """
+        Check if the text is an accepted name for the ball.
+        """
+        guess = self.normalize(text)
+        names = self.accepted_names(ball)
+        if guess in names:
+            return True
+        if not self.typo_tolerant or len(guess) < MIN_TYPO_LENGTH - 1:
+            return False
+        long_names = self.typo_names.get(ball.pk, frozenset())
+        positions = self.typo_deletions.get(ball.pk, {})
+        # a missing character
+        if guess in positions:
+            return True
+        for i, variant in deletions(guess):
+            # an extra character, or a wrong one: the same position removed from both gives
+            # the same string
+            if variant in long_names or i in positions.get(variant, ()):
+                return True
+        return False
+
+
+catch_name_index = CatchNameIndex()
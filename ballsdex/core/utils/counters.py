@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from tortoise import Tortoise
+
+if TYPE_CHECKING:
+    from ballsdex.core.models import Player
+
+log = logging.getLogger("ballsdex.core.utils.counters")
+
+# seconds between two writes of the pending deltas
+FLUSH_INTERVAL = 5
+
+# the counters that can be buffered, with their maximum value if any
+COUNTER_FIELDS: dict[str, int | None] = {
+    "credits": None,
+    "powerpoints": None,
+    "sdcount": 50,
+}
+
+FLUSH_QUERY = f"""
+UPDATE player SET
+    credits = GREATEST(player.credits + delta.credits, 0),
+    powerpoints = GREATEST(player.powerpoints + delta.powerpoints, 0),
+    sdcount = LEAST(GREATEST(player.sdcount + delta.sdcount, 0), {COUNTER_FIELDS["sdcount"]})
+FROM unnest($1::bigint[], $2::bigint[], $3::bigint[], $4::bigint[])
+    AS delta(id, credits, powerpoints, sdcount)
+WHERE player.id = delta.id
+"""
+
+# the pending delta ($2) is written in the same statement, then the amount ($3) is taken from it
+SPEND_QUERY = """
+WITH previous AS (
+    SELECT id, {field} + $2 >= $3 AS enough FROM player WHERE id = $1 FOR UPDATE
+)
+UPDATE player SET {field} = player.{field} + $2 - CASE WHEN previous.enough THEN $3 ELSE 0 END
+FROM previous
+WHERE player.id = previous.id
+RETURNING previous.enough
+"""
+
+
+class CounterBuffer:
+    """
+    Write-behind buffer for the currency counters of the players.
+
+    Grants (`add`) are summed per player in memory and written every `FLUSH_INTERVAL`
+    seconds for all players at once, as a single ``SET x = x + delta`` statement. Concurrent
+    grants can no longer overwrite each other like the previous read-modify-write saves, and a
+    burst of rewards costs one UPDATE per interval instead of one per event. Values are kept
+    between 0 and their maximum when written.
+
+    Spending (`spend`) is not buffered since the balance must be checked: it writes the
+    pending delta of the player and takes the amount in a single conditional statement.
+
+    Pending deltas are not in the `Player` rows yet, use `value` to display a counter.
+
+    Crash safety: the buffer is written on a clean shutdown (`BallsDexBot.close`). If the
+    process is killed or loses power, the grants of the last `FLUSH_INTERVAL` seconds are lost,
+    spendings never are. If the database is unavailable, the deltas are kept and written with
+    the next flush.
+    """
+
+    def __init__(self, *, interval: float = FLUSH_INTERVAL):
+        self.interval = interval
+        self.pending: defaultdict[int, defaultdict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self.task: asyncio.Task | None = None
+
+    def add(self, player_id: int, **deltas: int):
+        """
+        Add to the counters of a player, for instance ``add(player.pk, credits=10)``.
+        """
+        for field, delta in deltas.items():
+            if field not in COUNTER_FIELDS:
+                raise ValueError(f"{field} is not a buffered counter")
+            if delta:
+                self.pending[player_id][field] += delta
+
+    def value(self, player: "Player", field: str) -> int:
+        """
+        Return the value of a counter of a player, including the pending deltas.
+        """
+        pending = self.pending.get(player.pk)
+        return getattr(player, field) + (pending.get(field, 0) if pending else 0)
+
+    async def spend(self, player_id: int, field: str, amount: int) -> bool:
+        """
+        Take an amount from a counter of a player if it is high enough.
+
+        Returns
+        -------
+        bool
+            Whether the player had enough and the amount was taken.
+        """
+        if field not in COUNTER_FIELDS:
+            raise ValueError(f"{field} is not a buffered counter")
+        pending = self.pending.get(player_id)
+        delta = pending.pop(field, 0) if pending else 0
+        connection = Tortoise.get_connection("default")
+        try:
+            _, rows = await connection.execute_query(
+                SPEND_QUERY.format(field=field), [player_id, delta, amount]
+            )
+        except BaseException:
+            self.add(player_id, **{field: delta})
+            raise
+        return bool(rows and rows[0]["enough"])
+
+    async def flush(self):
+        """
+        Write all pending deltas.
+        """
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, defaultdict(lambda: defaultdict(int))
+        ids = list(pending.keys())
+        columns = [[pending[x][field] for x in ids] for field in COUNTER_FIELDS]
+        connection = Tortoise.get_connection("default")
+        try:
+            await connection.execute_query(FLUSH_QUERY, [ids, *columns])
+        except BaseException:
+            # keep them for the next attempt, merged with what was added meanwhile
+            for player_id, deltas in pending.items():
+                self.add(player_id, **deltas)
+            raise
+        log.debug(f"Wrote the counters of {len(ids)} players")
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Failed to write the player counters, retrying later")
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """
+        Stop the periodic writes and write what is left.
+        """
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        await self.flush()
+
+
+counter_buffer = CounterBuffer()
@@ -0,0 +1,149 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+import discord
+
+if TYPE_CHECKING:
+    from ballsdex.core.models import Ball, Special
+
+# emoji of each rarity, matched with the name of the regime
+RARITY_EMOJIS = {
+    "Rare": 1330493249235714189,
+    "Super Rare": 1330493410884456528,
+    "Epic": 1330493427011555460,
+    "Mythic": 1330493448469483580,
+    "Legendary": 1330493465221529713,
+    "Ultra Legendary": 1368271368382320761,
+    "Rare Skin": 1329613491216322613,
+    "Super Rare Skin": 1329613550746075178,
+    "Epic Skin": 1329613562376622122,
+    "Mythic Skin": 1329613573843980378,
+    "Legendary Skin": 1329613584644182048,
+    "Ultimate Skin": 1374258318297665556,
+    "Hypercharge Skin": 1329613598720393337,
+    "Super Pro Skin": 1329613550746075178,
+    "Mythic Pro Skin": 1329613573843980378,
+    "Hyper Pro Skin": 1329613598720393337,
+}
+
+# shown instead of a custom special emoji when it cannot be resolved
+SPECIAL_FALLBACK_EMOJI = "⚡ "
+
+
+@dataclass(frozen=True, slots=True)
+class BallFragments:
+    """
+    The parts of a ball's display that are the same for all of its instances.
+
+    Attributes
+    ----------
+    name: str
+        Full name of the ball.
+    short_name: str
+        Name used on cards, the full name when it has none.
+    emoji: discord.Emoji | None
+        Emoji of the ball, `None` if the bot cannot see it.
+    emoji_text: str
+        The emoji followed by a space, ready to prefix a line, or an empty string.
+    rarity_emoji: str
+        Emoji of the ball's rarity, or an empty string.
+    wiki_name: str
+        Name of the ball's page on the wiki.
+    """
+
+    name: str
+    short_name: str
+    emoji: discord.Emoji | None
+    emoji_text: str
+    rarity_emoji: str
+    wiki_name: str
+
+
+@dataclass(frozen=True, slots=True)
+class SpecialFragments:
+    """
+    The parts of a special's display that are the same for all of its instances.
+
+    Attributes
+    ----------
+    name: str
+        Name of the special.
+    emoji: discord.Emoji | str | None
+        Emoji of the special, `None` if it has none or the bot cannot see it.
+    emoji_text: str
+        The emoji followed by a space, or an empty string if it has none or the bot cannot
+        see it.
+    custom_emoji: bool
+        Whether the emoji is a Discord emoji rather than a unicode character.
+    """
+
+    name: str
+    emoji: discord.Emoji | str | None
+    emoji_text: str
+    custom_emoji: bool
+
+
+class DisplayCache:
+    """
+    Display strings of every ball and special, resolved once instead of on every line of a
+    list. Only the fields that vary between instances are formatted at render time.
+
+    Rebuilt by `BallsDexBot.load_cache` once the emojis are fetched, which increments
+    `version`. Balls and specials missing from it, for instance created after the last load,
+    are resolved on first use.
+    """
+
+    def __init__(self):
+        self.bot: discord.Client | None = None
+        self.version = 0
+        self.balls: dict[int, BallFragments] = {}
+        self.specials: dict[int, SpecialFragments] = {}
+
+    def get_emoji(self, emoji_id: int | None) -> discord.Emoji | None:
+        if self.bot is None or emoji_id is None:
+            return None
+        return self.bot.get_emoji(emoji_id)
+
+    def rebuild(self, bot: discord.Client, balls: Iterable["Ball"], specials: Iterable["Special"]):
+        self.bot = bot
+        self.balls = {}
+        self.specials = {}
+        for ball in balls:
+            self.ball(ball)
+        for special in specials:
+            self.special(special)
+        self.version += 1
+
+    def ball(self, ball: "Ball") -> BallFragments:
+        if fragments := self.balls.get(ball.pk):
+            return fragments
+        emoji = self.get_emoji(ball.emoji_id)
+        regime_name = getattr(ball.cached_regime, "name", None)
+        rarity_emoji = self.get_emoji(RARITY_EMOJIS.get(regime_name))  # type: ignore
+        fragments = self.balls[ball.pk] = BallFragments(
+            name=ball.country,
+            short_name=ball.short_name or ball.country,
+            emoji=emoji,
+            emoji_text=f"{emoji} " if emoji else "",
+            rarity_emoji=str(rarity_emoji or ""),
+            wiki_name=ball.country.replace(" ", "_"),
+        )
+        return fragments
+
+    def special(self, special: "Special") -> SpecialFragments:
+        if fragments := self.specials.get(special.pk):
+            return fragments
+        emoji: discord.Emoji | str | None = special.emoji
+        custom_emoji = bool(special.emoji and special.emoji.isdecimal())
+        if custom_emoji:
+            emoji = self.get_emoji(int(special.emoji))  # type: ignore
+        fragments = self.specials[special.pk] = SpecialFragments(
+            name=special.name,
+            emoji=emoji or None,
+            emoji_text=f"{emoji} " if emoji else "",
+            custom_emoji=custom_emoji,
+        )
+        return fragments
+
+
+display_cache = DisplayCache()
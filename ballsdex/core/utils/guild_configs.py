@@ -0,0 +1,89 @@
+from typing import TYPE_CHECKING, Iterable, Type
+
+from cachetools import TTLCache
+from tortoise import signals
+
+from ballsdex.core.models import GuildConfig
+
+if TYPE_CHECKING:
+    from tortoise.backends.base.client import BaseDBAsyncClient
+
+# entries expire to pick up the changes made from the admin panel, which runs in another process
+CACHE_TTL = 60 * 60
+CACHE_SIZE = 100_000
+
+
+class GuildConfigCache:
+    """
+    Read-through cache of the `GuildConfig` rows, keyed by guild ID. Guilds without a config
+    are cached too, as `None`.
+
+    Saves and deletions made by the bot update the cache through Tortoise signals, so the cached
+    objects can be modified and saved directly. Changes made from the admin panel are visible
+    once the entry expires, or after `BallsDexBot.load_cache`.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of guilds kept, the least recently used ones are dropped first.
+    ttl: float
+        Number of seconds after which an entry is fetched again.
+    """
+
+    def __init__(self, *, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.cache: TTLCache[int, GuildConfig | None] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, guild_id: int) -> GuildConfig | None:
+        """
+        Return the config of a guild, or `None` if it has none.
+        """
+        try:
+            return self.cache[guild_id]
+        except KeyError:
+            pass
+        config = await GuildConfig.get_or_none(guild_id=guild_id)
+        self.cache[guild_id] = config
+        return config
+
+    async def get_or_create(self, guild_id: int) -> tuple[GuildConfig, bool]:
+        """
+        Return the config of a guild, creating it if needed, and whether it was created.
+        """
+        if config := await self.get(guild_id):
+            return config, False
+        config, created = await GuildConfig.get_or_create(guild_id=guild_id)
+        self.cache[guild_id] = config
+        return config, created
+
+    def invalidate(self, guild_id: int):
+        self.cache.pop(guild_id, None)
+
+    def clear(self):
+        self.cache.clear()
+
+
+guild_configs = GuildConfigCache()
+
+
+async def _write_through(
+    model: Type[GuildConfig],
+    instance: GuildConfig,
+    created: bool,
+    using_db: "BaseDBAsyncClient | None" = None,
+    update_fields: Iterable[str] | None = None,
+):
+    # partial updates may leave other fields of this instance outdated
+    if update_fields:
+        guild_configs.invalidate(instance.guild_id)
+    else:
+        guild_configs.cache[instance.guild_id] = instance
+
+
+async def _invalidate(
+    model: Type[GuildConfig], instance: GuildConfig, using_db: "BaseDBAsyncClient | None" = None
+):
+    guild_configs.invalidate(instance.guild_id)
+
+
+GuildConfig.register_listener(signals.Signals.post_save, _write_through)
+GuildConfig.register_listener(signals.Signals.post_delete, _invalidate)
@@ -0,0 +1,174 @@
+import logging
+from collections import defaultdict
+
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from ballsdex.core.models import InventoryCount, InventoryTotal
+
+log = logging.getLogger("ballsdex.core.utils.inventory")
+
+# Nothing else may write the projection while it is rebuilt. Transactions that changed instances
+# but did not run their trigger yet wait for the lock, and apply their change on top of the
+# rebuilt counts afterwards.
+LOCK_QUERY = "LOCK TABLE inventorycount, inventorytotal IN SHARE ROW EXCLUSIVE MODE"
+
+REBUILD_QUERIES = [
+    "DELETE FROM inventorycount {where}",
+    "DELETE FROM inventorytotal {where}",
+    "INSERT INTO inventorycount (player_id, ball_id, special_id, count) "
+    "SELECT player_id, ball_id, special_id, COUNT(*) FROM ballinstance {where} "
+    "GROUP BY player_id, ball_id, special_id",
+    "INSERT INTO inventorytotal (player_id, total, specials) "
+    "SELECT player_id, COUNT(*), COUNT(special_id) FROM ballinstance {where} GROUP BY player_id",
+]
+
+# players whose projection differs from their instances
+VERIFY_QUERY = """
+WITH expected AS (
+    SELECT player_id, ball_id, COALESCE(special_id, 0) AS special_id, COUNT(*) AS count
+    FROM ballinstance {where}
+    GROUP BY player_id, ball_id, special_id
+), actual AS (
+    SELECT player_id, ball_id, COALESCE(special_id, 0) AS special_id, count
+    FROM inventorycount {where}
+), expected_totals AS (
+    SELECT player_id, COUNT(*) AS total, COUNT(special_id) AS specials
+    FROM ballinstance {where}
+    GROUP BY player_id
+)
+SELECT COALESCE(expected.player_id, actual.player_id) AS player_id
+FROM expected
+FULL JOIN actual
+    ON expected.player_id = actual.player_id
+    AND expected.ball_id = actual.ball_id
+    AND expected.special_id = actual.special_id
+WHERE expected.count IS DISTINCT FROM actual.count
+UNION
+SELECT COALESCE(expected_totals.player_id, inventorytotal.player_id)
+FROM expected_totals
+FULL JOIN (SELECT * FROM inventorytotal {where}) AS inventorytotal
+    ON expected_totals.player_id = inventorytotal.player_id
+WHERE (expected_totals.total, expected_totals.specials)
+    IS DISTINCT FROM (inventorytotal.total, inventorytotal.specials)
+"""
+
+
+# The projection does not know where instances come from, this one reads the instances but only
+# returns a row per special, served by the player index.
+COLLECTION_QUERY = """
+SELECT special_id, COUNT(*) AS count, COUNT(trade_player_id) AS traded
+FROM ballinstance
+WHERE player_id = $1 {ball}
+GROUP BY special_id
+"""
+
+
+def _scope(player_id: int | None) -> tuple[str, list[int]]:
+    if player_id is None:
+        return "", []
+    return "WHERE player_id = $1", [player_id]
+
+
+async def inventory_totals(player_id: int) -> tuple[int, int]:
+    """
+    Return the number of instances a player owns, and how many of those have a special.
+    """
+    row = await InventoryTotal.filter(player_id=player_id).first().values_list("total", "specials")
+    return row or (0, 0)  # type: ignore
+
+
+async def inventory_count(
+    player_id: int, *, ball_id: int | None = None, special_id: int | None = None
+) -> int:
+    """
+    Return the number of instances a player owns, optionally of a ball and/or a special.
+    """
+    if ball_id is None and special_id is None:
+        return (await inventory_totals(player_id))[0]
+    query = InventoryCount.filter(player_id=player_id)
+    if ball_id is not None:
+        query = query.filter(ball_id=ball_id)
+    if special_id is not None:
+        query = query.filter(special_id=special_id)
+    return sum(await query.values_list("count", flat=True))  # type: ignore
+
+
+async def ball_counts(player_id: int, *, special_id: int | None = None) -> dict[int, int]:
+    """
+    Return the number of instances a player owns of each ball, optionally only with a special.
+    Balls not owned are missing.
+    """
+    query = InventoryCount.filter(player_id=player_id)
+    if special_id is not None:
+        query = query.filter(special_id=special_id)
+    counts: defaultdict[int, int] = defaultdict(int)
+    for ball_id, amount in await query.values_list("ball_id", "count"):
+        counts[ball_id] += amount
+    return dict(counts)
+
+
+async def special_counts(player_id: int) -> dict[int, int]:
+    """
+    Return the number of instances a player owns with each special. Specials not owned are
+    missing.
+    """
+    counts: defaultdict[int, int] = defaultdict(int)
+    for special_id, amount in await InventoryCount.filter(
+        player_id=player_id, special_id__isnull=False
+    ).values_list("special_id", "count"):
+        counts[special_id] += amount
+    return dict(counts)
+
+
+async def collection_stats(
+    player_id: int, *, ball_id: int | None = None
+) -> tuple[int, int, dict[int, int]]:
+    """
+    Count the instances a player owns, optionally of a single ball, in one grouped query.
+
+    Returns
+    -------
+    tuple[int, int, dict[int, int]]
+        The number of instances, how many of those were received from a trade, and the number
+        of instances with each special. Specials not owned are missing.
+    """
+    params = [player_id]
+    ball = ""
+    if ball_id is not None:
+        ball = "AND ball_id = $2"
+        params.append(ball_id)
+    connection = Tortoise.get_connection("default")
+    _, rows = await connection.execute_query(COLLECTION_QUERY.format(ball=ball), params)
+    total = sum(x["count"] for x in rows)
+    traded = sum(x["traded"] for x in rows)
+    return total, traded, {x["special_id"]: x["count"] for x in rows if x["special_id"]}
+
+
+async def rebuild_inventory(player_id: int | None = None):
+    """
+    Recompute the projection of a player, or of everyone, from their instances.
+
+    Catches and transfers wait until it is done, a full rebuild should be kept for repairs.
+    """
+    where, params = _scope(player_id)
+    async with in_transaction() as connection:
+        await connection.execute_query(LOCK_QUERY)
+        for query in REBUILD_QUERIES:
+            await connection.execute_query(query.format(where=where), params)
+    log.info(f"Rebuilt the inventory projection of {player_id or 'every player'}")
+
+
+async def verify_inventory(player_id: int | None = None) -> list[int]:
+    """
+    Compare the projection of a player, or of everyone, with their instances.
+
+    Returns
+    -------
+    list[int]
+        The primary keys of the players whose projection is wrong.
+    """
+    where, params = _scope(player_id)
+    connection = Tortoise.get_connection("default")
+    _, rows = await connection.execute_query(VERIFY_QUERY.format(where=where), params)
+    return [x["player_id"] for x in rows]
@@ -0,0 +1,307 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, Type
+
+from cachetools import LRUCache
+from tortoise import Tortoise, signals
+
+from ballsdex.core.models import BallInstance, Player
+
+if TYPE_CHECKING:
+    from tortoise.backends.base.client import BaseDBAsyncClient
+
+log = logging.getLogger("ballsdex.core.utils.leaderboards")
+
+# number of entries kept per board, also the deepest rank that can be shown
+BOARD_CAPACITY = 100
+# boards are recomputed from the database this often, to correct any drift
+RECONCILE_INTERVAL = 15 * 60
+# number of guilds whose board is kept
+GUILD_BOARDS_SIZE = 1_000
+
+TopQuery = Callable[[int], Awaitable[list[tuple[int, int]]]]
+
+
+class Board:
+    """
+    The top entries of a ranking of players, maintained incrementally between full
+    recomputations.
+
+    The board holds the exact score of up to `capacity` players. Everyone else is only known
+    to score at most `floor`, or the bound recorded in `bounds` for the players whose score
+    went up since the last recomputation without being known exactly. Entries scoring strictly
+    more than all of those bounds are guaranteed to be ranked like the full query would, the
+    others are not shown until the next recomputation.
+
+    Events must carry the absolute score (`set`) or a change (`add`) of a player. Changes
+    happening while the board is being recomputed may be counted twice or missed until the
+    next recomputation.
+
+    Parameters
+    ----------
+    query: Callable[[int], Awaitable[list[tuple[int, int]]]]
+        Return the first rows of the full ranking, as ``(player_id, score)`` tuples ordered by
+        descending score. Only players with a positive score are ranked.
+    capacity: int
+        Number of entries kept.
+    """
+
+    def __init__(self, query: TopQuery, *, capacity: int = BOARD_CAPACITY):
+        self.query = query
+        self.capacity = capacity
+        self.scores: dict[int, int] = {}
+        self.bounds: dict[int, int] = {}
+        self.floor = 0
+        self.reconciled_at: float | None = None
+        # entries may have become uncertain since the last recomputation
+        self.dirty = False
+        self.lock = asyncio.Lock()
+        self._ranking: list[tuple[int, int]] | None = None
+
+    def set(self, player_id: int, score: int):
+        """
+        Record the exact score of a player.
+        """
+        self.bounds.pop(player_id, None)
+        self._ranking = None
+        if player_id in self.scores or score > self.floor:
+            if score < self.scores.get(player_id, score):
+                self.dirty = True
+            self.scores[player_id] = score
+            if len(self.scores) > self.capacity:
+                evicted = min(self.scores, key=self.scores.__getitem__)
+                self.bound(evicted, self.scores.pop(evicted))
+
+    def add(self, player_id: int, delta: int):
+        """
+        Record a change of the score of a player.
+        """
+        if player_id in self.scores:
+            self.scores[player_id] += delta
+            self._ranking = None
+            if delta < 0:
+                self.dirty = True
+        elif player_id in self.bounds:
+            # the ceiling may go down, even if the new bound is not kept
+            self._ranking = None
+            self.bound(player_id, self.bounds.pop(player_id) + delta)
+        elif delta > 0:
+            self.bound(player_id, self.floor + delta)
+
+    def bound(self, player_id: int, score: int):
+        if score > self.floor:
+            self.bounds[player_id] = score
+            self._ranking = None
+            self.dirty = True
+
+    @property
+    def ceiling(self) -> int:
+        """
+        The highest score a player outside of the board may have.
+        """
+        return max(self.floor, *self.bounds.values()) if self.bounds else self.floor
+
+    @property
+    def ranking(self) -> list[tuple[int, int]]:
+        """
+        The entries of the board that are known to be ranked correctly, best first.
+        """
+        if self._ranking is None:
+            ceiling = self.ceiling
+            self._ranking = sorted(
+                ((x, y) for x, y in self.scores.items() if y > ceiling),
+                key=lambda x: (-x[1], x[0]),
+            )
+        return self._ranking
+
+    async def reconcile(self):
+        """
+        Recompute the board from the database.
+        """
+        requested_at = time.monotonic()
+        async with self.lock:
+            if self.reconciled_at is not None and self.reconciled_at >= requested_at:
+                return  # done by another caller while waiting
+            rows = await self.query(self.capacity + 1)
+            log.debug(f"Recomputed a leaderboard, {len(self.bounds)} uncertain entries dropped")
+            self.scores = dict(rows[: self.capacity])
+            self.floor = rows[self.capacity][1] if len(rows) > self.capacity else 0
+            self.bounds.clear()
+            self._ranking = None
+            self.dirty = False
+            self.reconciled_at = time.monotonic()
+
+    def invalidate(self):
+        self.reconciled_at = None
+
+    async def top(self, limit: int, offset: int = 0) -> list[tuple[int, int]]:
+        """
+        Return a page of the ranking as ``(player_id, score)`` tuples, recomputing the board
+        first if it is outdated or too many entries became uncertain.
+        """
+        limit = min(limit, self.capacity - offset)
+        if (
+            self.reconciled_at is None
+            or time.monotonic() - self.reconciled_at > RECONCILE_INTERVAL
+            or (len(self.ranking) < offset + limit and self.dirty)
+        ):
+            await self.reconcile()
+        return self.ranking[offset : offset + limit]
+
+    async def verify(self) -> bool:
+        """
+        Compare the ranking with the full query.
+        """
+        rows = await self.query(self.capacity + 1)
+        ranking = self.ranking
+        expected = dict(rows)
+        return [x[1] for x in rows[: len(ranking)]] == [x[1] for x in ranking] and all(
+            expected.get(x) == y for x, y in ranking
+        )
+
+
+async def _fetch(query: str, *params) -> list[tuple[int, int]]:
+    connection = Tortoise.get_connection("default")
+    _, rows = await connection.execute_query(query, list(params))
+    return [(x["player_id"], x["score"]) for x in rows]
+
+
+async def top_trophies(limit: int) -> list[tuple[int, int]]:
+    return await _fetch(
+        "SELECT id AS player_id, trophies AS score FROM player WHERE trophies > 0 "
+        "ORDER BY trophies DESC, id LIMIT $1",
+        limit,
+    )
+
+
+async def top_collection(limit: int) -> list[tuple[int, int]]:
+    return await _fetch(
+        "SELECT player_id, COUNT(*) AS score FROM ballinstance GROUP BY player_id "
+        "ORDER BY score DESC, player_id LIMIT $1",
+        limit,
+    )
+
+
+async def top_guild_collection(guild_id: int, limit: int) -> list[tuple[int, int]]:
+    return await _fetch(
+        "SELECT player_id, COUNT(*) AS score FROM ballinstance WHERE server_id = $1 "
+        "GROUP BY player_id ORDER BY score DESC, player_id LIMIT $2",
+        guild_id,
+        limit,
+    )
+
+
+class Leaderboards:
+    """
+    The leaderboards of the bot, kept up to date from catches, transfers and deletions.
+
+    - `trophies`: total trophies of the players
+    - `collection`: number of instances owned
+    - `guild(guild_id)`: number of instances owned that were caught in a guild, boards are
+      created on first use and the least recently used ones are dropped
+
+    Instances created through the ORM and deletions are tracked through Tortoise signals.
+    Catches are written in raw SQL and transfers cannot be told apart from other saves, so
+    those call `record_catch` and `record_transfer`. Anything else, like bulk deletions or
+    changes made from the admin panel, is picked up by the periodic recomputation, or
+    immediately after `invalidate`.
+    """
+
+    def __init__(self):
+        self.trophies = Board(top_trophies)
+        self.collection = Board(top_collection)
+        self.guilds: LRUCache[int, Board] = LRUCache(maxsize=GUILD_BOARDS_SIZE)
+
+    def guild(self, guild_id: int) -> Board:
+        try:
+            return self.guilds[guild_id]
+        except KeyError:
+            board = Board(lambda limit: top_guild_collection(guild_id, limit))
+            self.guilds[guild_id] = board
+            return board
+
+    def add_instances(self, player_id: int, server_id: int | None, delta: int):
+        self.collection.add(player_id, delta)
+        if server_id and (board := self.guilds.get(server_id)):
+            board.add(player_id, delta)
+
+    def record_catch(self, player_id: int, trophies: int, owner_id: int, server_id: int | None):
+        """
+        Record a catch made by `player_id`, now having this many trophies, of an instance
+        owned by `owner_id`.
+        """
+        self.trophies.set(player_id, trophies)
+        self.add_instances(owner_id, server_id, 1)
+
+    def record_transfer(self, instance: BallInstance, previous_owner_id: int):
+        """
+        Record that an instance changed owner. Call it once the transfer is saved.
+        """
+        self.add_instances(previous_owner_id, instance.server_id, -1)
+        self.add_instances(instance.player_id, instance.server_id, 1)  # type: ignore
+
+    def invalidate(self):
+        """
+        Recompute every board on next use.
+        """
+        self.trophies.invalidate()
+        self.collection.invalidate()
+        self.guilds.clear()
+
+    async def verify(self) -> list[str]:
+        """
+        Compare every board with the full query.
+
+        Returns
+        -------
+        list[str]
+            The names of the boards that did not match.
+        """
+        boards = {"trophies": self.trophies, "collection": self.collection}
+        boards.update({f"guild {x}": y for x, y in self.guilds.items()})
+        return [name for name, board in boards.items() if not await board.verify()]
+
+
+leaderboards = Leaderboards()
+
+
+async def _record_instance(
+    model: Type[BallInstance],
+    instance: BallInstance,
+    created: bool,
+    using_db: "BaseDBAsyncClient | None" = None,
+    update_fields: Iterable[str] | None = None,
+):
+    if created:
+        leaderboards.add_instances(instance.player_id, instance.server_id, 1)  # type: ignore
+
+
+async def _drop_instance(
+    model: Type[BallInstance], instance: BallInstance, using_db: "BaseDBAsyncClient | None" = None
+):
+    leaderboards.add_instances(instance.player_id, instance.server_id, -1)  # type: ignore
+
+
+async def _record_player(
+    model: Type[Player],
+    instance: Player,
+    created: bool,
+    using_db: "BaseDBAsyncClient | None" = None,
+    update_fields: Iterable[str] | None = None,
+):
+    if not update_fields or "trophies" in update_fields:
+        leaderboards.trophies.set(instance.pk, instance.trophies)
+
+
+async def _drop_player(
+    model: Type[Player], instance: Player, using_db: "BaseDBAsyncClient | None" = None
+):
+    # the instances are deleted in cascade, without signals
+    leaderboards.invalidate()
+
+
+BallInstance.register_listener(signals.Signals.post_save, _record_instance)
+BallInstance.register_listener(signals.Signals.post_delete, _drop_instance)
+Player.register_listener(signals.Signals.post_save, _record_player)
+Player.register_listener(signals.Signals.post_delete, _drop_player)
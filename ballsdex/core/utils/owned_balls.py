@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Type
+
+from cachetools import TTLCache
+from tortoise import signals
+
+from ballsdex.core.models import BallInstance, InventoryCount
+
+if TYPE_CHECKING:
+    from tortoise.backends.base.client import BaseDBAsyncClient
+
+# entries expire to pick up the changes made from the admin panel, which runs in another process
+CACHE_TTL = 30 * 60
+CACHE_SIZE = 50_000
+
+
+def ids_to_mask(ball_ids: Iterable[int]) -> int:
+    """
+    Build a bitmask with the bit of each ball ID set.
+    """
+    mask = 0
+    for ball_id in ball_ids:
+        mask |= 1 << ball_id
+    return mask
+
+
+def mask_to_ids(mask: int) -> set[int]:
+    """
+    Return the ball IDs whose bit is set in the mask.
+    """
+    ball_ids: set[int] = set()
+    while mask:
+        low = mask & -mask
+        ball_ids.add(low.bit_length() - 1)
+        mask ^= low
+    return ball_ids
+
+
+@dataclass(slots=True)
+class PendingLoad:
+    """
+    What happened to a player's mask while it was read from the database.
+    """
+
+    added: int = 0
+    invalidated: bool = False
+
+
+class OwnedBallsCache:
+    """
+    The set of balls each player owns at least one instance of, as a bitmask where bit ``n``
+    is set if the player owns the ball with ID ``n``. Completion, comparison and "new ball"
+    checks become bitwise operations instead of a ``DISTINCT`` scan over the player's
+    instances.
+
+    A player's mask is loaded on first use from the inventory counts. Catches and transfers
+    made by the bot set the new owner's bit through Tortoise signals or `add`. Losing an instance
+    (deletion, trade, donation, craft) cannot clear a bit without knowing if another copy is
+    left, so the previous owner's mask is dropped and loaded again when needed. Changes made
+    from the admin panel are visible once the entry expires, or after `BallsDexBot.load_cache`.
+
+    The database may be read before a change that is recorded while the load is in flight.
+    Balls added meanwhile are set on top of the loaded mask, and a mask invalidated meanwhile
+    is returned without being cached.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of players kept, the least recently used ones are dropped first.
+    ttl: float
+        Number of seconds after which an entry is loaded again.
+    """
+
+    def __init__(self, *, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.cache: TTLCache[int, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.loading: dict[int, list[PendingLoad]] = {}
+
+    async def load(self, player_id: int) -> int:
+        """
+        Compute the mask of a player from the database and cache it.
+        """
+        pending = PendingLoad()
+        self.loading.setdefault(player_id, []).append(pending)
+        try:
+            ball_ids = await InventoryCount.filter(player_id=player_id).values_list(
+                "ball_id", flat=True
+            )
+        finally:
+            loads = self.loading[player_id]
+            loads.remove(pending)
+            if not loads:
+                del self.loading[player_id]
+        mask = ids_to_mask(ball_ids) | pending.added  # type: ignore
+        if not pending.invalidated:
+            self.cache[player_id] = mask
+        return mask
+
+    async def get(self, player_id: int) -> int:
+        """
+        Return the mask of owned balls of a player.
+        """
+        try:
+            return self.cache[player_id]
+        except KeyError:
+            return await self.load(player_id)
+
+    async def owns(self, player_id: int, ball_id: int) -> bool:
+        return bool(await self.get(player_id) >> ball_id & 1)
+
+    async def ball_ids(self, player_id: int) -> set[int]:
+        return mask_to_ids(await self.get(player_id))
+
+    def add(self, player_id: int, ball_id: int):
+        """
+        Record that a player now owns a ball. Does nothing if the player's mask is neither
+        loaded nor being loaded.
+        """
+        if (mask := self.cache.get(player_id)) is not None:
+            self.cache[player_id] = mask | 1 << ball_id
+        for pending in self.loading.get(player_id, ()):
+            pending.added |= 1 << ball_id
+
+    def invalidate(self, player_id: int):
+        self.cache.pop(player_id, None)
+        for pending in self.loading.get(player_id, ()):
+            pending.invalidated = True
+
+    def clear(self):
+        self.cache.clear()
+        for loads in self.loading.values():
+            for pending in loads:
+                pending.invalidated = True
+
+    async def check(self) -> list[int]:
+        """
+        Compare every cached mask with the database and reload the ones that differ.
+
+        Returns
+        -------
+        list[int]
+            The primary keys of the players whose cached mask was wrong.
+        """
+        mismatches: list[int] = []
+        for player_id, mask in list(self.cache.items()):
+            if await self.load(player_id) != mask:
+                mismatches.append(player_id)
+        return mismatches
+
+
+owned_balls = OwnedBallsCache()
+
+
+async def _record_owner(
+    model: Type[BallInstance],
+    instance: BallInstance,
+    created: bool,
+    using_db: "BaseDBAsyncClient | None" = None,
+    update_fields: Iterable[str] | None = None,
+):
+    if update_fields and "player" not in update_fields and "player_id" not in update_fields:
+        return
+    owned_balls.add(instance.player_id, instance.ball_id)  # type: ignore
+    # transfers store the previous owner, who may not own this ball anymore
+    if not created and instance.trade_player_id:
+        owned_balls.invalidate(instance.trade_player_id)
+
+
+async def _drop_owner(
+    model: Type[BallInstance], instance: BallInstance, using_db: "BaseDBAsyncClient | None" = None
+):
+    owned_balls.invalidate(instance.player_id)  # type: ignore
+
+
+BallInstance.register_listener(signals.Signals.post_save, _record_owner)
+BallInstance.register_listener(signals.Signals.post_delete, _drop_owner)
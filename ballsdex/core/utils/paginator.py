@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import discord
 from discord.ext.commands import Paginator as CommandPaginator
+from tortoise.expressions import Q
 
 from ballsdex.core.utils import menus
 
 if TYPE_CHECKING:
+    from tortoise.models import Model
+    from tortoise.queryset import QuerySet
+
     from ballsdex.core.bot import BallsDexBot
 
 log = logging.getLogger("ballsdex.core.utils.paginator")
@@ -281,6 +287,125 @@ class Pages(discord.ui.View):
         self.stop()
 
 
+class KeysetPageSource(menus.PageSource):
+    """
+    A data source reading an ordered queryset one page at a time, instead of loading all of
+    it before the first page.
+
+    The page following a loaded one is read with keyset pagination: the rows ordered after the
+    last row of that page. Jumping to an arbitrary page falls back to an offset. The next page
+    is prefetched in the background while the current one is displayed.
+
+    This page source does not handle any sort of formatting, leaving it up to the user. To do
+    so, implement the :meth:`format_page` method.
+
+    Parameters
+    ----------
+    queryset: QuerySet
+        The ordered queryset to paginate, not awaited.
+    ordering: list[str]
+        The keys the queryset is ordered by, as passed to ``order_by``. They must be fields or
+        annotations readable on the rows and end with a unique key. If empty, every page is
+        read with an offset.
+    per_page: int
+        How many rows are in a page.
+    count: int | None
+        Total number of rows if known beforehand, to show the number of pages immediately.
+        Otherwise it is known once the last page is read.
+    """
+
+    def __init__(
+        self,
+        queryset: "QuerySet[Any]",
+        ordering: list[str],
+        *,
+        per_page: int,
+        count: int | None = None,
+    ):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+        self.count = count
+        self.pages: dict[int, list[Any]] = {}
+        self._prefetching: dict[int, asyncio.Task] = {}
+
+    async def prepare(self):
+        await self._fetch(0)
+
+    async def is_empty(self) -> bool:
+        await self._prepare_once()
+        return not self.pages[0]
+
+    def is_paginating(self) -> bool:
+        return self.has_page(1)
+
+    def get_max_pages(self) -> int | None:
+        if self.count is None:
+            return None
+        return max(math.ceil(self.count / self.per_page), 1)
+
+    def has_page(self, page_number: int) -> bool:
+        max_pages = self.get_max_pages()
+        return max_pages is None or page_number < max_pages
+
+    def _after(self, row: "Model") -> Q:
+        # (a, b, id) > (x, y, z) expanded for mixed directions:
+        # a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z)
+        conditions: list[Q] = []
+        equal: dict[str, Any] = {}
+        for key in self.ordering:
+            name = key.removeprefix("-")
+            value = getattr(row, name)
+            operator = "lt" if key.startswith("-") else "gt"
+            conditions.append(Q(**equal, **{f"{name}__{operator}": value}))
+            equal[name] = value
+        # the redundant a >= x gives the index scan a starting point
+        first = self.ordering[0]
+        name = first.removeprefix("-")
+        bound = Q(**{f"{name}__{'lte' if first.startswith('-') else 'gte'}": getattr(row, name)})
+        return bound & Q(*conditions, join_type="OR")
+
+    async def _fetch(self, page_number: int):
+        previous = self.pages.get(page_number - 1)
+        if previous and self.ordering:
+            queryset = self.queryset.filter(self._after(previous[-1]))
+        else:
+            queryset = self.queryset.offset(page_number * self.per_page)
+        # one more row tells if there is a next page
+        rows = await queryset.limit(self.per_page + 1)
+        self.pages[page_number] = rows[: self.per_page]
+        if len(rows) <= self.per_page:
+            self.count = page_number * self.per_page + len(rows)
+
+    async def _prefetch(self, page_number: int):
+        try:
+            await self._fetch(page_number)
+        except Exception:
+            log.warning(f"Failed to prefetch page {page_number}", exc_info=True)
+
+    async def get_page(self, page_number: int) -> list[Any]:
+        if page_number < 0:
+            raise IndexError("Negative page number.")
+        if page_number > 0 and not self.has_page(page_number):
+            raise IndexError("Went too far")
+        if task := self._prefetching.pop(page_number, None):
+            await task
+        if page_number not in self.pages:
+            await self._fetch(page_number)
+
+        entries = self.pages[page_number]
+        if not entries and page_number > 0:
+            raise IndexError("Went too far")
+        next_page = page_number + 1
+        if (
+            self.has_page(next_page)
+            and next_page not in self.pages
+            and next_page not in self._prefetching
+        ):
+            self._prefetching[next_page] = asyncio.create_task(self._prefetch(next_page))
+        return entries
+
+
 class FieldPageSource(menus.ListPageSource):
     """A page source that requires (field_name, field_value) tuple items."""
 
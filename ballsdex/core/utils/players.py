@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Type
+
+from cachetools import TTLCache
+from tortoise import Tortoise, signals
+
+from ballsdex.core.models import (
+    DonationPolicy,
+    FriendPolicy,
+    MentionPolicy,
+    Player,
+    PrivacyPolicy,
+    TradeCooldownPolicy,
+)
+
+if TYPE_CHECKING:
+    from tortoise.backends.base.client import BaseDBAsyncClient
+
+# entries expire to pick up the changes made from the admin panel, which runs in another process
+CACHE_TTL = 30 * 60
+CACHE_SIZE = 100_000
+
+# saving one of those fields refreshes the cached identity
+IDENTITY_FIELDS = frozenset(
+    (
+        "discord_id",
+        "donation_policy",
+        "privacy_policy",
+        "mention_policy",
+        "friend_policy",
+        "trade_cooldown_policy",
+    )
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerIdentity:
+    """
+    The primary key and the rarely changing fields of a player, enough for the commands that
+    only need to know who the player is and what they allow.
+
+    Counters like credits or trophies are not included, fetch the `Player` for those.
+    """
+
+    pk: int
+    discord_id: int
+    donation_policy: DonationPolicy
+    privacy_policy: PrivacyPolicy
+    mention_policy: MentionPolicy
+    friend_policy: FriendPolicy
+    trade_cooldown_policy: TradeCooldownPolicy
+
+    @classmethod
+    def from_player(cls, player: Player) -> "PlayerIdentity":
+        return cls(
+            pk=player.pk,
+            discord_id=player.discord_id,
+            donation_policy=player.donation_policy,
+            privacy_policy=player.privacy_policy,
+            mention_policy=player.mention_policy,
+            friend_policy=player.friend_policy,
+            trade_cooldown_policy=player.trade_cooldown_policy,
+        )
+
+    @property
+    def can_be_mentioned(self) -> bool:
+        return self.mention_policy == MentionPolicy.ALLOW
+
+
+def _build_upsert_query() -> tuple[str, list[str]]:
+    """
+    Build the query creating a player if missing and returning the row either way, with the
+    names of the fields to pass as parameters, in order.
+    """
+    projection = Player._meta.fields_db_projection
+    fields = [name for name in projection if name != Player._meta.pk_attr]
+    columns = ", ".join(projection[x] for x in fields)
+    placeholders = ", ".join(f"${i}" for i in range(1, len(fields) + 1))
+    returning = ", ".join(f"{column} AS {name}" for name, column in projection.items())
+    discord_id = f"${fields.index('discord_id') + 1}"
+    # All parts of the statement see the same snapshot: if the insert happens, the second select
+    # does not see the new row, otherwise it usually finds the existing one. When a concurrent
+    # transaction inserted the player after the snapshot was taken, nothing is returned and the
+    # statement must be run again.
+    query = f"""
+    WITH inserted AS (
+        INSERT INTO {Player._meta.db_table} ({columns})
+        VALUES ({placeholders})
+        ON CONFLICT ({projection["discord_id"]}) DO NOTHING
+        RETURNING {returning}
+    )
+    SELECT TRUE AS created, * FROM inserted
+    UNION ALL
+    SELECT FALSE AS created, {returning}
+    FROM {Player._meta.db_table}
+    WHERE {projection["discord_id"]} = {discord_id}
+    LIMIT 1
+    """
+    return query, fields
+
+
+class PlayerCache:
+    """
+    Resolves discord IDs to players.
+
+    `get_or_create` fetches the full player, creating it if needed, in a single statement
+    instead of the SELECT, INSERT and SELECT again of `Player.get_or_create`. `resolve` returns
+    the `PlayerIdentity` from a bounded TTL cache and only queries on a miss.
+
+    Saves and deletions of players made by the bot keep the cache up to date through Tortoise
+    signals, so changing a policy is visible immediately. Changes made from the admin panel are
+    visible once the entry expires, or after `BallsDexBot.load_cache`.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of players kept, the least recently used ones are dropped first.
+    ttl: float
+        Number of seconds after which an entry is fetched again.
+    """
+
+    def __init__(self, *, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.cache: TTLCache[int, PlayerIdentity] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._query: tuple[str, list[str]] | None = None
+
+    async def get_or_create(self, discord_id: int) -> tuple[Player, bool]:
+        """
+        Return the player with this discord ID, and whether it was just created.
+        """
+        if self._query is None:
+            self._query = _build_upsert_query()
+        query, fields = self._query
+
+        # the defaults of a new player, converted like Tortoise would on insert
+        new_player = Player(discord_id=discord_id)
+        values = [
+            Player._meta.fields_map[x].to_db_value(getattr(new_player, x), new_player)
+            for x in fields
+        ]
+        connection = Tortoise.get_connection("default")
+        _, rows = await connection.execute_query(query, values)
+        if not rows:
+            # lost the race against another insert, which is now committed and visible
+            _, rows = await connection.execute_query(query, values)
+        row = dict(rows[0])
+        created = row.pop("created")
+
+        player = Player(**row)
+        player._saved_in_db = True
+        self.cache[discord_id] = PlayerIdentity.from_player(player)
+        return player, created
+
+    async def resolve(self, discord_id: int) -> PlayerIdentity:
+        """
+        Return the identity of the player with this discord ID, creating the player if needed.
+        """
+        try:
+            return self.cache[discord_id]
+        except KeyError:
+            pass
+        player, _ = await self.get_or_create(discord_id)
+        return PlayerIdentity.from_player(player)
+
+    def invalidate(self, discord_id: int):
+        self.cache.pop(discord_id, None)
+
+    def clear(self):
+        self.cache.clear()
+
+
+player_cache = PlayerCache()
+
+
+async def _refresh_identity(
+    model: Type[Player],
+    instance: Player,
+    created: bool,
+    using_db: "BaseDBAsyncClient | None" = None,
+    update_fields: Iterable[str] | None = None,
+):
+    if update_fields and IDENTITY_FIELDS.isdisjoint(update_fields):
+        return
+    player_cache.cache[instance.discord_id] = PlayerIdentity.from_player(instance)
+
+
+async def _invalidate(
+    model: Type[Player], instance: Player, using_db: "BaseDBAsyncClient | None" = None
+):
+    player_cache.invalidate(instance.discord_id)
+
+
+Player.register_listener(signals.Signals.post_save, _refresh_identity)
+Player.register_listener(signals.Signals.post_delete, _invalidate)
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+
+from tortoise import Tortoise
+
+from ballsdex.core.models import RegimeCategory
+from ballsdex.core.utils.catalog import catalog
+
+# everything shown on a profile in a single round trip, every part is served by an index
+PROFILE_QUERY = """
+SELECT
+    COALESCE(totals.total, 0) AS total,
+    COALESCE(totals.specials, 0) AS specials,
+    owned.ball_ids,
+    trades.count AS trades,
+    trades.partners
+FROM (
+    SELECT COALESCE(array_agg(DISTINCT ball_id), '{}'::bigint[]) AS ball_ids
+    FROM inventorycount
+    WHERE player_id = $1
+) AS owned
+CROSS JOIN (
+    SELECT
+        COUNT(*) AS count,
+        COUNT(DISTINCT CASE WHEN player1_id = $1 THEN player2_id ELSE player1_id END)
+            FILTER (WHERE player1_id <> player2_id) AS partners
+    FROM trade
+    WHERE player1_id = $1 OR player2_id = $1
+) AS trades
+LEFT JOIN inventorytotal AS totals ON totals.player_id = $1
+"""
+
+
+@dataclass(frozen=True)
+class ProfileStats:
+    """
+    The statistics shown on the profile of a player.
+
+    Attributes
+    ----------
+    total: int
+        Number of instances owned.
+    specials: int
+        Number of instances owned with a special.
+    owned: frozenset[int]
+        IDs of the balls owned at least once.
+    trades: int
+        Number of trades done.
+    partners: int
+        Number of distinct players traded with.
+    """
+
+    total: int
+    specials: int
+    owned: frozenset[int]
+    trades: int
+    partners: int
+
+    def completion(self, category: RegimeCategory) -> tuple[int, int]:
+        """
+        Return how many of the enabled balls of a category are owned, and how many there are.
+        """
+        ball_ids = catalog.ball_ids(category)
+        return len(self.owned & ball_ids), len(ball_ids)
+
+
+async def profile_stats(player_id: int) -> ProfileStats:
+    """
+    Compute the statistics of a player's profile with a single query.
+    """
+    connection = Tortoise.get_connection("default")
+    _, rows = await connection.execute_query(PROFILE_QUERY, [player_id])
+    row = rows[0]
+    return ProfileStats(
+        total=row["total"],
+        specials=row["specials"],
+        owned=frozenset(row["ball_ids"]),
+        trades=row["trades"],
+        partners=row["partners"],
+    )
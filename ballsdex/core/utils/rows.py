@@ -0,0 +1,43 @@
+from collections import namedtuple
+from functools import cache
+from typing import TYPE_CHECKING, Any, Type
+
+if TYPE_CHECKING:
+    from tortoise.models import Model
+    from tortoise.queryset import QuerySet
+
+
+@cache
+def row_type(model: Type["Model"], fields: tuple[str, ...]) -> Type[tuple]:
+    """
+    The named tuple class of the rows of a model with these fields, created once per subset.
+    """
+    return namedtuple(f"{model.__name__}Row", fields)
+
+
+async def fetch_rows(queryset: "QuerySet[Any]", *fields: str) -> list[Any]:
+    """
+    Read some fields of the rows of a queryset without building model instances.
+
+    Each row is a named tuple with the requested fields as attributes, in the same order.
+    Related fields are followed like in filters, ``trade_player__discord_id`` is read as the
+    ``trade_player__discord_id`` attribute and is `None` if there is no relation.
+
+    Rows cost a fraction of the memory and time of models, which track their changes and
+    relations. Use them for bulk reads that display or export values, and models for what
+    has to be saved or passed to model methods.
+
+    Parameters
+    ----------
+    queryset: QuerySet[Any]
+        The filtered and ordered queryset, **without awaiting it!**
+    *fields: str
+        The fields to read.
+
+    Returns
+    -------
+    list[Any]
+        One named tuple per row.
+    """
+    row = row_type(queryset.model, fields)
+    return list(map(row._make, await queryset.values_list(*fields)))
@@ -0,0 +1,165 @@
+import string
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Generic, Hashable, Iterable, TypeVar
+
+from cachetools import TTLCache
+
+from ballsdex.core.utils.catch_names import normalize_name
+
+if TYPE_CHECKING:
+    from ballsdex.core.models import Ball
+
+T = TypeVar("T")
+
+# instance IDs are bigint primary keys
+MAX_INSTANCE_ID = 2**63 - 1
+
+# a session only lives while the user is typing in the option
+SESSION_TTL = 30
+SESSION_SIZE = 10_000
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a name or an autocompletion query for substring search, ignoring case, accents
+    and fancy quotes.
+    """
+    return normalize_name(text, strip_accents=True)
+
+
+def hex_id_ranges(prefix: str) -> list[tuple[int, int]]:
+    """
+    The ranges of instance IDs whose hexadecimal form, as shown on cards, starts with the
+    prefix. Each range is read from the primary key index, unlike a substring search.
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        Start (included) and end (excluded) of every range, empty if the prefix is not
+        hexadecimal.
+    """
+    if not prefix or prefix.startswith("0") or any(x not in string.hexdigits for x in prefix):
+        return []
+    # "1A" is 0x1A itself, then 0x1A0 to 0x1AF, 0x1A00 to 0x1AFF, and so on
+    start = int(prefix, 16)
+    end = start + 1
+    ranges: list[tuple[int, int]] = []
+    while start <= MAX_INSTANCE_ID:
+        ranges.append((start, min(end, MAX_INSTANCE_ID + 1)))
+        start <<= 4
+        end <<= 4
+    return ranges
+
+
+class BallSearchIndex:
+    """
+    The text searched by the autocompletion of instances for every ball: its name, catch names
+    and translations, normalized once with `normalize_query`. Matching a query gives the IDs
+    of the balls to look for, so that the database only reads the player's instances of those
+    balls.
+
+    Rebuilt by `BallsDexBot.load_cache`. Balls missing from it, for instance created after the
+    last load, are indexed on first use.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.texts: dict[int, str] = {}
+        self.names: dict[int, str] = {}
+
+    def index_ball(self, ball: "Ball") -> str:
+        text = " ".join(x for x in (ball.country, ball.catch_names, ball.translations) if x)
+        self.texts[ball.pk] = text = normalize_query(text)
+        self.names[ball.pk] = normalize_query(ball.country)
+        return text
+
+    def rebuild(self, balls: Iterable["Ball"]):
+        self.texts.clear()
+        self.names.clear()
+        for ball in balls:
+            self.index_ball(ball)
+        self.version += 1
+
+    def matching(self, balls: Iterable["Ball"], query: str) -> list[int]:
+        """
+        Return the IDs of the balls whose search text contains the normalized query.
+        """
+        ball_ids: list[int] = []
+        for ball in balls:
+            text = self.texts.get(ball.pk)
+            if text is None:
+                text = self.index_ball(ball)
+            if query in text:
+                ball_ids.append(ball.pk)
+        return ball_ids
+
+    def narrow(self, ball_ids: Iterable[int], query: str) -> list[int]:
+        """
+        Keep the IDs of the balls whose search text contains the normalized query, among balls
+        that are already indexed.
+        """
+        return [x for x in ball_ids if query in self.texts.get(x, "")]
+
+    def exact(self, balls: Iterable["Ball"], name: str) -> list[int]:
+        """
+        Return the IDs of the balls named exactly like this, ignoring case and accents.
+        """
+        name = normalize_query(name)
+        ball_ids: list[int] = []
+        for ball in balls:
+            if ball.pk not in self.names:
+                self.index_ball(ball)
+            if self.names[ball.pk] == name:
+                ball_ids.append(ball.pk)
+        return ball_ids
+
+
+@dataclass(slots=True)
+class AutocompleteSession(Generic[T]):
+    """
+    What an autocompletion last matched for a user.
+
+    Attributes
+    ----------
+    query: str
+        The last query, normalized.
+    context: Hashable
+        What else decided the candidates, like the version of the searched items or the value
+        of other options.
+    candidates: T
+        Everything that matched the query, not only the choices that were shown.
+    """
+
+    query: str
+    context: Hashable
+    candidates: T
+
+
+class AutocompleteSessions(Generic[T]):
+    """
+    The last results of an autocompletion for each user and option.
+
+    Every character typed extends the previous query. Since anything matching the new query
+    also matched the previous one, only the previous candidates have to be searched again,
+    and each keystroke is cheaper than the last one. Sessions expire once the user stops
+    typing.
+    """
+
+    def __init__(self, *, maxsize: int = SESSION_SIZE, ttl: float = SESSION_TTL):
+        self.sessions: TTLCache[Any, AutocompleteSession[T]] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: Hashable, query: str, context: Hashable) -> T | None:
+        """
+        Return the candidates of the previous query if the new one extends it in the same
+        context, else `None`.
+        """
+        session = self.sessions.get(key)
+        if session is None or session.context != context or not query.startswith(session.query):
+            return None
+        return session.candidates
+
+    def set(self, key: Hashable, query: str, context: Hashable, candidates: T):
+        self.sessions[key] = AutocompleteSession(query, context, candidates)
+
+
+ball_search_index = BallSearchIndex()
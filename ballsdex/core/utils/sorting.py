@@ -29,6 +29,20 @@ class SortingChoices(enum.Enum):
     duplicates = "duplicates"
 
 
+# Every method but duplicates sorts on values indexed after the player ID, see the indexes of
+# BallInstance. The rarity, names and stats of the balls are copied on the instances by
+# triggers for that purpose.
+
+# non-specials are sorted after every special, like NULLs in an ascending order
+NO_SPECIAL_ORDER = 2**31 - 1
+
+# how many times the player owns the ball of the instance, read from the inventory counts
+DUPLICATES_SQL = (
+    "(SELECT SUM(count) FROM inventorycount WHERE inventorycount.player_id = "
+    "ballinstance.player_id AND inventorycount.ball_id = ballinstance.ball_id)"
+)
+
+
 def sort_balls(
     sort: SortingChoices, queryset: "QuerySet[BallInstance]"
 ) -> "QuerySet[BallInstance]":
@@ -50,53 +64,59 @@ def sort_balls(
     QuerySet[BallInstance]
         The same queryset modified to apply the ordering. Await it to obtain the result.
     """
+    return ordered_balls(sort, queryset)[0]
+
+
+def ordered_balls(
+    sort: SortingChoices | None, queryset: "QuerySet[BallInstance]", *, reverse: bool = False
+) -> tuple["QuerySet[BallInstance]", list[str]]:
+    """
+    Apply a sorting method like `sort_balls`, with a total order that can be resumed after any
+    instance: the values sorted on are annotated on the instances, and the ID breaks ties.
+
+    Parameters
+    ----------
+    sort: SortingChoices | None
+        One of the supported sorting methods, or `None` to list the favorites first.
+    queryset: QuerySet[BallInstance]
+        An existing queryset of ball instances, not awaited.
+    reverse: bool
+        Reverse the order.
+
+    Returns
+    -------
+    tuple[QuerySet[BallInstance], list[str]]
+        The ordered queryset, and its keys as passed to ``order_by``.
+    """
     if sort == SortingChoices.duplicates:
-        return queryset.annotate(count=RawSQL("COUNT(*) OVER (PARTITION BY ball_id)")).order_by(
-            "-count"
-        )
+        queryset = queryset.annotate(count=RawSQL(DUPLICATES_SQL))
+        ordering = ["-count", "ball_id", "id"]
     elif sort == SortingChoices.stats_bonus:
-        return queryset.annotate(stats_bonus=F("health_bonus") + F("attack_bonus")).order_by(
-            "-stats_bonus"
-        )
+        queryset = queryset.annotate(stats_bonus=F("health_bonus") + F("attack_bonus"))
+        ordering = ["-stats_bonus", "-id"]
     elif sort in (SortingChoices.health, SortingChoices.attack):
-        queryset = queryset.select_related("ball")
-        return (
-            queryset
-            .annotate(
-                **{f"{sort.value}_sort": F(f"{sort.value}_bonus") + F(f"ball__{sort.value}")}
-            )
-            .order_by(f"-{sort.value}_sort")
-        )
+        ordering = [f"-sort_{sort.value}", "-id"]
     elif sort == SortingChoices.total_stats:
-        queryset = queryset.select_related("ball")
-        return (
-            queryset
-            .annotate(
-                total_stats=F("health_bonus") + F("attack_bonus") + F("ball__health") + F("ball__attack")
-            )
-            .order_by("-total_stats")
-        )
+        queryset = queryset.annotate(total_stats=F("sort_health") + F("sort_attack"))
+        ordering = ["-total_stats", "-id"]
     elif sort == SortingChoices.rarity:
-        CUSTOM_REGIME_ORDER = [
-            35, 34, 19, 20, 21, 27, 33, 40, 37, 36, 26, 16,
-            25, 39, 8, 24, 7, 23, 38, 6, 22, 5
-        ]
-        REGIME_ORDER_LOOKUP = {regime_id: index for index, regime_id in enumerate(CUSTOM_REGIME_ORDER)}
-
-        # FIXED: Select related "ball" instead of "regime"
-        queryset = queryset.select_related("ball")
-
-        when_conditions = [
-            f"WHEN regime_id = {regime_id} THEN {order_index}"
-            for regime_id, order_index in REGIME_ORDER_LOOKUP.items()
-        ]
-        case_sql = "CASE " + " ".join(when_conditions) + f" ELSE {len(CUSTOM_REGIME_ORDER)} END"
-
-        return queryset.annotate(
-            regime_order=RawSQL(case_sql)
-        ).order_by("regime_order", "ball__country")
+        # rarest regimes first, as ranked in the admin panel
+        ordering = ["sort_rarity", "sort_country", "id"]
+    elif sort == SortingChoices.alphabetic:
+        ordering = ["sort_country", "id"]
+    elif sort == SortingChoices.special:
+        queryset = queryset.annotate(
+            special_order=RawSQL(f"COALESCE(ballinstance.special_id, {NO_SPECIAL_ORDER})")
+        )
+        ordering = ["special_order", "id"]
+    elif sort is not None:
+        ordering = [sort.value, "-id" if sort.value.startswith("-") else "id"]
     else:
-        return queryset.order_by(sort.value)
+        ordering = ["-favorite", "id"]
+
+    if reverse:
+        ordering = [x[1:] if x.startswith("-") else f"-{x}" for x in ordering]
+    return queryset.order_by(*ordering), ordering
 
 
 def filter_balls(
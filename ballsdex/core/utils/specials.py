@@ -0,0 +1,136 @@
+import bisect
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from tortoise.timezone import get_default_timezone
+from tortoise.timezone import now as tortoise_now
+
+if TYPE_CHECKING:
+    from ballsdex.core.models import Special
+
+# end dates are inclusive, the active set only changes right after them
+END_DATE_OFFSET = timedelta(microseconds=1)
+
+
+@dataclass(frozen=True)
+class SpecialWindow:
+    """
+    The specials that are active between two schedule boundaries, with their cumulative
+    weights ready for `random.choices`.
+
+    Attributes
+    ----------
+    start: datetime
+        First instant (inclusive) where this window applies.
+    end: datetime
+        First instant (exclusive) where this window stops applying.
+    population: list[Special | None]
+        Active specials, followed by `None` which represents the common countryball.
+    cum_weights: list[float]
+        Cumulative weights matching `population`.
+    """
+
+    start: datetime
+    end: datetime
+    population: list["Special | None"] = field(default_factory=list)
+    cum_weights: list[float] = field(default_factory=list)
+
+    def __contains__(self, time: datetime) -> bool:
+        return self.start <= time < self.end
+
+
+class SpecialSchedule:
+    """
+    Precomputed index of the special events schedule.
+
+    The start and end dates of all specials split the timeline into windows where the set of
+    active specials does not change. The window containing the current time is computed once,
+    then reused for every draw until the clock crosses its end boundary or the index is rebuilt
+    with `rebuild` (done by `BallsDexBot.load_cache`).
+
+    Parameters
+    ----------
+    clock: Callable[[], datetime]
+        Function returning the current aware datetime. Replace it with a frozen clock for tests.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = tortoise_now):
+        self.clock = clock
+        self.specials: list["Special"] = []
+        self.boundaries: list[datetime] = []
+        self._window: SpecialWindow | None = None
+
+    @property
+    def min_date(self) -> datetime:
+        return datetime.min.replace(tzinfo=get_default_timezone())
+
+    @property
+    def max_date(self) -> datetime:
+        return datetime.max.replace(tzinfo=get_default_timezone())
+
+    def rebuild(self, specials: Iterable["Special"]):
+        """
+        Reload the index from a new list of specials and drop the cached window.
+        """
+        self.specials = list(specials)
+        boundaries: set[datetime] = set()
+        for special in self.specials:
+            if special.start_date:
+                boundaries.add(special.start_date)
+            if special.end_date and special.end_date < self.max_date - END_DATE_OFFSET:
+                boundaries.add(special.end_date + END_DATE_OFFSET)
+        self.boundaries = sorted(boundaries)
+        self._window = None
+
+    def is_active(self, special: "Special", time: datetime) -> bool:
+        # handle null start/end dates with infinity times
+        return (special.start_date or self.min_date) <= time <= (special.end_date or self.max_date)
+
+    def compute_window(self, time: datetime) -> SpecialWindow:
+        """
+        Build the window containing the given time, without touching the cache.
+        """
+        index = bisect.bisect_right(self.boundaries, time)
+        start = self.boundaries[index - 1] if index > 0 else self.min_date
+        end = self.boundaries[index] if index < len(self.boundaries) else self.max_date
+
+        population: list["Special | None"] = [x for x in self.specials if self.is_active(x, time)]
+        if not population:
+            return SpecialWindow(start, end)
+
+        common_weight = max(1 - sum(x.rarity for x in population), 0)  # type: ignore
+        weights = [x.rarity for x in population] + [common_weight]  # type: ignore
+        # None is added representing the common countryball
+        population.append(None)
+        return SpecialWindow(start, end, population, list(accumulate(weights)))
+
+    def current(self) -> SpecialWindow:
+        """
+        Return the window for the current time, recomputing it only when a boundary was crossed.
+        """
+        now = self.clock()
+        window = self._window
+        if window is None or now not in window:
+            window = self._window = self.compute_window(now)
+        return window
+
+    def pick(self, rng: random.Random | None = None) -> "Special | None":
+        """
+        Draw a random special event among the ones currently active, or `None` for a common
+        countryball.
+
+        Parameters
+        ----------
+        rng: random.Random | None
+            Random generator to use, defaults to the global one.
+        """
+        window = self.current()
+        if not window.population:
+            return None
+        return (rng or random).choices(window.population, cum_weights=window.cum_weights, k=1)[0]
+
+
+special_schedule = SpecialSchedule()
@@ -8,10 +8,11 @@ import discord
 from discord import app_commands
 from discord.interactions import Interaction
 from tortoise.exceptions import DoesNotExist
-from tortoise.expressions import Q, RawSQL
+from tortoise.expressions import Q
 from tortoise.models import Model
 from tortoise.timezone import now as tortoise_now
 
+from ballsdex.core.metrics import autocomplete_duration
 from ballsdex.core.models import (
     Ball,
     BallInstance,
@@ -22,6 +23,12 @@ from ballsdex.core.models import (
     economies,
     regimes,
 )
+from ballsdex.core.utils.search import (
+    AutocompleteSessions,
+    ball_search_index,
+    hex_id_ranges,
+    normalize_query,
+)
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -58,6 +65,19 @@ class ValidationError(Exception):
         self.message = message
 
 
+def focused_option(interaction: Interaction) -> str:
+    """
+    Return the name of the option being autocompleted, looking into subcommands.
+    """
+    options = (interaction.data or {}).get("options", [])
+    while options:
+        for option in options:
+            if option.get("focused"):
+                return option["name"]
+        options = next((x["options"] for x in options if "options" in x), [])
+    return ""
+
+
 class ModelTransformer(app_commands.Transformer, Generic[T]):
     """
     Base abstract class for autocompletion from on Tortoise models
@@ -112,11 +132,12 @@ class ModelTransformer(app_commands.Transformer, Generic[T]):
     async def autocomplete(
         self, interaction: Interaction["BallsDexBot"], value: str
     ) -> list[app_commands.Choice[int]]:
-        t1 = time.time()
+        t1 = time.perf_counter()
         choices: list[app_commands.Choice[int]] = []
         for option in await self.get_options(interaction, value):
             choices.append(option)
-        t2 = time.time()
+        t2 = time.perf_counter()
+        autocomplete_duration.labels(transformer=type(self).__name__).observe(t2 - t1)
         log.debug(
             f"{self.name.title()} autocompletion took "
             f"{round((t2 - t1) * 1000)}ms, {len(choices)} results"
@@ -150,6 +171,12 @@ class BallInstanceTransformer(ModelTransformer[BallInstance]):
     name = settings.collectible_name
     model = BallInstance  # type: ignore
 
+    def __init__(self):
+        # matching ball IDs, and the matching instances if there were less than a page of them
+        self.sessions: AutocompleteSessions[tuple[list[int], list[BallInstance] | None]] = (
+            AutocompleteSessions()
+        )
+
     async def get_from_pk(self, value: int) -> BallInstance:
         return await self.model.get(pk=value).prefetch_related("player")
 
@@ -166,7 +193,8 @@ class BallInstanceTransformer(ModelTransformer[BallInstance]):
         if (special := getattr(interaction.namespace, "special", None)) and special.isdigit():
             balls_queryset = balls_queryset.filter(special_id=int(special))
 
-        if interaction.command and (trade_type := interaction.command.extras.get("trade", None)):
+        trade_type = interaction.command.extras.get("trade") if interaction.command else None
+        if trade_type:
             if trade_type == TradeCommandType.PICK:
                 balls_queryset = balls_queryset.filter(
                     Q(
@@ -179,28 +207,54 @@ class BallInstanceTransformer(ModelTransformer[BallInstance]):
                     locked__isnull=False, locked__gt=tortoise_now() - timedelta(minutes=30)
                 )
 
+        # The names are matched in memory, the database only reads the instances of the matching
+        # balls, or the IDs starting with the query, from the indexes.
         if value.startswith("="):
-            ball_name = value[1:]
-            balls_queryset = balls_queryset.filter(ball__country__iexact=ball_name)
-        else:
-            balls_queryset = (
-                balls_queryset.select_related("ball")
-                .annotate(
-                    searchable=RawSQL(
-                        "to_hex(ballinstance.id) || ' ' || ballinstance__ball.country || ' ' || "
-                        "COALESCE(ballinstance__ball.catch_names, '') || ' ' || "
-                        "COALESCE(ballinstance__ball.translations, '')"
-                    )
-                )
-                .filter(searchable__icontains=value.replace(".", ""))
-            )
-        balls_queryset = balls_queryset.limit(25)
-
-        choices: list[app_commands.Choice] = [
+            ball_ids = ball_search_index.exact(balls.values(), value[1:])
+            if not ball_ids:
+                return []
+            balls_queryset = balls_queryset.filter(ball_id__in=ball_ids)
+        elif query := normalize_query(value.replace(".", "")):
+            key = (interaction.user.id, focused_option(interaction))
+            context = (ball_search_index.version, special, trade_type)
+            id_prefix = query.lstrip("#")
+            previous = self.sessions.get(key, query, context)
+            if previous is None:
+                ball_ids = ball_search_index.matching(balls.values(), query)
+            else:
+                ball_ids = ball_search_index.narrow(previous[0], query)
+                if previous[1] is not None:
+                    # the previous query had less than a page of results, they contain all of
+                    # the new ones
+                    matching = set(ball_ids)
+                    instances = [
+                        x
+                        for x in previous[1]
+                        if x.ball_id in matching or f"{x.pk:x}".startswith(id_prefix)
+                    ]
+                    self.sessions.set(key, query, context, (ball_ids, instances))
+                    return self._build_choices(interaction, instances)
+
+            conditions = [Q(id__gte=start, id__lt=end) for start, end in hex_id_ranges(id_prefix)]
+            if ball_ids:
+                conditions.append(Q(ball_id__in=ball_ids))
+            if not conditions:
+                self.sessions.set(key, query, context, (ball_ids, []))
+                return []
+            instances = await balls_queryset.filter(Q(*conditions, join_type="OR")).limit(25)
+            complete = instances if len(instances) < 25 else None
+            self.sessions.set(key, query, context, (ball_ids, complete))
+            return self._build_choices(interaction, instances)
+
+        return self._build_choices(interaction, await balls_queryset.limit(25))
+
+    def _build_choices(
+        self, interaction: Interaction["BallsDexBot"], instances: list[BallInstance]
+    ) -> list[app_commands.Choice[int]]:
+        return [
             app_commands.Choice(name=x.description(bot=interaction.client), value=str(x.pk))
-            for x in await balls_queryset
+            for x in instances
         ]
-        return choices
 
 
 class TTLModelTransformer(ModelTransformer[T]):
@@ -220,8 +274,11 @@ class TTLModelTransformer(ModelTransformer[T]):
 
     def __init__(self):
         self.items: dict[int, T] = {}
-        self.search_map: dict[T, str] = {}
+        # primary keys to the normalized keys
+        self.search_map: dict[int, str] = {}
         self.last_refresh: float = 0
+        # primary keys of the items matching the last query of each user
+        self.sessions: AutocompleteSessions[list[int]] = AutocompleteSessions()
         log.debug(f"Inited transformer for {self.name}")
 
     async def load_items(self) -> Iterable[T]:
@@ -235,22 +292,23 @@ class TTLModelTransformer(ModelTransformer[T]):
         if t - self.last_refresh > self.ttl:
             self.items = {x.pk: x for x in await self.load_items()}
             self.last_refresh = t
-            self.search_map = {x: self.key(x).lower() for x in self.items.values()}
+            self.search_map = {x.pk: normalize_query(self.key(x)) for x in self.items.values()}
 
     async def get_options(
         self, interaction: Interaction["BallsDexBot"], value: str
     ) -> list[app_commands.Choice[str]]:
         await self.maybe_refresh()
 
-        i = 0
-        choices: list[app_commands.Choice] = []
-        for item in self.items.values():
-            if value.lower() in self.search_map[item]:
-                choices.append(app_commands.Choice(name=self.key(item), value=str(item.pk)))
-                i += 1
-                if i == 25:
-                    break
-        return choices
+        query = normalize_query(value)
+        key = (interaction.user.id, focused_option(interaction))
+        candidates = self.sessions.get(key, query, self.last_refresh)
+        if candidates is None:
+            candidates = self.items.keys()
+        matching = [x for x in candidates if query in self.search_map[x]]
+        self.sessions.set(key, query, self.last_refresh, matching)
+        return [
+            app_commands.Choice(name=self.key(self.items[x]), value=str(x)) for x in matching[:25]
+        ]
 
 
 class BallTransformer(TTLModelTransformer[Ball]):
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, Union
 import discord
 
 from ballsdex.core.models import Player, PrivacyPolicy
+from ballsdex.core.utils.players import player_cache
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -27,7 +28,6 @@ async def inventory_privacy(
 ):
     msg = None
     privacy_policy = player.privacy_policy
-    interacting_player, _ = await Player.get_or_create(discord_id=interaction.user.id)
     if interaction.user.id == player.discord_id:
         return True
     if is_staff(interaction):
@@ -40,6 +40,7 @@ async def inventory_privacy(
                 await msg.add_reaction("🧑‍🌾")
         return False
     elif privacy_policy == PrivacyPolicy.FRIENDS:
+        interacting_player, _ = await player_cache.get_or_create(interaction.user.id)
         if not await interacting_player.is_friend(player):
             await interaction.followup.send(
                 "This users inventory can only be viewed from users they have added as friends.",
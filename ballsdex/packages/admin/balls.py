@@ -13,13 +13,17 @@ from tortoise.exceptions import BaseORMException, DoesNotExist
 from ballsdex.core.bot import BallsDexBot
 from ballsdex.core.models import Ball, BallInstance, Player, Special, Trade, TradeObject
 from ballsdex.core.utils.buttons import ConfirmChoiceView
+from ballsdex.core.utils.inventory import inventory_count, rebuild_inventory, verify_inventory
+from ballsdex.core.utils.leaderboards import leaderboards
 from ballsdex.core.utils.logging import log_action
+from ballsdex.core.utils.owned_balls import owned_balls
 from ballsdex.core.utils.transformers import (
     BallTransform,
     EconomyTransform,
     RegimeTransform,
     SpecialTransform,
 )
+from ballsdex.packages.admin.spawn_bomb import SpawnBomb, SpawnBombControl
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -64,58 +68,74 @@ class Balls(app_commands.Group):
         buttonemoji: discord.Emoji | None = None,
         usertimeout: int = 0,
     ):
-        spawned = 0
+        views: list["BallSpawnView"] = []
+        for i in range(n):
+            if not countryball:
+                ball = await countryball_cls.get_random(interaction.client)
+            else:
+                ball = countryball_cls(interaction.client, countryball)
+            ball.special = special
+            ball.atk_bonus = atk_bonus
+            ball.hp_bonus = hp_bonus
+            ball.fakespawn = fakespawn
+            ball.buttondanger = buttondanger
+            ball.buttontext = buttontext
+            ball.buttonemoji = buttonemoji
+            ball.usertimeout = usertimeout if usertimeout > 0 else None
+            views.append(ball)
+
+        bomb = SpawnBomb(views, channel)
+        control = SpawnBombControl(interaction, bomb)
+        description = countryball or "Random"
 
         async def update_message_loop():
             for i in range(5 * 12 * 10):  # timeout progress after 10 minutes
                 await interaction.followup.edit_message(
                     "@original",  # type: ignore
-                    content=f"Spawn bomb in progress in {channel.mention}, "
-                    f"{settings.collectible_name.title()}: {countryball or 'Random'}\n"
-                    f"{spawned}/{n} spawned ({round((spawned / n) * 100)}%)",
+                    content=control.progress(str(description)),
+                    view=control,
                 )
                 await asyncio.sleep(5)
             await interaction.followup.edit_message(
-                "@original", content="Spawn bomb seems to have timed out."  # type: ignore
+                "@original",
+                content="Spawn bomb seems to have timed out.",
+                view=None,  # type: ignore
             )
 
         await interaction.response.send_message(
-            f"Starting spawn bomb in {channel.mention}...", ephemeral=True
+            f"Starting spawn bomb in {channel.mention}...", view=control, ephemeral=True
         )
         task = interaction.client.loop.create_task(update_message_loop())
         try:
-            for i in range(n):
-                if not countryball:
-                    ball = await countryball_cls.get_random(interaction.client)
-                else:
-                    ball = countryball_cls(interaction.client, countryball)
-                ball.special = special
-                ball.atk_bonus = atk_bonus
-                ball.hp_bonus = hp_bonus
-                ball.fakespawn = fakespawn
-                ball.buttondanger = buttondanger
-                ball.buttontext = buttontext
-                ball.buttonemoji = buttonemoji
-                ball.usertimeout = usertimeout if usertimeout > 0 else None
-                result = await ball.spawn(channel)
-                if not result:
-                    task.cancel()
-                    await interaction.followup.edit_message(
-                        "@original",  # type: ignore
-                        content=f"A {settings.collectible_name} failed to spawn, probably "
-                        "indicating a lack of permissions to send messages "
-                        f"or upload files in {channel.mention}.",
-                    )
-                    return
-                spawned += 1
+            await bomb.run()
             task.cancel()
-            await interaction.followup.edit_message(
-                "@original",  # type: ignore
-                content=f"Successfully spawned {spawned} {settings.plural_collectible_name} "
-                f"in {channel.mention}!",
-            )
+            control.stop()
+            if bomb.failed:
+                await interaction.followup.edit_message(
+                    "@original",  # type: ignore
+                    content=f"A {settings.collectible_name} failed to spawn, probably "
+                    "indicating a lack of permissions to send messages "
+                    f"or upload files in {channel.mention}.\n"
+                    f"{bomb.spawned}/{n} spawned.",
+                    view=None,
+                )
+            elif bomb.cancelled.is_set():
+                await interaction.followup.edit_message(
+                    "@original",  # type: ignore
+                    content=f"Spawn bomb stopped, {bomb.spawned}/{n} "
+                    f"{settings.plural_collectible_name} spawned in {channel.mention}.",
+                    view=None,
+                )
+            else:
+                await interaction.followup.edit_message(
+                    "@original",  # type: ignore
+                    content=f"Successfully spawned {bomb.spawned} "
+                    f"{settings.plural_collectible_name} in {channel.mention}!",
+                    view=None,
+                )
         finally:
             task.cancel()
+            bomb.cancel()
 
     @app_commands.command()
     @app_commands.checks.has_any_role(*settings.root_role_ids)
@@ -184,14 +204,14 @@ class Balls(app_commands.Group):
                 countryball,
                 channel or interaction.channel,  # type: ignore
                 n,
-                special,
-                atk_bonus,
-                hp_bonus,
                 fakespawn,
                 buttondanger,
-                buttontext,
-                buttonemoji,
-                usertimeout,
+                special=special,
+                atk_bonus=atk_bonus,
+                hp_bonus=hp_bonus,
+                buttontext=buttontext,
+                buttonemoji=buttonemoji,
+                usertimeout=usertimeout,
             )
             await log_action(
                 f"{interaction.user} spawned {settings.collectible_name}"
@@ -392,6 +412,8 @@ class Balls(app_commands.Group):
             count = len(to_delete)
         else:
             count = await BallInstance.filter(player=player).delete()
+            owned_balls.invalidate(player.pk)
+            leaderboards.invalidate()
         await interaction.followup.send(
             f"{count} {settings.plural_collectible_name} from {user} have been deleted.",
             ephemeral=True,
@@ -423,15 +445,25 @@ class Balls(app_commands.Group):
         """
         if interaction.response.is_done():
             return
-        filters = {}
-        if countryball:
-            filters["ball"] = countryball
-        if special:
-            filters["special"] = special
-        if user:
-            filters["player__discord_id"] = user.id
         await interaction.response.defer(ephemeral=True, thinking=True)
-        balls = await BallInstance.filter(**filters).count()
+        if user:
+            player = await Player.get_or_none(discord_id=user.id)
+            balls = (
+                await inventory_count(
+                    player.pk,
+                    ball_id=countryball.pk if countryball else None,
+                    special_id=special.pk if special else None,
+                )
+                if player
+                else 0
+            )
+        else:
+            filters = {}
+            if countryball:
+                filters["ball"] = countryball
+            if special:
+                filters["special"] = special
+            balls = await BallInstance.filter(**filters).count()
         verb = "is" if balls == 1 else "are"
         country = f"{countryball.country} " if countryball else ""
         plural = "s" if balls > 1 or balls == 0 else ""
@@ -447,6 +479,108 @@ class Balls(app_commands.Group):
                 f"{country}{settings.collectible_name}{plural}."
             )
 
+    @app_commands.command(name="rebuild_owned")
+    @app_commands.checks.has_any_role(*settings.root_role_ids)
+    async def balls_rebuild_owned(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        user: discord.User | None = None,
+    ):
+        """
+        Rebuild the cached sets of owned countryballs used by completion and comparisons.
+
+        Parameters
+        ----------
+        user: discord.User
+            Only rebuild the set of this user. Otherwise, every cached set is checked against
+            the database and the wrong ones are reported.
+        """
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        if user:
+            player = await Player.get_or_none(discord_id=user.id)
+            if not player:
+                await interaction.followup.send("The user you gave does not exist.")
+                return
+            await owned_balls.load(player.pk)
+            await interaction.followup.send(
+                f"The owned {settings.plural_collectible_name} of {user} have been rebuilt."
+            )
+            return
+
+        checked = len(owned_balls.cache)
+        mismatches = await owned_balls.check()
+        if mismatches:
+            log.warning(f"Owned countryballs of players {mismatches} were out of sync")
+        await interaction.followup.send(
+            f"Checked {checked} players, {len(mismatches)} were out of sync and have been rebuilt."
+        )
+
+    @app_commands.command(name="verify_leaderboards")
+    @app_commands.checks.has_any_role(*settings.root_role_ids)
+    async def balls_verify_leaderboards(self, interaction: discord.Interaction[BallsDexBot]):
+        """
+        Compare the leaderboards with a full computation and rebuild the ones that differ.
+        """
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        mismatches = await leaderboards.verify()
+        if not mismatches:
+            await interaction.followup.send("All leaderboards are in sync.")
+            return
+        log.warning(f"Leaderboards out of sync: {', '.join(mismatches)}")
+        leaderboards.invalidate()
+        await interaction.followup.send(
+            f"{len(mismatches)} leaderboards were out of sync and will be rebuilt: "
+            f"{', '.join(mismatches)}"
+        )
+
+    @app_commands.command(name="rebuild_inventory")
+    @app_commands.checks.has_any_role(*settings.root_role_ids)
+    async def balls_rebuild_inventory(
+        self,
+        interaction: discord.Interaction[BallsDexBot],
+        user: discord.User | None = None,
+        check_only: bool = False,
+    ):
+        """
+        Compare the inventory counts with the countryballs and rebuild them if they differ.
+
+        Parameters
+        ----------
+        user: discord.User
+            Only check the counts of this user. Otherwise, every player is checked, and
+            catches wait while the counts are rebuilt.
+        check_only: bool
+            Report the differences without rebuilding.
+        """
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        player_id = None
+        if user:
+            player = await Player.get_or_none(discord_id=user.id)
+            if not player:
+                await interaction.followup.send("The user you gave does not exist.")
+                return
+            player_id = player.pk
+
+        mismatches = await verify_inventory(player_id)
+        if not mismatches:
+            await interaction.followup.send("The inventory counts are in sync.")
+            return
+        log.warning(f"Inventory counts of players {mismatches} were out of sync")
+        if check_only:
+            await interaction.followup.send(
+                f"{len(mismatches)} players have inventory counts out of sync."
+            )
+            return
+        await rebuild_inventory(player_id)
+        await interaction.followup.send(
+            f"{len(mismatches)} players had inventory counts out of sync, "
+            "they have been rebuilt."
+        )
+        await log_action(
+            f"{interaction.user} rebuilt the inventory counts of {user or 'every player'}.",
+            interaction.client,
+        )
+
     @app_commands.command(name="create")
     @app_commands.checks.has_any_role(*settings.root_role_ids)
     async def balls_create(
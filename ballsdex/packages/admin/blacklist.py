@@ -4,13 +4,8 @@ from discord.utils import format_dt
 from tortoise.exceptions import DoesNotExist, IntegrityError
 
 from ballsdex.core.bot import BallsDexBot
-from ballsdex.core.models import (
-    BlacklistedGuild,
-    BlacklistedID,
-    BlacklistHistory,
-    GuildConfig,
-    Player,
-)
+from ballsdex.core.models import BlacklistedGuild, BlacklistedID, BlacklistHistory, Player
+from ballsdex.core.utils.guild_configs import guild_configs
 from ballsdex.core.utils.logging import log_action
 from ballsdex.core.utils.paginator import Pages
 from ballsdex.packages.admin.menu import BlacklistViewFormat
@@ -344,7 +339,7 @@ class BlacklistGuild(app_commands.Group):
                 )
             else:
                 moderator_msg = "Moderator: Unknown"
-            if settings.admin_url and (gconf := await GuildConfig.get_or_none(guild_id=guild.id)):
+            if settings.admin_url and (gconf := await guild_configs.get(guild.id)):
                 admin_url = (
                     "\n[View history online]"
                     f"(<{settings.admin_url}/bd_models/guildconfig/{gconf.pk}/change/>)"
@@ -6,7 +6,8 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ui import Button
 
-from ballsdex.core.models import Ball, GuildConfig
+from ballsdex.core.models import Ball
+from ballsdex.core.utils.guild_configs import guild_configs
 from ballsdex.core.utils.paginator import FieldPageSource, Pages, TextPageSource
 from ballsdex.core.customexceptions import NotAdminGuildError
 from ballsdex.settings import settings
@@ -207,7 +208,7 @@ class Admin(commands.GroupCog):
 
         entries: list[tuple[str, str]] = []
         for guild in guilds:
-            if config := await GuildConfig.get_or_none(guild_id=guild.id):
+            if config := await guild_configs.get(guild.id):
                 spawn_enabled = config.enabled and config.guild_id
             else:
                 spawn_enabled = False
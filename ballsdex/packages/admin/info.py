@@ -5,7 +5,7 @@ from discord import app_commands
 from discord.utils import format_dt
 
 from ballsdex.core.bot import BallsDexBot
-from ballsdex.core.models import BallInstance, GuildConfig, Player
+from ballsdex.core.models import BallInstance, Player
 from ballsdex.core.utils.enums import (
     DONATION_POLICY_MAP,
     FRIEND_POLICY_MAP,
@@ -13,6 +13,8 @@ from ballsdex.core.utils.enums import (
     PRIVATE_POLICY_MAP,
 )
 from ballsdex.core.utils.enums import TRADE_COOLDOWN_POLICY_MAP as TRADE_POLICY_MAP
+from ballsdex.core.utils.guild_configs import guild_configs
+from ballsdex.core.utils.inventory import inventory_totals
 from ballsdex.settings import settings
 
 
@@ -58,7 +60,7 @@ class Info(app_commands.Group):
                 return
 
         url = None
-        if config := await GuildConfig.get_or_none(guild_id=guild.id):
+        if config := await guild_configs.get(guild.id):
             spawn_enabled = config.enabled and config.guild_id
             if settings.admin_url:
                 url = f"{settings.admin_url}/bd_models/guildconfig/{config.pk}/change/"
@@ -156,7 +158,7 @@ class Info(app_commands.Group):
         )
         embed.add_field(
             name=f"Total {settings.plural_collectible_name} caught:",
-            value=await BallInstance.filter(player__discord_id=user.id).count(),
+            value=(await inventory_totals(player.pk))[0],
         )
         embed.add_field(
             name=f"Total unique {settings.plural_collectible_name} caught:",
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import discord
+from discord.ui import Button, View, button
+
+from ballsdex.settings import settings
+
+if TYPE_CHECKING:
+    from ballsdex.core.bot import BallsDexBot
+    from ballsdex.packages.countryballs.countryball import BallSpawnView
+
+log = logging.getLogger("ballsdex.packages.admin.spawn_bomb")
+
+# Discord allows 5 messages per 5 seconds in a channel. Sending more at once only queues them
+# in discord.py's rate limit bucket, so keep the number of requests in flight to that.
+SPAWN_BOMB_WINDOW = 5
+
+
+class SpawnBomb:
+    """
+    Sends a list of pre-sampled spawns to a channel as fast as its rate limit allows.
+
+    Up to `window` messages are in flight at the same time. discord.py tracks the channel's
+    rate limit bucket from the response headers and holds the next requests once it is
+    depleted, so the bomb goes at the maximum rate permitted without hitting 429 errors.
+    Each wild card file is read once and shared by every spawn of the same countryball.
+
+    Parameters
+    ----------
+    views: list[BallSpawnView]
+        The spawns to send, already configured.
+    channel: discord.TextChannel
+        Where to send them.
+    window: int
+        Maximum number of spawns being sent at the same time.
+    """
+
+    def __init__(
+        self,
+        views: list["BallSpawnView"],
+        channel: discord.TextChannel,
+        *,
+        window: int = SPAWN_BOMB_WINDOW,
+    ):
+        self.views = views
+        self.channel = channel
+        self.window = window
+        self.spawned = 0
+        self.failed = False
+        self.cancelled = asyncio.Event()
+
+    @property
+    def total(self) -> int:
+        return len(self.views)
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def load_wild_cards(self):
+        files: dict[str, bytes] = {}
+        for view in self.views:
+            if view.voicefile:
+                continue
+            path = view.model.wild_card
+            if path not in files:
+                files[path] = Path("./admin_panel/media/", path).read_bytes()
+            view.wild_card_data = files[path]
+
+    async def run(self):
+        """
+        Send all spawns. Stops early if cancelled or if a spawn fails, which usually indicates
+        missing permissions.
+        """
+        await asyncio.to_thread(self.load_wild_cards)
+        semaphore = asyncio.Semaphore(self.window)
+
+        async def send(view: "BallSpawnView"):
+            async with semaphore:
+                if self.cancelled.is_set():
+                    return
+                if await view.spawn(self.channel):
+                    self.spawned += 1
+                else:
+                    self.failed = True
+                    self.cancel()
+
+        await asyncio.gather(*(send(view) for view in self.views))
+
+
+class SpawnBombControl(View):
+    """
+    Progress message of a spawn bomb, with a button to stop it.
+    """
+
+    def __init__(self, interaction: discord.Interaction["BallsDexBot"], bomb: SpawnBomb):
+        super().__init__(timeout=None)
+        self.interaction = interaction
+        self.bomb = bomb
+
+    async def interaction_check(self, interaction: discord.Interaction["BallsDexBot"]) -> bool:
+        if interaction.user != self.interaction.user:
+            await interaction.response.send_message(
+                "You cannot interact with this view.", ephemeral=True
+            )
+            return False
+        return True
+
+    @button(label="Stop", style=discord.ButtonStyle.danger)
+    async def stop_button(self, interaction: discord.Interaction["BallsDexBot"], button: Button):
+        self.bomb.cancel()
+        button.disabled = True
+        await interaction.response.edit_message(view=self)
+
+    def progress(self, description: str) -> str:
+        spawned = self.bomb.spawned
+        total = self.bomb.total
+        return (
+            f"Spawn bomb in progress in {self.bomb.channel.mention}, "
+            f"{settings.collectible_name.title()}: {description}\n"
+            f"{spawned}/{total} spawned ({round((spawned / total) * 100)}%)"
+        )
@@ -1,14 +1,12 @@
 import enum
 import logging
-from collections import defaultdict
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import Button, View, button
 from tortoise.exceptions import DoesNotExist
-from tortoise.functions import Count
 
 from ballsdex.core.models import (
     BallInstance,
@@ -18,10 +16,27 @@ from ballsdex.core.models import (
     Trade,
     TradeObject,
     balls,
+    specials,
 )
 from ballsdex.core.utils.buttons import ConfirmChoiceView
+from ballsdex.core.utils.catalog import catalog
+from ballsdex.core.utils.display import display_cache
+from ballsdex.core.utils.inventory import (
+    ball_counts,
+    collection_stats,
+    inventory_count,
+    special_counts,
+)
+from ballsdex.core.utils.leaderboards import leaderboards
+from ballsdex.core.utils.owned_balls import ids_to_mask, mask_to_ids, owned_balls
 from ballsdex.core.utils.paginator import FieldPageSource, Pages
-from ballsdex.core.utils.sorting import FilteringChoices, SortingChoices, filter_balls, sort_balls
+from ballsdex.core.utils.players import player_cache
+from ballsdex.core.utils.sorting import (
+    FilteringChoices,
+    SortingChoices,
+    filter_balls,
+    ordered_balls,
+)
 from ballsdex.core.utils.transformers import (
     BallEnabledTransform,
     BallInstanceTransform,
@@ -29,7 +44,11 @@ from ballsdex.core.utils.transformers import (
     TradeCommandType,
 )
 from ballsdex.core.utils.utils import inventory_privacy, is_staff
-from ballsdex.packages.balls.countryballs_paginator import CountryballsViewer, DuplicateViewMenu
+from ballsdex.packages.balls.countryballs_paginator import (
+    CountryballsViewer,
+    DuplicateViewMenu,
+    LazyCountryballsSource,
+)
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -82,6 +101,7 @@ class DonationRequest(View):
         self.countryball.trade_player = self.countryball.player
         self.countryball.player = self.new_player
         await self.countryball.save()
+        leaderboards.record_transfer(self.countryball, self.countryball.trade_player.pk)
         trade = await Trade.create(player1=self.countryball.trade_player, player2=self.new_player)
         await TradeObject.create(
             trade=trade, ballinstance=self.countryball, player=self.countryball.trade_player
@@ -172,7 +192,7 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             if await inventory_privacy(self.bot, interaction, player, user_obj) is False:
                 return
 
-        interaction_player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        interaction_player, _ = await player_cache.get_or_create(interaction.user.id)
 
         blocked = await player.is_blocked(interaction_player)
         if blocked and not is_staff(interaction):
@@ -181,20 +201,26 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             )
             return
 
-        await player.fetch_related("balls")
-        query = player.balls.all()
+        query = BallInstance.filter(player=player)
         if filter:
             query = filter_balls(filter, query, interaction.guild_id)
         if countryball:
             query = query.filter(ball__id=countryball.pk)
         if special:
             query = query.filter(special=special)
-        if sort:
-            countryballs = await sort_balls(sort, query)
-        else:
-            countryballs = await query.order_by("-favorite")
+        query, ordering = ordered_balls(sort, query, reverse=reverse)
+
+        # the filters are not tracked by the inventory counts, their total is known at the end
+        count = None
+        if not filter:
+            count = await inventory_count(
+                player.pk,
+                ball_id=countryball.pk if countryball else None,
+                special_id=special.pk if special else None,
+            )
+        countryballs = LazyCountryballsSource(query, ordering, count=count)
 
-        if len(countryballs) < 1:
+        if await countryballs.is_empty():
             ball_txt = countryball.country if countryball else ""
             special_txt = special if special else ""
 
@@ -217,8 +243,6 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
                     f"{settings.plural_collectible_name} yet."
                 )
             return
-        if reverse:
-            countryballs.reverse()
 
         paginator = CountryballsViewer(interaction, countryballs)
         if user_obj == interaction.user:
@@ -266,20 +290,6 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         user: discord.User
             The user you would like to see
         """
-        indicator_string = ""
-        SKIN_REGIMES = [
-            22,
-            23,
-            24,
-            25,
-            26,
-            27,
-            37,
-            40,
-            39,
-            38,
-            35
-        ]
         user_obj = user if user else interaction.user
         await interaction.response.defer(thinking=True)
         try:
@@ -296,7 +306,7 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             if await inventory_privacy(self.bot, interaction, player, user_obj) is False:
                 return
 
-        interaction_player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        interaction_player, _ = await player_cache.get_or_create(interaction.user.id)
 
         blocked = await player.is_blocked(interaction_player)
         if blocked and not is_staff(interaction):
@@ -315,10 +325,7 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
                 ephemeral=True,
             )
             return
-        if countryball.ball.regime_id in SKIN_REGIMES:
-            indicator_string = "skin"
-        else:
-            indicator_string = "brawler"
+        indicator_string = catalog.noun(countryball.ball)
         content, file, view = await countryball.prepare_for_message(interaction)
         if user is not None and user.id != interaction.user.id:
             content = (
@@ -414,25 +421,12 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         special: Special
             Filter the results of autocompletion to a special event. Ignored afterwards.
         """
-        SKIN_REGIMES = [
-            22,
-            23,
-            24,
-            25,
-            26,
-            27,
-            37,
-            40,
-            39,
-            38,
-            35
-        ]
         if not countryball:
             return
         await countryball.fetch_related("ball")
         if not countryball.is_tradeable:
             await interaction.response.send_message(
-                f"You cannot donate this {"skin" if countryball.ball.regime_id in SKIN_REGIMES else "brawler"}.", ephemeral=True
+                f"You cannot donate this {catalog.noun(countryball.ball)}.", ephemeral=True
             )
             return
         if user.bot:
@@ -440,7 +434,7 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             return
         if await countryball.is_locked():
             await interaction.response.send_message(
-                f"This {"skin" if countryball.ball.regime_id in SKIN_REGIMES else "brawler"} is currently locked for a trade. "
+                f"This {catalog.noun(countryball.ball)} is currently locked for a trade. "
                 "Please try again later.",
                 ephemeral=True,
             )
@@ -449,11 +443,11 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         if favorite:
             view = ConfirmChoiceView(
                 interaction,
-                accept_message=f"{"Skin" if countryball.ball.regime_id in SKIN_REGIMES else "Brawler"} donated.",
+                accept_message=f"{catalog.noun(countryball.ball).capitalize()} donated.",
                 cancel_message="This request has been cancelled.",
             )
             await interaction.response.send_message(
-                f"This {"skin" if countryball.ball.regime_id in SKIN_REGIMES else "brawler"} is a favorite, "
+                f"This {catalog.noun(countryball.ball)} is a favorite, "
                 "are you sure you want to donate it?",
                 view=view,
                 ephemeral=True,
@@ -465,12 +459,12 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         else:
             await interaction.response.defer()
         await countryball.lock_for_trade()
-        new_player, _ = await Player.get_or_create(discord_id=user.id)
+        new_player, _ = await player_cache.get_or_create(user.id)
         old_player = countryball.player
 
         if new_player == old_player:
             await interaction.followup.send(
-                f"You cannot give a {"skin" if countryball.ball.regime_id in SKIN_REGIMES else "brawler"} to yourself.", ephemeral=True
+                f"You cannot give a {catalog.noun(countryball.ball)} to yourself.", ephemeral=True
             )
             await countryball.unlock()
             return
@@ -518,6 +512,7 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         countryball.trade_player = old_player
         countryball.favorite = False
         await countryball.save()
+        leaderboards.record_transfer(countryball, old_player.pk)
 
         trade = await Trade.create(player1=old_player, player2=new_player)
         await TradeObject.create(trade=trade, ballinstance=countryball, player=old_player)
@@ -529,12 +524,12 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         if favorite:
             await interaction.followup.send(
                 f"{interaction.user.mention}, you just gave the "
-                f"{"skin" if countryball.ball.regime_id in SKIN_REGIMES else "brawler"} {cb_txt} to {user.mention}!",
+                f"{catalog.noun(countryball.ball)} {cb_txt} to {user.mention}!",
                 allowed_mentions=discord.AllowedMentions(users=new_player.can_be_mentioned),
             )
         else:
             await interaction.followup.send(
-                f"You just gave the {"skin" if countryball.ball.regime_id in SKIN_REGIMES else "brawler"} {cb_txt} to {user.mention}!",
+                f"You just gave the {catalog.noun(countryball.ball)} {cb_txt} to {user.mention}!",
                 allowed_mentions=discord.AllowedMentions(users=new_player.can_be_mentioned),
             )
         await countryball.unlock()
@@ -563,18 +558,25 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             return
 
         assert interaction.guild
-        filters = {}
-        if countryball:
-            filters["ball"] = countryball
-        if special:
-            filters["special"] = special
-        if current_server:
-            filters["server_id"] = interaction.guild.id
-        filters["player__discord_id"] = interaction.user.id
-
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        balls = await BallInstance.filter(**filters).count()
+        if current_server:
+            filters = {}
+            if countryball:
+                filters["ball"] = countryball
+            if special:
+                filters["special"] = special
+            filters["server_id"] = interaction.guild.id
+            filters["player__discord_id"] = interaction.user.id
+            balls = await BallInstance.filter(**filters).count()
+        else:
+            # the projection does not know where instances were caught
+            player = await player_cache.resolve(interaction.user.id)
+            balls = await inventory_count(
+                player.pk,
+                ball_id=countryball.pk if countryball else None,
+                special_id=special.pk if special else None,
+            )
         country = f"{countryball.country} " if countryball else ""
         plural = "s" if balls > 1 or balls == 0 else ""
         special_str = f"{special.name} " if special else ""
@@ -605,29 +607,23 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         """
         await interaction.response.defer(thinking=True, ephemeral=True)
 
-        player, _ = await Player.get_or_create(discord_id=interaction.user.id)
-        await player.fetch_related("balls")
-        is_special = type == DuplicateType.specials
-        queryset = BallInstance.filter(player=player)
-
-        if is_special:
-            queryset = queryset.filter(special_id__isnull=False).prefetch_related("special")
-            annotations = {"name": "special__name", "emoji": "special__emoji"}
-            apply_limit = False
+        player = await player_cache.resolve(interaction.user.id)
+        if type == DuplicateType.specials:
+            counts = await special_counts(player.pk)
+            results = [
+                (x, specials[x].name, display_cache.special(specials[x]).emoji, y)
+                for x, y in counts.items()
+                if x in specials
+            ]
         else:
-            queryset = queryset.filter(ball__tradeable=True)
-            annotations = {"name": "ball__country", "emoji": "ball__emoji_id"}
-            apply_limit = True
-
-        query = (
-            queryset.annotate(count=Count("id")).group_by(*annotations.values()).order_by("-count")
-        )
-
-        if apply_limit and limit is not None:
-            query = query.limit(limit)
-
-        query = query.values(*annotations.values(), "count")
-        results = await query
+            counts = await ball_counts(player.pk)
+            results = [
+                (x, balls[x].country, display_cache.ball(balls[x]).emoji, y)
+                for x, y in counts.items()
+                if x in balls and balls[x].tradeable
+            ]
+            if limit is not None:
+                results = sorted(results, key=lambda x: x[3], reverse=True)[:limit]
 
         if not results:
             await interaction.followup.send(
@@ -637,13 +633,12 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
 
         entries = [
             {
-                "name": item[annotations["name"]],
-                "emoji": (
-                    self.bot.get_emoji(item[annotations["emoji"]]) or item[annotations["emoji"]]
-                ),
-                "count": item["count"],
+                "id": pk,
+                "name": name,
+                "emoji": emoji,
+                "count": count,
             }
-            for item in results
+            for pk, name, emoji, count in sorted(results, key=lambda x: x[3], reverse=True)
         ]
 
         source = DuplicateViewMenu(interaction, entries, type.value)
@@ -683,16 +678,18 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
         if await inventory_privacy(self.bot, interaction, player, user) is False:
             return
 
-        bot_countryballs = {x: y.emoji_id for x, y in balls.items() if y.enabled}
+        bot_countryballs = {
+            x: display_cache.ball(y).emoji_text for x, y in balls.items() if y.enabled
+        }
         if special:
             bot_countryballs = {
-                x: y.emoji_id
+                x: display_cache.ball(y).emoji_text
                 for x, y in balls.items()
                 if y.enabled and (special.end_date is None or y.created_at < special.end_date)
             }
 
-        player1, _ = await Player.get_or_create(discord_id=interaction.user.id)
-        player2, _ = await Player.get_or_create(discord_id=user.id)
+        player1, _ = await player_cache.get_or_create(interaction.user.id)
+        player2, _ = await player_cache.get_or_create(user.id)
 
         blocked = await player.is_blocked(player1)
         if blocked and not is_staff(interaction):
@@ -707,20 +704,25 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
                 "You cannot compare with a user that has you blocked.", ephemeral=True
             )
             return
-        queryset = BallInstance.filter(ball__enabled=True).distinct()
         if special:
-            queryset = queryset.filter(special=special)
-        user1_balls = cast(
-            list[int],
-            await queryset.filter(player=player1).values_list("ball_id", flat=True),
-        )
-        user2_balls = cast(
-            list[int],
-            await queryset.filter(player=player2).values_list("ball_id", flat=True),
-        )
-        both = set(user1_balls) & set(user2_balls)
-        user1_only = set(user1_balls) - set(user2_balls)
-        user2_only = set(user2_balls) - set(user1_balls)
+            # the bitmask cannot tell specials apart, those come from the inventory counts
+            user1_balls = {
+                x
+                for x in await ball_counts(player1.pk, special_id=special.pk)
+                if (ball := balls.get(x)) and ball.enabled
+            }
+            user2_balls = {
+                x
+                for x in await ball_counts(player2.pk, special_id=special.pk)
+                if (ball := balls.get(x)) and ball.enabled
+            }
+        else:
+            enabled = ids_to_mask(x for x, y in balls.items() if y.enabled)
+            user1_balls = mask_to_ids(await owned_balls.get(player1.pk) & enabled)
+            user2_balls = mask_to_ids(await owned_balls.get(player2.pk) & enabled)
+        both = user1_balls & user2_balls
+        user1_only = user1_balls - user2_balls
+        user2_only = user2_balls - user1_balls
         neither = set(bot_countryballs.keys()) - both - user1_only - user2_only
 
         entries = []
@@ -730,11 +732,9 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             buffer = ""
 
             for ball_id in ids:
-                emoji = self.bot.get_emoji(bot_countryballs[ball_id])
-                if not emoji:
+                text = bot_countryballs.get(ball_id)
+                if not text:
                     continue
-
-                text = f"{emoji} "
                 if len(buffer) + len(text) > 1024:
                     # hitting embed limits, adding an intermediate field
                     if first_field_added:
@@ -788,16 +788,13 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
             Whether or not to send the command ephemerally.
         """
         await interaction.response.defer(thinking=True, ephemeral=ephemeral)
-        player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        player, _ = await player_cache.get_or_create(interaction.user.id)
 
-        query = BallInstance.filter(player=player).prefetch_related(
-            "player", "trade_player", "special"
+        total, total_traded, by_special = await collection_stats(
+            player.pk, ball_id=countryball.pk if countryball else None
         )
-        if countryball:
-            query = query.filter(ball=countryball)
-        balls = await query
 
-        if not balls:
+        if not total:
             if countryball:
                 await interaction.followup.send(
                     f"You don't have any {countryball.country} "
@@ -809,27 +806,22 @@ class Balls(commands.GroupCog, group_name=settings.players_group_cog_name):
                     f"You don't have any {settings.plural_collectible_name} yet."
                 )
             return
-        total = len(balls)
-        total_traded = len([x for x in balls if x.trade_player])
         total_caught_self = total - total_traded
-        special_count = len([x for x in balls if x.special])
-        specials = defaultdict(int)
-        all_specials = await Special.filter(hidden=False)
-        special_emojis = {x.name: x.emoji for x in all_specials}
-        for ball in balls:
-            if ball.special:
-                specials[ball.special] += 1
+        special_count = sum(by_special.values())
 
         desc = (
             f"**Total**: {total:,} ({total_caught_self:,} caught, "
             f"{total_traded:,} received from trade)\n"
             f"**Total Specials**: {special_count:,}\n\n"
         )
-        if specials:
+        if by_special:
             desc += "**Specials**:\n"
-        for special, count in sorted(specials.items(), key=lambda x: x[1], reverse=True):
-            emoji = special_emojis.get(special.name, "")
-            desc += f"{emoji} {special.name}: {count:,}\n"
+        for special_id, count in sorted(by_special.items(), key=lambda x: x[1], reverse=True):
+            special = specials.get(special_id)
+            if special is None:
+                special = await Special.get(pk=special_id)
+            emoji = "" if special.hidden else display_cache.special(special).emoji_text
+            desc += f"{emoji}{special.name}: {count:,}\n"
 
         embed = discord.Embed(
             title=f"Collection of {countryball.country}" if countryball else "Total Collection",
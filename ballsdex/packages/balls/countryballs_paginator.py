@@ -4,12 +4,17 @@ from typing import TYPE_CHECKING, List
 
 import discord
 
-from ballsdex.core.models import BallInstance
+from ballsdex.core.models import BallInstance, balls, specials
 from ballsdex.core.utils import menus
-from ballsdex.core.utils.paginator import Pages
+from ballsdex.core.utils.display import display_cache
+from ballsdex.core.utils.inventory import inventory_count
+from ballsdex.core.utils.paginator import KeysetPageSource, Pages
+from ballsdex.core.utils.players import player_cache
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
+    from tortoise.queryset import QuerySet
+
     from ballsdex.core.bot import BallsDexBot
 
 
@@ -22,37 +27,53 @@ class CountryballsSource(menus.ListPageSource):
         return True  # signal to edit the page
 
 
+class LazyCountryballsSource(KeysetPageSource):
+    """
+    Reads the instances one page at a time, for inventories too large to load at once.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet[BallInstance],
+        ordering: List[str],
+        *,
+        count: int | None = None,
+    ):
+        super().__init__(queryset, ordering, per_page=25, count=count)
+
+    async def format_page(self, menu: CountryballsSelector, balls: List[BallInstance]):
+        menu.set_options(balls)
+        return True  # signal to edit the page
+
+
 class CountryballsSelector(Pages):
-    def __init__(self, interaction: discord.Interaction["BallsDexBot"], balls: List[BallInstance]):
+    def __init__(
+        self,
+        interaction: discord.Interaction["BallsDexBot"],
+        balls: List[BallInstance] | LazyCountryballsSource,
+    ):
         self.bot = interaction.client
-        source = CountryballsSource(balls)
+        if isinstance(balls, LazyCountryballsSource):
+            source = balls
+        else:
+            source = CountryballsSource(balls)
         super().__init__(source, interaction=interaction)
         self.add_item(self.select_ball_menu)
 
     def set_options(self, balls: List[BallInstance]):
         options: List[discord.SelectOption] = []
         for ball in balls:
-            emoji = self.bot.get_emoji(int(ball.countryball.emoji_id))
+            fragments = display_cache.ball(ball.countryball)
             favorite = f"{settings.favorited_collectible_emoji} " if ball.favorite else ""
             special = ball.special_emoji(self.bot, True)
-            if "Buzz Lightyear" in ball.countryball.country:
-                plevel = "∞"
-            elif (
-                     not (0 <= ball.attack_bonus <= 100) or
-                     not (0 <= ball.health_bonus <= 100) or
-                     ball.attack_bonus != ball.health_bonus
-                 ):
-                plevel = "?"
-            else:
-                plevel = int((ball.attack_bonus + 10) / 10)
             options.append(
                 discord.SelectOption(
-                    label=f"{favorite}{special}#{ball.pk:0X} {ball.countryball.country}",
+                    label=f"{favorite}{special}#{ball.pk:0X} {fragments.name}",
                     description=(
-                        f"Power Level {plevel} • "
+                        f"Power Level {ball.power_level} • "
                         f"{ball.catch_date.strftime('%Y/%m/%d • %H:%M')}"
                     ),
-                    emoji=emoji,
+                    emoji=fragments.emoji,
                     value=f"{ball.pk}",
                 )
             )
@@ -105,7 +126,10 @@ class DuplicateViewMenu(Pages):
         for item in items:
             options.append(
                 discord.SelectOption(
-                    label=item["name"], description=f"Count: {item['count']}", emoji=item["emoji"]
+                    label=item["name"],
+                    value=str(item["id"]),
+                    description=f"Count: {item['count']}",
+                    emoji=item["emoji"],
                 )
             )
         self.dupe_ball_menu.options = options
@@ -113,14 +137,14 @@ class DuplicateViewMenu(Pages):
     @discord.ui.select()
     async def dupe_ball_menu(self, interaction: discord.Interaction, item: discord.ui.Select):
         await interaction.response.defer(thinking=True, ephemeral=True)
+        pk = int(item.values[0])
+        player = await player_cache.resolve(interaction.user.id)
         if self.dupe_type == settings.plural_collectible_name:
-            balls = await BallInstance.filter(
-                ball__country=item.values[0], player__discord_id=interaction.user.id
-            ).count()
+            name = balls[pk].country if pk in balls else "?"
+            count = await inventory_count(player.pk, ball_id=pk)
         else:
-            balls = await BallInstance.filter(
-                special__name=item.values[0], player__discord_id=interaction.user.id
-            ).count()
+            name = specials[pk].name if pk in specials else "?"
+            count = await inventory_count(player.pk, special_id=pk)
 
-        plural = settings.collectible_name if balls == 1 else settings.plural_collectible_name
-        await interaction.followup.send(f"You have {balls:,} {item.values[0]} {plural}.")
+        plural = settings.collectible_name if count == 1 else settings.plural_collectible_name
+        await interaction.followup.send(f"You have {count:,} {name} {plural}.")
@@ -9,9 +9,14 @@ from discord.ui import Button, View, button
 from tortoise.exceptions import DoesNotExist
 from tortoise.functions import Count
 
-from ballsdex.core.models import BallInstance, DonationPolicy, Player, Trade, TradeObject, balls
+from ballsdex.core.models import DonationPolicy, Player, RegimeCategory, Trade, TradeObject, balls
 from ballsdex.core.utils.buttons import ConfirmChoiceView
+from ballsdex.core.utils.catalog import catalog
+from ballsdex.core.utils.display import display_cache
+from ballsdex.core.utils.inventory import ball_counts
+from ballsdex.core.utils.owned_balls import owned_balls
 from ballsdex.core.utils.paginator import FieldPageSource, Pages
+from ballsdex.core.utils.players import player_cache
 from ballsdex.core.utils.sorting import SortingChoices, sort_balls
 from ballsdex.core.utils.transformers import (
     BallEnabledTransform,
@@ -79,7 +84,7 @@ class Collection(commands.Cog):
                 )
                 return
 
-            interaction_player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+            interaction_player, _ = await player_cache.get_or_create(interaction.user.id)
 
             blocked = await player.is_blocked(interaction_player)
             if blocked and not is_staff(interaction):
@@ -91,28 +96,26 @@ class Collection(commands.Cog):
 
             if await inventory_privacy(self.bot, interaction, player, user_obj) is False:
                 return
+        else:
+            player = await player_cache.resolve(user_obj.id)
+        # the bitmask cannot tell specials apart, those come from the inventory counts
+        if special:
+            owned_ids = set(await ball_counts(player.pk, special_id=special.pk))
+        else:
+            owned_ids = await owned_balls.ball_ids(player.pk)
         if collection_type == "brawlers":
+                    category_ids = catalog.ball_ids(RegimeCategory.BRAWLER)
                     bot_countryballs = {
-                        x: y.emoji_id
+                        x: display_cache.ball(y).emoji_text
                         for x, y in balls.items()
-                        if y.enabled and 3 <= y.economy_id <= 9
-                        and not 19 <= y.regime_id <= 21
-                        and y.economy_id != 16
+                        if x in category_ids
+                        and (
+                            not special
+                            or special.end_date is None
+                            or y.created_at < special.end_date
+                        )
                     }
                 
-                    filters = {"player__discord_id": user_obj.id, "ball__enabled": True}
-                    if special:
-                        filters["special"] = special
-                        bot_countryballs = {
-                            x: y.emoji_id
-                            for x, y in balls.items()
-                            if y.enabled
-                            and 3 <= y.economy_id <= 9
-                            and not 19 <= y.regime_id <= 21
-                            and y.economy_id != 16
-                            and (special.end_date is None or y.created_at < special.end_date)
-                        }
-                
                     if not bot_countryballs:
                         await interaction.followup.send(
                             f"There are no {extra_text}{settings.plural_collectible_name} registered on this bot yet.",
@@ -120,26 +123,18 @@ class Collection(commands.Cog):
                         )
                         return
                 
-                    owned_countryballs = set(
-                        x[0]
-                        for x in await BallInstance.filter(**filters)
-                        .exclude(ball__regime_id__in=list(range(19, 33)) + [35, 37, 38, 39, 40])
-                        .distinct()
-                        .values_list("ball_id")
-                    )
+                    owned_countryballs = owned_ids & category_ids
                 
                     entries: list[tuple[str, str]] = []
                 
-                    def fill_fields(title: str, emoji_ids: set[int]):
+                    def fill_fields(title: str, emojis: set[str]):
                         first_field_added = False
                         buffer = ""
                 
-                        for emoji_id in emoji_ids:
-                            emoji = self.bot.get_emoji(emoji_id)
-                            if not emoji:
+                        for text in emojis:
+                            if not text:
                                 continue
                 
-                            text = f"{emoji} "
                             if len(buffer) + len(text) > 1024:
                                 if first_field_added:
                                     entries.append(("\u200b", buffer))
@@ -190,22 +185,18 @@ class Collection(commands.Cog):
                     await pages.start()
 
         elif collection_type == "skins":
+                    category_ids = catalog.ball_ids(RegimeCategory.SKIN)
                     bot_countryballs = {
-                        x: y.emoji_id
+                        x: display_cache.ball(y).emoji_text
                         for x, y in balls.items()
-                        if y.enabled and (22 <= y.regime_id <= 27 or y.regime_id in {35, 37, 38, 39, 40})
+                        if x in category_ids
+                        and (
+                            not special
+                            or special.end_date is None
+                            or y.created_at < special.end_date
+                        )
                     }
                 
-                    filters = {"player__discord_id": user_obj.id, "ball__enabled": True}
-                    if special:
-                        filters["special"] = special
-                        bot_countryballs = {
-                            x: y.emoji_id
-                            for x, y in balls.items()
-                            if y.enabled and (22 <= y.regime_id <= 27 or y.regime_id in {35, 37, 38, 39, 40})
-                            and (special.end_date is None or y.created_at < special.end_date)
-                        }
-                
                     if not bot_countryballs:
                         await interaction.followup.send(
                             f"There are no {extra_text}skins registered on this bot yet.",
@@ -213,26 +204,18 @@ class Collection(commands.Cog):
                         )
                         return
                 
-                    owned_countryballs = set(
-                        x[0]
-                        for x in await BallInstance.filter(**filters)
-                        .exclude(ball__regime_id__in=[5, 6, 7, 8, 16, 19, 20, 21, 28, 29, 30, 31, 32, 33, 34, 36])
-                        .distinct()
-                        .values_list("ball_id")
-                    )
+                    owned_countryballs = owned_ids & category_ids
                 
                     entries: list[tuple[str, str]] = []
                 
-                    def fill_fields(title: str, emoji_ids: set[int]):
+                    def fill_fields(title: str, emojis: set[str]):
                         first_field_added = False
                         buffer = ""
                 
-                        for emoji_id in emoji_ids:
-                            emoji = self.bot.get_emoji(emoji_id)
-                            if not emoji:
+                        for text in emojis:
+                            if not text:
                                 continue
                 
-                            text = f"{emoji} "
                             if len(buffer) + len(text) > 1024:
                                 if first_field_added:
                                     entries.append(("\u200B", buffer))
@@ -282,21 +265,14 @@ class Collection(commands.Cog):
 
         elif collection_type == "buzzlightyear":
                     bot_countryballs = {
-                        x: y.emoji_id
+                        x: display_cache.ball(y).emoji_text
                         for x, y in balls.items()
                         if not y.enabled and y.rarity == 0.000113
                     }
                 
-                    filters = {
-                        "player__discord_id": user_obj.id,
-                        "ball__enabled": False,
-                        "ball__rarity": 0.000113
-                    }
-                
                     if special:
-                        filters["special"] = special
                         bot_countryballs = {
-                            x: y.emoji_id
+                            x: display_cache.ball(y).emoji_text
                             for x, y in balls.items()
                             if not y.enabled and y.rarity == 0.000113
                             and (special.end_date is None or y.created_at < special.end_date)
@@ -309,25 +285,18 @@ class Collection(commands.Cog):
                         )
                         return
                 
-                    owned_countryballs = set(
-                        x[0]
-                        for x in await BallInstance.filter(**filters)
-                        .distinct()
-                        .values_list("ball_id")
-                    )
+                    owned_countryballs = owned_ids & bot_countryballs.keys()
                 
                     entries: list[tuple[str, str]] = []
                 
-                    def fill_fields(title: str, emoji_ids: set[int]):
+                    def fill_fields(title: str, emojis: set[str]):
                         first_field_added = False
                         buffer = ""
                 
-                        for emoji_id in emoji_ids:
-                            emoji = self.bot.get_emoji(emoji_id)
-                            if not emoji:
+                        for text in emojis:
+                            if not text:
                                 continue
                 
-                            text = f"{emoji} "
                             if len(buffer) + len(text) > 1024:
                                 if first_field_added:
                                     entries.append(("\u200B", buffer))
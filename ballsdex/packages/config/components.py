@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING, Optional
 import discord
 from discord.ui import Button, View, button
 
-from ballsdex.core.models import GuildConfig
+from ballsdex.core.utils.guild_configs import guild_configs
 from ballsdex.core.utils.logging import log_action
 from ballsdex.settings import settings
 
@@ -61,7 +61,7 @@ class AcceptTOSView(View):
     async def accept_button(
         self, interaction: discord.Interaction["BallsDexBot"], button: discord.ui.Button
     ):
-        config, created = await GuildConfig.get_or_create(guild_id=interaction.guild_id)
+        config, created = await guild_configs.get_or_create(interaction.guild_id)  # type: ignore
         config.spawn_channel = self.channel.id  # type: ignore
         config.enabled = True
         config.silent = self.silent
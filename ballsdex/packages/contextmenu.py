@@ -9,9 +9,13 @@ from discord.ui import Button, View, button
 from tortoise.exceptions import DoesNotExist
 from tortoise.functions import Count
 
-from ballsdex.core.models import BallInstance, DonationPolicy, Player, Trade, TradeObject, balls
+from ballsdex.core.models import DonationPolicy, RegimeCategory, Trade, TradeObject, balls
 from ballsdex.core.utils.buttons import ConfirmChoiceView
+from ballsdex.core.utils.catalog import catalog
+from ballsdex.core.utils.display import display_cache
+from ballsdex.core.utils.owned_balls import owned_balls
 from ballsdex.core.utils.paginator import FieldPageSource, Pages
+from ballsdex.core.utils.players import player_cache
 from ballsdex.core.utils.sorting import SortingChoices, sort_balls
 from ballsdex.core.utils.transformers import (
     BallEnabledTransform,
@@ -45,14 +49,14 @@ async def context_brawler_collection(
     await interaction.response.defer(thinking=True)
 
     try:
-        player, _ = await Player.get_or_create(discord_id=user_obj.id)
+        player, _ = await player_cache.get_or_create(user_obj.id)
     except DoesNotExist:
         await interaction.followup.send(
             f"{user_obj.name} doesn't have any brawlers yet."
         )
         return
 
-    interaction_player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+    interaction_player, _ = await player_cache.get_or_create(interaction.user.id)
 
     blocked = await player.is_blocked(interaction_player)
     if blocked and not is_staff(interaction):
@@ -65,16 +69,11 @@ async def context_brawler_collection(
     if await inventory_privacy(interaction.client, interaction, player, user_obj) is False:
         return
 
+    brawler_ids = catalog.ball_ids(RegimeCategory.BRAWLER)
     bot_countryballs = {
-        x: y.emoji_id
-        for x, y in balls.items()
-        if y.enabled and 3 <= y.economy_id <= 9
-        and not 19 <= y.regime_id <= 21
-        and y.economy_id != 16
+        x: display_cache.ball(y).emoji_text for x, y in balls.items() if x in brawler_ids
     }
 
-    filters = {"player__discord_id": user_obj.id, "ball__enabled": True}
-
     if not bot_countryballs:
         await interaction.followup.send(
             f"There are no {settings.plural_collectible_name} registered on this bot yet.",
@@ -82,26 +81,18 @@ async def context_brawler_collection(
         )
         return
 
-    owned_countryballs = set(
-        x[0]
-        for x in await BallInstance.filter(**filters)
-        .exclude(ball__regime_id__in=list(range(19, 34)) + [35, 37, 38, 39, 40])
-        .distinct()
-        .values_list("ball_id")
-    )
+    owned_countryballs = await owned_balls.ball_ids(player.pk) & brawler_ids
 
     entries: list[tuple[str, str]] = []
 
-    def fill_fields(title: str, emoji_ids: set[int]):
+    def fill_fields(title: str, emojis: set[str]):
         first_field_added = False
         buffer = ""
 
-        for emoji_id in emoji_ids:
-            emoji = interaction.client.get_emoji(emoji_id)
-            if not emoji:
+        for text in emojis:
+            if not text:
                 continue
 
-            text = f"{emoji} "
             if len(buffer) + len(text) > 1024:
                 if first_field_added:
                     entries.append(("\u200b", buffer))
@@ -1,12 +1,15 @@
 from typing import TYPE_CHECKING
 
 from ballsdex.packages.countryballs.cog import CountryBallsSpawner
+from ballsdex.packages.countryballs.countryball import CatchButton
 
 if TYPE_CHECKING:
     from ballsdex.core.bot import BallsDexBot
 
 
 async def setup(bot: "BallsDexBot"):
+    # spawn buttons are dispatched by their custom ID, even when sent before a restart
+    bot.add_dynamic_items(CatchButton)
     cog = CountryBallsSpawner(bot)
     await bot.add_cog(cog)
     await cog.load_cache()
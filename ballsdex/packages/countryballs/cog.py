@@ -1,12 +1,14 @@
+import asyncio
 import importlib
 import logging
 from typing import TYPE_CHECKING, cast
 
 import discord
 from discord.ext import commands
-from tortoise.exceptions import DoesNotExist
+from tortoise.timezone import now as tortoise_now
 
-from ballsdex.core.models import GuildConfig
+from ballsdex.core.models import GuildConfig, Spawn
+from ballsdex.core.utils.guild_configs import guild_configs
 from ballsdex.packages.countryballs.countryball import BallSpawnView
 from ballsdex.packages.countryballs.spawn import BaseSpawnManager
 from ballsdex.settings import settings
@@ -16,6 +18,9 @@ if TYPE_CHECKING:
 
 log = logging.getLogger("ballsdex.packages.countryballs")
 
+# interval in seconds between two deletions of the expired spawns
+SPAWN_PURGE_INTERVAL = 3600
+
 
 class CountryBallsSpawner(commands.Cog):
     spawn_manager: BaseSpawnManager
@@ -31,6 +36,27 @@ class CountryBallsSpawner(commands.Cog):
         importlib.reload(module)
         spawn_manager = getattr(module, class_name)
         self.spawn_manager = spawn_manager(bot)
+        self.purge_task: asyncio.Task | None = None
+
+    async def cog_load(self):
+        self.purge_task = asyncio.create_task(self.purge_spawns())
+
+    async def cog_unload(self):
+        if self.purge_task:
+            self.purge_task.cancel()
+
+    async def purge_spawns(self):
+        """
+        Periodically delete the state of the spawns that can no longer be caught.
+        """
+        while True:
+            await asyncio.sleep(SPAWN_PURGE_INTERVAL)
+            try:
+                deleted = await Spawn.filter(expires_at__lt=tortoise_now()).delete()
+            except Exception:
+                log.error("Failed to purge expired spawns", exc_info=True)
+            else:
+                log.debug(f"Purged {deleted} expired spawns.")
 
     async def load_cache(self):
         i = 0
@@ -85,12 +111,10 @@ class CountryBallsSpawner(commands.Cog):
             if channel:
                 self.cache[guild.id] = channel.id
             else:
-                try:
-                    config = await GuildConfig.get(guild_id=guild.id)
-                except DoesNotExist:
+                config = await guild_configs.get(guild.id)
+                if config is None:
                     return
-                else:
-                    self.cache[guild.id] = config.spawn_channel
+                self.cache[guild.id] = config.spawn_channel
         else:
             if enabled is False:
                 del self.cache[guild.id]
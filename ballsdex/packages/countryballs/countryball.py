@@ -7,26 +7,32 @@ import math
 import random
 import string
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Callable, cast
 
 import discord
-from discord.ui import Button, Modal, TextInput, View
-from tortoise.timezone import get_default_timezone
+from discord.ui import Button, DynamicItem, Modal, TextInput, View
 from tortoise.timezone import now as tortoise_now
-from tortoise.exceptions import ValidationError
+from tortoise.transactions import in_transaction
 
 from ballsdex.core.metrics import caught_balls
+from ballsdex.core.utils.catalog import catalog
+from ballsdex.core.utils.catch_names import catch_name_index
+from ballsdex.core.utils.guild_configs import guild_configs
+from ballsdex.core.utils.leaderboards import leaderboards
+from ballsdex.core.utils.owned_balls import owned_balls
+from ballsdex.core.utils.players import PlayerIdentity, player_cache
+from ballsdex.core.utils.specials import special_schedule
 from ballsdex.core.models import (
     Ball,
     BallInstance,
     Player,
+    Spawn,
     Special,
-    Regime,
     Trade,
     TradeObject,
     balls,
+    catch_day,
     specials,
-    GuildConfig
 )
 from ballsdex.settings import settings
 
@@ -35,6 +41,119 @@ if TYPE_CHECKING:
 
 log = logging.getLogger("ballsdex.packages.countryballs")
 
+# how long a spawn can be caught, also the duration of the trade lock of transferred instances
+SPAWN_TIMEOUT = timedelta(minutes=30)
+
+# spawns with a catch being written by this process
+catching: set[int] = set()
+
+TROPHY_OPTIONS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+TROPHY_WEIGHTS = [5, 4, 5, 10, 8, 7, 8, 9, 10, 7]
+# regimes whose brawler trophies are tracked
+TROPHY_REGIMES = {"rare", "super_rare", "epic", "mythic", "legendary"}
+
+BONUS_OPTIONS = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
+# 1500 being 30% weight and 42.4% chance, 75 being 1.5% weight and 2.1% chance
+BONUS_WEIGHTS = [1500, 1000, 500, 250, 125, 75, 40, 25, 10, 4, 2]
+
+# Daily catches giving a Starr Drop, and the maximum number of Starr Drops a player can hold
+STARR_DROP_CATCHES = (1, 4, 8)
+MAX_STARR_DROPS = 50
+MAX_DAILY_CATCHES = 1000
+
+# discord ID of the player receiving the balls of fake spawns
+FAKESPAWN_OWNER_ID = 1294582625352024175
+
+# Updates the counters of the player catching ($1): daily catches and Starr Drops if counted
+# ($2) and total trophies ($3). The daily counter starts over if it was last written before the
+# current catch day ($6). Adds the trophies to those of the player with this brawler ($5) if
+# tracked ($4). Shared by new catches and transfers of an existing instance.
+CATCH_COUNTERS = f"""
+previous AS (
+    SELECT
+        id,
+        sdcount,
+        CASE WHEN dailycaught_day = $6::date THEN dailycaught ELSE 0 END AS dailycaught
+    FROM player
+    WHERE id = $1
+    FOR UPDATE
+), counters AS (
+    UPDATE player SET
+        dailycaught = CASE
+            WHEN $2::boolean THEN LEAST(previous.dailycaught + 1, {MAX_DAILY_CATCHES})
+            ELSE previous.dailycaught
+        END,
+        dailycaught_day = $6::date,
+        sdcount = CASE
+            WHEN $2::boolean AND previous.dailycaught + 1 IN {STARR_DROP_CATCHES}
+            THEN LEAST(player.sdcount + 1, {MAX_STARR_DROPS})
+            ELSE player.sdcount
+        END,
+        trophies = player.trophies + $3::integer
+    FROM previous
+    WHERE player.id = previous.id
+    RETURNING
+        player.dailycaught,
+        player.sdcount,
+        player.trophies,
+        $2::boolean
+            AND player.dailycaught IN {STARR_DROP_CATCHES}
+            AND previous.sdcount >= {MAX_STARR_DROPS} AS fullsd
+), brawler AS (
+    INSERT INTO brawlertrophies (player_id, ball_id, trophies)
+    SELECT $1, $5, $3::integer WHERE $4::boolean
+    ON CONFLICT (player_id, ball_id)
+    DO UPDATE SET trophies = brawlertrophies.trophies + EXCLUDED.trophies
+)"""
+
+# Everything a catch writes, in a single statement:
+# - update the player counters, see `CATCH_COUNTERS`
+# - insert the new instance for the player owning it ($7, a discord ID)
+#   unless this spawn ($14) was already caught, possibly by another process
+# - mark the spawn as caught
+# - check if the player already had this ball ($5). All parts of the statement see the same
+#   snapshot, so the new instance is not counted.
+CATCH_QUERY = f"""
+WITH {CATCH_COUNTERS}, inserted AS (
+    INSERT INTO ballinstance (
+        ball_id, player_id, special_id, attack_bonus, health_bonus, server_id, spawned_time,
+        catch_date, favorite, tradeable, extra_data, spawn_id
+    )
+    VALUES (
+        $5, (SELECT id FROM player WHERE discord_id = $7), $8, $9, $10, $11, $12, $13, FALSE,
+        TRUE, '{{}}', $14
+    )
+    ON CONFLICT (spawn_id) DO NOTHING
+    RETURNING id, player_id
+), claimed AS (
+    UPDATE spawn SET caught = TRUE WHERE id = $14
+)
+SELECT
+    inserted.id,
+    inserted.player_id,
+    counters.dailycaught,
+    counters.sdcount,
+    counters.trophies,
+    counters.fullsd,
+    NOT EXISTS (SELECT 1 FROM ballinstance WHERE player_id = $1 AND ball_id = $5) AS is_new
+FROM counters
+LEFT JOIN inserted ON TRUE
+"""
+
+# The counters of a catch transferring an existing instance, written with the transfer
+TRANSFER_COUNTERS_QUERY = f"""
+WITH {CATCH_COUNTERS}
+SELECT dailycaught, sdcount, trophies, fullsd FROM counters
+"""
+
+
+class AlreadyCaughtError(Exception):
+    """
+    Raised by `BallSpawnView.catch_ball` when someone else won the catch.
+    """
+
+    pass
+
 
 class CountryballNamePrompt(Modal, title=f"You're in a Brawl!"):
     name = TextInput(
@@ -64,6 +183,35 @@ class CountryballNamePrompt(Modal, title=f"You're in a Brawl!"):
                 f"An error occured with this {self.CollectibleName}.",
             )
 
+    async def send_slow_message(
+        self,
+        interaction: discord.Interaction["BallsDexBot"],
+        player: PlayerIdentity,
+        silent: bool,
+    ):
+        slow_message = random.choice(settings.slow_messages).format(
+            user=interaction.user.mention,
+            ball=self.view.name,
+            regime=self.view.RegimeName,
+            Regime=self.view.RegimeName.capitalize(),
+            REGIME=self.view.RegimeName.upper(),
+            regimes=self.view.RegimeName+"s",
+            Regimes=self.view.RegimeName+"s".capitalize(),
+            REGIMES=self.view.RegimeName+"s".upper(),
+            name=self.view.name,
+            Name=self.view.name.capitalize(),
+            NAME=self.view.name.upper(),
+            names=self.view.name+"s",
+            Names=self.view.name+"s".capitalize(),
+            NAMES=self.view.name+"s".upper(),
+        )
+
+        await interaction.followup.send(
+            slow_message,
+            ephemeral=silent,
+            allowed_mentions=discord.AllowedMentions(users=player.can_be_mentioned),
+        )
+
     async def on_submit(self, interaction: discord.Interaction["BallsDexBot"]):
         if self.view.usertimeout:
             try:
@@ -75,33 +223,13 @@ class CountryballNamePrompt(Modal, title=f"You're in a Brawl!"):
                await interaction.response.send_message(f"{interaction.user.mention} GET OUT-\n-# they couldn't be timeouted.")
                self.button.disabled = True
                return
-        config, _ = await GuildConfig.get_or_create(guild_id=interaction.guild.id)
-        await interaction.response.defer(thinking=True, ephemeral=config.silent)
+        config = await guild_configs.get(interaction.guild.id) if interaction.guild else None
+        silent = config.silent if config else False
+        await interaction.response.defer(thinking=True, ephemeral=silent)
 
-        player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        player = await player_cache.resolve(interaction.user.id)
         if self.view.caught:
-            slow_message = random.choice(settings.slow_messages).format(
-                user=interaction.user.mention,
-                ball=self.view.name,
-                regime=self.view.RegimeName,
-                Regime=self.view.RegimeName.capitalize(),
-                REGIME=self.view.RegimeName.upper(),
-                regimes=self.view.RegimeName+"s",
-                Regimes=self.view.RegimeName+"s".capitalize(),
-                REGIMES=self.view.RegimeName+"s".upper(),
-                name=self.view.name,
-                Name=self.view.name.capitalize(),
-                NAME=self.view.name.upper(),
-                names=self.view.name+"s",
-                Names=self.view.name+"s".capitalize(),
-                NAMES=self.view.name+"s".upper(),
-            )
-
-            await interaction.followup.send(
-                slow_message,
-                ephemeral=config.silent,
-                allowed_mentions=discord.AllowedMentions(users=player.can_be_mentioned),
-            )
+            await self.send_slow_message(interaction, player, silent)
             return
 
         if not self.view.is_name_valid(self.name.value):
@@ -131,19 +259,23 @@ class CountryballNamePrompt(Modal, title=f"You're in a Brawl!"):
             await interaction.followup.send(
                 wrong_message,
                 allowed_mentions=discord.AllowedMentions(users=player.can_be_mentioned),
-                ephemeral=config.silent,
+                ephemeral=silent,
             )
             return
 
-        ball, has_caught_before, dailycatch, fullsd = await self.view.catch_ball(
-            interaction.user, player=player, guild=interaction.guild
-        )
+        try:
+            ball, has_caught_before, dailycatch, fullsd = await self.view.catch_ball(
+                interaction.user, player=player, guild=interaction.guild
+            )
+        except AlreadyCaughtError:
+            await self.send_slow_message(interaction, player, silent)
+            return
 
         await interaction.followup.send(
             self.view.get_catch_message(ball, has_caught_before, interaction.user.mention, dailycatch, fullsd),
             allowed_mentions=discord.AllowedMentions(users=player.can_be_mentioned),
         )
-        if config.silent == True:
+        if silent == True:
             await interaction.followup.edit_message(self.view.message.id, view=self.view, content=f"{self.view.cached_spawn_message}\n-# This {self.view.RegimeName.title()} was defeated by {interaction.user.name}")
         else:
             await interaction.followup.edit_message(self.view.message.id, view=self.view)
@@ -163,6 +295,10 @@ class BallSpawnView(View):
         The algorithm used for spawning, used for metrics.
     message: discord.Message
         The Discord message associated with this view once created with `spawn`.
+    spawn_id: int | None
+        ID of the `Spawn` row holding the state of this spawn, once created with `spawn`.
+    expires_at: datetime | None
+        When the countryball can no longer be caught.
     caught: bool
         Whether the countryball has been caught yet.
     ballinstance: BallInstance | None
@@ -176,14 +312,20 @@ class BallSpawnView(View):
         Force a specific attack bonus if set, otherwise random range defined in config.yml.
     hp_bonus: int | None
         Force a specific health bonus if set, otherwise random range defined in config.yml.
+    wild_card_data: bytes | None
+        Content of the wild card image, if already loaded. Avoids reading the file again when
+        spawning the same countryball many times.
     """
 
     def __init__(self, bot: "BallsDexBot", model: Ball):
-        super().__init__()
+        # the view is not kept once spawned, interactions are handled by `CatchButton`
+        super().__init__(timeout=None)
         self.bot = bot
         self.model = model
         self.algo: str | None = None
         self.message: discord.Message = discord.utils.MISSING
+        self.spawn_id: int | None = None
+        self.expires_at: datetime | None = None
         self.caught = False
         self.ballinstance: BallInstance | None = None
         self.special: Special | None = None
@@ -201,19 +343,11 @@ class BallSpawnView(View):
         self.voicefile = None
         self.cached_spawn_message = None
         self.catch_by_itself = None
+        self.wild_card_data: bytes | None = None
 
-    async def interaction_check(self, interaction: discord.Interaction["BallsDexBot"], /) -> bool:
-        return await interaction.client.blacklist_check(interaction)
-
-    async def on_timeout(self):
-        self.catch_button.disabled = True
-        if self.message:
-            try:
-                await self.message.edit(view=self)
-            except discord.HTTPException:
-                pass
-        if self.ballinstance and not self.caught:
-            await self.ballinstance.unlock()
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and tortoise_now() >= self.expires_at
 
     async def catch_button_cb(self, interaction: discord.Interaction["BallsDexBot"]):
          button = self.catch_button
@@ -243,10 +377,6 @@ class BallSpawnView(View):
          else:
             await interaction.response.send_modal(CountryballNamePrompt(self, self.catch_button))
 
-    # Wrapper to provide both interaction and button
-    async def catch_button_cb_wrapper(self, interaction: discord.Interaction["BallsDexBot"]):
-        await BallSpawnView.catch_button_cb(self, interaction)
-
     @classmethod
     async def from_existing(cls, bot: "BallsDexBot", ball_instance: BallInstance):
         """
@@ -267,11 +397,49 @@ class BallSpawnView(View):
         return view
 
     @classmethod
-    async def get_random(cls, bot: "BallsDexBot"):
+    def from_state(
+        cls, bot: "BallsDexBot", state: Spawn, message: discord.Message
+    ) -> "BallSpawnView":
+        """
+        Rebuild the view of a spawn from its saved state, to handle an interaction with it.
+
+        Parameters
+        ----------
+        bot: BallsDexBot
+        state: Spawn
+            The state of the spawn, with the `ballinstance` relation prefetched if set.
+        message: discord.Message
+            The spawn message.
+        """
+        view = cls(bot, balls[state.ball_id])
+        view.spawn_id = state.pk
+        view.expires_at = state.expires_at
+        view.message = message
+        view.caught = state.caught
+        view.special = specials.get(state.special_id) if state.special_id else None
+        view.atk_bonus = state.attack_bonus
+        view.hp_bonus = state.health_bonus
+        view.ballinstance = state.ballinstance
+        view.fakespawn = state.fakespawn
+        view.DontCount = not state.counted
+        view.usertimeout = state.user_timeout
+        view.algo = state.algo
+        view.RegimeName = view.get_regime_name()
+        view.cached_spawn_message = message.content
+        return view
+
+    @classmethod
+    async def get_random(cls, bot: "BallsDexBot", pool: Callable[[Ball], bool] | None = None):
         """
         Get a new instance with a random countryball. Rarity values are taken into account.
+
+        Parameters
+        ----------
+        bot: BallsDexBot
+        pool: Callable[[Ball], bool] | None
+            If set, only the enabled countryballs matching this filter can be picked.
         """
-        countryballs = list(filter(lambda m: m.enabled, balls.values()))
+        countryballs = [x for x in balls.values() if x.enabled and (pool is None or pool(x))]
         if not countryballs:
             raise RuntimeError("No ball to spawn")
         rarities = [x.rarity for x in countryballs]
@@ -283,30 +451,40 @@ class BallSpawnView(View):
         return self.model.country
 
     def get_random_special(self) -> Special | None:
-        population = [
-            x
-            for x in specials.values()
-            # handle null start/end dates with infinity times
-            if (x.start_date or datetime.min.replace(tzinfo=get_default_timezone()))
-            <= tortoise_now()
-            <= (x.end_date or datetime.max.replace(tzinfo=get_default_timezone()))
-        ]
-
-        if not population:
-            return None
+        return special_schedule.pick()
 
-        common_weight: float = 1 - sum(x.rarity for x in population)
+    def get_regime_name(self) -> str:
+        return catalog.noun(self.model)
 
-        if common_weight < 0:
-            common_weight = 0
+    def add_catch_button(self, button: CatchButton):
+        button.spawn = self
+        self.catch_button = button.item
+        self.add_item(button)
 
-        weights = [x.rarity for x in population] + [common_weight]
-        # None is added representing the common countryball
-        special: Special | None = random.choices(
-            population=population + [None], weights=weights, k=1
-        )[0]
-
-        return special
+    async def save_state(self):
+        """
+        Save the state of this spawn in the database and add its catch button.
+        """
+        style = discord.ButtonStyle.danger if self.buttondanger else discord.ButtonStyle.primary
+        state = await Spawn.create(
+            ball=self.model,
+            special=self.special,
+            attack_bonus=self.atk_bonus,
+            health_bonus=self.hp_bonus,
+            ballinstance=self.ballinstance,
+            fakespawn=self.fakespawn,
+            counted=not self.DontCount,
+            user_timeout=self.usertimeout or None,
+            algo=self.algo[:64] if self.algo else None,
+            expires_at=tortoise_now() + SPAWN_TIMEOUT,
+        )
+        self.spawn_id = state.pk
+        self.expires_at = state.expires_at
+        self.add_catch_button(
+            CatchButton(
+                state.pk, style=style, label=self.buttontext or "BRAWL!", emoji=self.buttonemoji
+            )
+        )
 
     async def spawn(self, channel: discord.TextChannel) -> bool:
         """
@@ -324,28 +502,7 @@ class BallSpawnView(View):
             `True` if the operation succeeded, otherwise `False`. An error will be displayed
             in the logs if that's the case.
         """
-        style = discord.ButtonStyle.danger if self.buttondanger else discord.ButtonStyle.primary
-        label = self.buttontext or "BRAWL!"
-        emoji = self.buttonemoji
-
-        self.catch_button = Button(style=style, label=label, emoji=emoji)
-            
-        self.catch_button.callback = self.catch_button_cb_wrapper
-        self.add_item(self.catch_button)
-        
-        rid = self.model.regime_id
-        if rid == 22 or rid == 23 or rid == 24 or rid == 25 or rid == 26 or rid == 27 or rid == 35 or rid == 37 or rid == 38 or rid == 39 or rid == 40:
-            self.RegimeName = "skin"
-        elif rid == 28:
-            self.RegimeName = "gadget"
-        elif rid == 29:
-            self.RegimeName = "star power"
-        elif rid == 30 or rid == 31 or rid == 32:
-            self.RegimeName = "gear"
-        elif rid == 33:
-            self.RegimeName = "hypercharge"
-        else:
-            self.RegimeName = "brawler"
+        self.RegimeName = self.get_regime_name()
 
         def generate_random_name():
             source = string.ascii_uppercase + string.ascii_lowercase + string.ascii_letters
@@ -355,10 +512,13 @@ class BallSpawnView(View):
             await asyncio.sleep(self.catch_by_itself)
             if not self.caught:
                 bot_user = self.bot.user
-                player = await Player.get(discord_id=bot_user.id)
-                ball, is_new, dailycatch, fullsd = await self.catch_ball(
-                bot_user, player=player, guild=channel.guild
-                )
+                player = await player_cache.resolve(bot_user.id)
+                try:
+                    ball, is_new, dailycatch, fullsd = await self.catch_ball(
+                        bot_user, player=player, guild=channel.guild
+                    )
+                except AlreadyCaughtError:
+                    return
                 await self.message.reply(
                     self.get_catch_message(ball, is_new, bot_user.mention, dailycatch, fullsd),
                     allowed_mentions=discord.AllowedMentions(users=player.can_be_mentioned),
@@ -391,6 +551,7 @@ class BallSpawnView(View):
                     NAMES=self.name+"s".upper(),
                 )
                 self.cached_spawn_message = spawn_message
+                await self.save_state()
                 if self.voicefile:
                     extension = self.voicefile.filename.split(".")[-1]
                     if extension not in ALLOWED_VOICE_EXTENSIONS:
@@ -410,11 +571,11 @@ class BallSpawnView(View):
                     return True
 
                 else:
-                    self.message = await channel.send(
-                        spawn_message,
-                        view=self,
-                        file=discord.File(file_location, filename=file_name),
-                    )
+                    if self.wild_card_data:
+                        file = discord.File(io.BytesIO(self.wild_card_data), filename=file_name)
+                    else:
+                        file = discord.File(file_location, filename=file_name)
+                    self.message = await channel.send(spawn_message, view=self, file=file)
                     if self.catch_by_itself and type(self.catch_by_itself) == int:
                         asyncio.create_task(auto_catch())
                     else:
@@ -426,8 +587,39 @@ class BallSpawnView(View):
             log.error(f"Missing permission to spawn ball in channel {channel}.")
         except discord.HTTPException:
             log.error("Failed to spawn ball", exc_info=True)
+        if self.spawn_id is not None:
+            await Spawn.filter(id=self.spawn_id).delete()
         return False
 
+    def claim(self) -> bool:
+        """
+        Mark this countryball as caught, unless it already was.
+
+        There is no await between the check and the update, so among concurrent catches in this
+        process, only one gets `True`, even from different views of the same spawn. Across
+        processes, the unique `BallInstance.spawn_id` makes the database reject every catch but
+        the first.
+
+        Returns
+        -------
+        bool
+            `True` if the caller won the catch and must now create the instance, then call
+            `release` once written.
+        """
+        if self.caught or self.spawn_id in catching:
+            return False
+        self.caught = True
+        self.catch_button.disabled = True
+        if self.spawn_id is not None:
+            catching.add(self.spawn_id)
+        return True
+
+    def release(self):
+        """
+        Forget the in-process claim of `claim`, the database has the catch state from now on.
+        """
+        catching.discard(self.spawn_id)  # type: ignore
+
     def is_name_valid(self, text: str) -> bool:
         """
         Check if the prompted name is valid.
@@ -435,33 +627,21 @@ class BallSpawnView(View):
         Parameters
         ----------
         text: str
-            The text entered by the user. It will be lowered and stripped of enclosing blank
-            characters.
+            The text entered by the user. It will be normalized the same way as the accepted
+            names, see `ballsdex.core.utils.catch_names.normalize_name`.
 
         Returns
         -------
         bool
             Whether the name matches or not.
         """
-        if self.model.catch_names:
-            possible_names = (self.name.lower(), *self.model.catch_names.split(";"))
-        else:
-            possible_names = (self.name.lower(),)
-        if self.model.translations:
-            possible_names += tuple(x.lower() for x in self.model.translations.split(";"))
-        cname = text.lower().strip()
-        # Remove fancy unicode characters like ’ to replace to '
-        cname = cname.replace("\u2019", "'")
-        cname = cname.replace("\u2018", "'")
-        cname = cname.replace("\u201c", '"')
-        cname = cname.replace("\u201d", '"')
-        return cname in possible_names
+        return catch_name_index.match(self.model, text)
 
     async def catch_ball(
         self,
         user: discord.User | discord.Member,
         *,
-        player: Player | None,
+        player: PlayerIdentity | None,
         guild: discord.Guild | None,
     ) -> tuple[BallInstance, bool, int, bool]:
         """
@@ -472,107 +652,139 @@ class BallSpawnView(View):
         ----------
         user: discord.User | discord.Member
             The user that will obtain the new countryball.
-        player: Player
-            If already fetched, add the player model here to avoid an additional query.
+        player: PlayerIdentity | None
+            If already resolved, add the player here to avoid an additional query.
         guild: discord.Guild | None
             If caught in a guild, specify here for additional logs. Will be extracted from `user`
             if it's a member object.
 
         Returns
         -------
-        tuple[bool, BallInstance]
-            A tuple whose first value indicates if this is the first time this player catches this
-            countryball. Second value is the newly created countryball.
+        tuple[BallInstance, bool, int, bool]
+            The newly created countryball (or `ballinstance` if it was set), whether this is the
+            first time this player catches this countryball, the player's number of catches today
+            and whether a Starr Drop was lost because the player already holds the maximum.
 
-            If `ballinstance` was set, this value is returned instead.
+            The player counters and the new instance are written in a single transaction and
+            statement, see `CATCH_QUERY`. A transfer of `ballinstance` updates the same counters
+            in the transaction of the transfer.
 
         Raises
         ------
-        RuntimeError
-            The `caught` attribute is already set to `True`. You should always check before calling
-            this function that the ball was not caught.
+        AlreadyCaughtError
+            Someone else caught this countryball first, either in this process (the `caught`
+            attribute is already set) or in another one (the spawn is already marked as caught).
         """
-        fullsd = False
-        if not self.DontCount:
-            try:
-                player.dailycaught += 1
-            except ValidationError:
-                pass
-            try:
-                sdyes = False
-                
-                if player.dailycaught in {1, 4, 8}:
-                    sdyes = True
-                    player.sdcount += 1
-
-                updatef = ["dailycaught",]
-                if sdyes:
-                    updatef.append("sdcount")
-                await player.save(update_fields=updatef)
-            except ValidationError:
-                fullsd = True
-
-        
-        options = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-        weights = [5, 4, 5, 10, 8, 7, 8, 9, 10, 7]
-
-        result = random.choices(options, weights=weights, k=1)[0]
+        if not self.claim():
+            raise AlreadyCaughtError()
         try:
-            player.trophies+=result ; await player.save(update_fields=("trophies",))
-            Reg = await Regime.get(id=self.model.regime_id)
-            if Reg.name.lower().strip().replace(" ", "_") in {"rare", "super_rare", "epic", "mythic", "legendary"}:
-                b_trophies = player.brawler_trophies.get(self.model.pk)
-                if b_trophies:
-                    b_trophies+=result ; await player.save(update_fields=("brawler_trophies",))
-        except ValidationError:
-            log.debug(f"{user.id} has reached the upper limit of trophies")
-
-        options = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100]
-        weights = [1500, 1000, 500, 250, 125, 75, 40, 25, 10, 4, 2] # 1500 being 30% weight and 42.4% chance, 75 being 1.5% weight and 2.1% chance
-
-        result = random.choices(options, weights=weights, k=1)[0]
-        bonus_attack = self.atk_bonus or result
-        bonus_health = self.hp_bonus or result
-        if self.caught:
-            raise RuntimeError("This ball was already caught!")
-        self.caught = True
-        self.catch_button.disabled = True
-        player = player or (await Player.get_or_create(discord_id=user.id))[0]
-        is_new = not await BallInstance.filter(player=player, ball=self.model).exists()
+            return await self._catch_ball(user, player=player, guild=guild)
+        finally:
+            self.release()
+
+    async def _catch_ball(
+        self,
+        user: discord.User | discord.Member,
+        *,
+        player: PlayerIdentity | None,
+        guild: discord.Guild | None,
+    ) -> tuple[BallInstance, bool, int, bool]:
+        player = player or await player_cache.resolve(user.id)
+
+        trophies = random.choices(TROPHY_OPTIONS, weights=TROPHY_WEIGHTS, k=1)[0]
+        regime_name = self.model.cached_regime.name.lower().strip().replace(" ", "_")
+        catch_date = tortoise_now()
+        counters = [
+            player.pk,
+            not self.DontCount,
+            trophies,
+            regime_name in TROPHY_REGIMES,
+            self.model.pk,
+            catch_day(catch_date),
+        ]
 
         if self.ballinstance:
             # if specified, do not create a countryball but switch owner
             # it's important to register this as a trade to avoid bypass
-            trade = await Trade.create(player1=self.ballinstance.player, player2=player)
-            await TradeObject.create(
-                trade=trade, player=self.ballinstance.player, ballinstance=self.ballinstance
-            )
-            self.ballinstance.trade_player = self.ballinstance.player
-            self.ballinstance.player = player
-            self.ballinstance.locked = None  # type: ignore
-            await self.ballinstance.save(update_fields=("player", "trade_player", "locked"))
-            return self.ballinstance, is_new
-            
+            async with in_transaction() as connection:
+                # fails if another process caught it first
+                claimed = await Spawn.filter(id=self.spawn_id, caught=False).update(caught=True)
+                if not claimed:
+                    raise AlreadyCaughtError()
+                # counted like any other catch
+                _, rows = await connection.execute_query(TRANSFER_COUNTERS_QUERY, counters)
+                if not rows:
+                    raise RuntimeError(f"Player {player.pk} does not exist")
+                new_owner = await Player.get(pk=player.pk)
+                is_new = not await owned_balls.owns(player.pk, self.model.pk)
+                trade = await Trade.create(player1=self.ballinstance.player, player2=new_owner)
+                await TradeObject.create(
+                    trade=trade, player=self.ballinstance.player, ballinstance=self.ballinstance
+                )
+                self.ballinstance.trade_player = self.ballinstance.player
+                self.ballinstance.player = new_owner
+                self.ballinstance.locked = None  # type: ignore
+                await self.ballinstance.save(
+                    update_fields=("player_id", "trade_player_id", "locked")
+                )
+            row = rows[0]
+            leaderboards.trophies.set(player.pk, row["trophies"])
+            leaderboards.record_transfer(self.ballinstance, self.ballinstance.trade_player.pk)
+            return self.ballinstance, is_new, row["dailycaught"], row["fullsd"]
+
+        result = random.choices(BONUS_OPTIONS, weights=BONUS_WEIGHTS, k=1)[0]
+        bonus_attack = self.atk_bonus or result
+        bonus_health = self.hp_bonus or result
 
         # check if we can spawn cards with a special background
         special: Special | None = self.special
-
         if not special:
             special = self.get_random_special()
 
-        if not self.ballinstance:
-            mplayer = player
-            if self.fakespawn:
-                mplayer = await Player.get(discord_id="1294582625352024175")
-            ball = await BallInstance.create(
-                ball=self.model,
-                player=mplayer,
-                special=special,
-                attack_bonus=bonus_attack,
-                health_bonus=bonus_health,
-                server_id=guild.id if guild else None,
-                spawned_time=self.message.created_at,
+        owner_id = FAKESPAWN_OWNER_ID if self.fakespawn else player.discord_id
+
+        async with in_transaction() as connection:
+            _, rows = await connection.execute_query(
+                CATCH_QUERY,
+                [
+                    *counters,
+                    owner_id,
+                    special.pk if special else None,
+                    bonus_attack,
+                    bonus_health,
+                    guild.id if guild else None,
+                    self.message.created_at,
+                    catch_date,
+                    self.spawn_id,
+                ],
             )
+            # raising here rolls back the counters
+            if not rows:
+                raise RuntimeError(f"Player {player.pk} does not exist")
+            row = rows[0]
+            if row["id"] is None:
+                raise AlreadyCaughtError()
+
+        is_new = row["is_new"]
+        fullsd = row["fullsd"]
+        owned_balls.add(row["player_id"], self.model.pk)
+        leaderboards.record_catch(
+            player.pk, row["trophies"], row["player_id"], guild.id if guild else None
+        )
+
+        ball = BallInstance(
+            id=row["id"],
+            ball=self.model,
+            player_id=row["player_id"],
+            special=special,
+            attack_bonus=bonus_attack,
+            health_bonus=bonus_health,
+            server_id=guild.id if guild else None,
+            spawned_time=self.message.created_at,
+            catch_date=catch_date,
+            spawn_id=self.spawn_id,
+        )
+        ball._saved_in_db = True
 
         # logging and stats
         log.log(
@@ -588,7 +800,7 @@ class BallSpawnView(View):
                 spawn_algo=self.algo,
             ).inc()
 
-        return ball, is_new, player.dailycaught, fullsd
+        return ball, is_new, row["dailycaught"], fullsd
 
     def get_catch_message(self, ball: BallInstance, new_ball: bool, mention: str, dailycatch: int, fullsd: bool) -> str:
         """
@@ -626,7 +838,7 @@ class BallSpawnView(View):
                 f"{new_cb_emoji} You unlocked a **new {self.RegimeName}**! "
                  f"It's now in your {self.RegimeName} collection! {new_cb_emoji}\n"
             )
-        if dailycatch in {1, 4, 8}:
+        if dailycatch in STARR_DROP_CATCHES:
                 mj = self.bot.get_emoji(1379137569564000417) if fullsd else self.bot.get_emoji(1363188571099496699)
                 pf = "th"
                 if dailycatch == 1:
@@ -663,3 +875,54 @@ class BallSpawnView(View):
             caught_message
             + f"{plevel_emoji} (`#{ball.pk:0X}`)\n\n{text}"
         )
+
+
+class CatchButton(DynamicItem[Button], template=r"catch:(?P<id>[0-9]+)"):
+    """
+    The catch button of a spawn. Its custom ID only holds the ID of the `Spawn` row, so it
+    keeps working after a restart: the view is rebuilt from the database on each interaction.
+
+    Registered with `BallsDexBot.add_dynamic_items` when loading the countryballs package.
+    """
+
+    def __init__(
+        self,
+        spawn_id: int,
+        *,
+        style: discord.ButtonStyle = discord.ButtonStyle.primary,
+        label: str | None = None,
+        emoji: discord.PartialEmoji | discord.Emoji | str | None = None,
+    ):
+        super().__init__(
+            Button(style=style, label=label, emoji=emoji, custom_id=f"catch:{spawn_id}")
+        )
+        self.spawn_id = spawn_id
+        self.spawn: BallSpawnView | None = None
+
+    @classmethod
+    async def from_custom_id(
+        cls, interaction: discord.Interaction["BallsDexBot"], item: Button, match
+    ) -> "CatchButton":
+        button = cls(int(match["id"]), style=item.style, label=item.label, emoji=item.emoji)
+        state = await Spawn.get_or_none(id=button.spawn_id).prefetch_related(
+            "ballinstance__player"
+        )
+        # the spawn may have been purged, or its countryball deleted
+        if state and state.ball_id in balls and interaction.message:
+            view = BallSpawnView.from_state(interaction.client, state, interaction.message)
+            view.add_catch_button(button)
+        return button
+
+    async def interaction_check(self, interaction: discord.Interaction["BallsDexBot"], /) -> bool:
+        return await interaction.client.blacklist_check(interaction)
+
+    async def callback(self, interaction: discord.Interaction["BallsDexBot"]):
+        if self.spawn is None or (self.spawn.expired and not self.spawn.caught):
+            self.item.disabled = True
+            await interaction.response.edit_message(view=self.view)
+            await interaction.followup.send(
+                f"This {settings.collectible_name} ran away!", ephemeral=True
+            )
+            return
+        await self.spawn.catch_button_cb(interaction)
+
@@ -1,92 +1,210 @@
-from typing import TYPE_CHECKING
 import asyncio
 import logging
+import math
 import random
-from ballsdex.core.models import Ball, Special
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Callable
+
+import discord
+
+from ballsdex.core.metrics import (
+    scheduled_spawn_duration,
+    scheduled_spawn_failures,
+    scheduled_spawn_lag,
+)
+from ballsdex.core.models import Ball, Special, specials
 from ballsdex.packages.countryballs.countryball import BallSpawnView
 
 if TYPE_CHECKING:
-  from ballsdex.core.bot import BallsDexBot
+    from ballsdex.core.bot import BallsDexBot
 
 log = logging.getLogger("ballsdex.packages.countryballs.extra_spawns")
 
-async def pay_to_win_spawner(self):
-    channel = self.get_channel(1391136498769723432)
-    while True:
-        spawn_time = 0
-        spawn_amount = 0
-        boost_count = channel.guild.premium_subscription_count
-        if boost_count <= 15:
-            spawn_time = 15*60
-            spawn_amount = 1
-        elif boost_count == 16:
-            spawn_time = 14*60
-            spawn_amount = 1
-        elif boost_count == 17:
-            spawn_time = 13*60
-            spawn_amount = 2
-        elif boost_count == 18:
-            spawn_time = 12*60
-            spawn_amount = 2
-        elif boost_count == 19:
-            spawn_time = 11*60
-            spawn_amount = 2
-        elif boost_count >= 20:
-            spawn_time = 10*60
-            spawn_amount = 3
-        else:
-            pass
-        special_obj = ""
-        options = [None, "Brawl Pass", "Brawl Pass Plus"]
-        weights = [40, 40, 20]
-        picked_special = random.choices(options, weights=weights, k=1)[0]
-        if not picked_special:
-            pass
-        else:
-            special_obj = await Special.get(name=str(picked_special))
-        try:
-            for i in range(spawn_amount):
-                ball = await BallSpawnView.get_random(self)
-                ball.special = special_obj
-                await ball.spawn(channel)
-
-        except Exception as e:
-            log.error(f"An error occurred (P2W)", exc_info=e)
-
-        await asyncio.sleep(spawn_time)
-
-async def basic_spawner(self):
-    channel = self.get_channel(1295410565765922862)
-    while True:
-        spawn_time = 0
-        spawn_amount = 0
-        boost_count = channel.guild.premium_subscription_count
-        if boost_count <= 15:
-            spawn_time = 15*60
-            spawn_amount = 1
-        elif boost_count == 16:
-            spawn_time = 14*60
-            spawn_amount = 1
-        elif boost_count == 17:
-            spawn_time = 13*60
-            spawn_amount = 2
-        elif boost_count == 18:
-            spawn_time = 12*60
-            spawn_amount = 2
-        elif boost_count == 19:
-            spawn_time = 11*60
-            spawn_amount = 2
-        elif boost_count >= 20:
-            spawn_time = 10*60
-            spawn_amount = 3
-        else:
-            pass
-        try:
-            for i in range(spawn_amount):
-                ball = await BallSpawnView.get_random(self)
-                await ball.spawn(channel)
-
-        except Exception as e:
-            log.error(f"An error occurred (Basic)", exc_info=e)
-
-        await asyncio.sleep(spawn_time)
+P2W_SPECIALS = [None, "Brawl Pass", "Brawl Pass Plus"]
+P2W_SPECIAL_WEIGHTS = [40, 40, 20]
+
+# delay before retrying a schedule whose channel could not be resolved
+RETRY_INTERVAL = 60
+# delay before restarting a schedule task that crashed
+RESTART_DELAY = 30
+
+
+def get_spawn_schedule(boost_count: int) -> tuple[int, int]:
+    """
+    Return the interval in seconds between two extra spawns and the number of balls spawned
+    each time, according to the number of server boosts.
+    """
+    if boost_count <= 15:
+        return 15*60, 1
+    elif boost_count == 16:
+        return 14*60, 1
+    elif boost_count == 17:
+        return 13*60, 2
+    elif boost_count == 18:
+        return 12*60, 2
+    elif boost_count == 19:
+        return 11*60, 2
+    else:
+        return 10*60, 3
+
+
+def pick_p2w_special_name() -> str | None:
+    return random.choices(P2W_SPECIALS, weights=P2W_SPECIAL_WEIGHTS, k=1)[0]
+
+
+def boost_cadence(channel: discord.TextChannel) -> tuple[float, int]:
+    return get_spawn_schedule(channel.guild.premium_subscription_count)
+
+
+def p2w_special() -> Special | None:
+    name = pick_p2w_special_name()
+    if not name:
+        return None
+    return next((x for x in specials.values() if x.name == name), None)
+
+
+@dataclass
+class SpawnSchedule:
+    """
+    A periodic spawn in a fixed channel.
+
+    Attributes
+    ----------
+    name: str
+        Name of the schedule, used in logs and metrics.
+    channel_id: int
+        ID of the channel where the balls are spawned.
+    cadence: Callable[[discord.TextChannel], tuple[float, int]]
+        Returns the interval in seconds until the next run and the number of balls to spawn.
+        Evaluated on each run. Defaults to the server boosts table.
+    pool: Callable[[Ball], bool] | None
+        Filter restricting the balls that can be spawned.
+    special: Callable[[], Special | None] | None
+        Returns the special to force on each run. If unset or returning `None`, the special is
+        picked randomly on catch like other spawns.
+    concurrency: int
+        Maximum number of balls being sent at the same time for a single run.
+    jitter: float
+        Maximum random delay in seconds added to each run. It is not carried over to the next
+        runs, so it never causes drift.
+    """
+
+    name: str
+    channel_id: int
+    cadence: Callable[[discord.TextChannel], tuple[float, int]] = boost_cadence
+    pool: Callable[[Ball], bool] | None = None
+    special: Callable[[], Special | None] | None = None
+    concurrency: int = 1
+    jitter: float = 0
+
+
+EXTRA_SPAWN_SCHEDULES = [
+    SpawnSchedule("P2W", 1391136498769723432, special=p2w_special),
+    SpawnSchedule("Basic", 1295410565765922862),
+]
+
+
+class SpawnScheduler:
+    """
+    Runs a list of `SpawnSchedule`, each in its own supervised task.
+
+    Runs are planned on a fixed timeline: the next run is the previous planned time plus the
+    interval, regardless of how long the spawns took. Runs that could not happen in time are
+    skipped instead of being sent in a burst. An error in a run, or even a crash of a schedule's
+    task, never affects the other schedules.
+    """
+
+    def __init__(self, bot: "BallsDexBot", schedules: list[SpawnSchedule]):
+        self.bot = bot
+        self.schedules = schedules
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def start(self):
+        for schedule in self.schedules:
+            self._start(schedule)
+
+    def stop(self):
+        tasks = list(self.tasks.values())
+        self.tasks.clear()
+        for task in tasks:
+            task.cancel()
+
+    def _start(self, schedule: SpawnSchedule):
+        task = asyncio.create_task(self.run(schedule), name=f"spawn-schedule-{schedule.name}")
+        task.add_done_callback(partial(self._on_done, schedule))
+        self.tasks[schedule.name] = task
+
+    def _on_done(self, schedule: SpawnSchedule, task: asyncio.Task):
+        if task.cancelled() or self.tasks.get(schedule.name) is not task:
+            return
+        log.critical(
+            f"Spawn schedule {schedule.name} stopped unexpectedly, "
+            f"restarting in {RESTART_DELAY}s.",
+            exc_info=task.exception(),
+        )
+        scheduled_spawn_failures.labels(schedule=schedule.name).inc()
+        asyncio.get_running_loop().call_later(RESTART_DELAY, self._restart, schedule, task)
+
+    def _restart(self, schedule: SpawnSchedule, task: asyncio.Task):
+        # the scheduler may have been stopped in the meantime
+        if self.tasks.get(schedule.name) is task:
+            self._start(schedule)
+
+    async def run(self, schedule: SpawnSchedule):
+        loop = asyncio.get_running_loop()
+        next_run = loop.time()
+        while True:
+            planned = next_run + random.uniform(0, schedule.jitter)
+            delay = planned - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            started = loop.time()
+            scheduled_spawn_lag.labels(schedule=schedule.name).observe(started - planned)
+            try:
+                interval = await self.run_once(schedule)
+            except Exception:
+                log.error(f"An error occurred ({schedule.name})", exc_info=True)
+                scheduled_spawn_failures.labels(schedule=schedule.name).inc()
+                interval = RETRY_INTERVAL
+            scheduled_spawn_duration.labels(schedule=schedule.name).observe(
+                loop.time() - started
+            )
+
+            next_run += interval
+            late = loop.time() - next_run
+            if late > 0:
+                skipped = math.ceil(late / interval)
+                log.warning(f"Spawn schedule {schedule.name} is late, skipping {skipped} run(s).")
+                next_run += skipped * interval
+
+    async def run_once(self, schedule: SpawnSchedule) -> float:
+        """
+        Spawn the balls of a single run, and return the interval until the next one.
+        """
+        channel = self.bot.get_channel(schedule.channel_id)
+        if not isinstance(channel, discord.TextChannel):
+            log.warning(
+                f"Channel {schedule.channel_id} of spawn schedule {schedule.name} not found."
+            )
+            return RETRY_INTERVAL
+        interval, amount = schedule.cadence(channel)
+        special = schedule.special() if schedule.special else None
+        semaphore = asyncio.Semaphore(schedule.concurrency)
+
+        async def spawn_one() -> bool:
+            async with semaphore:
+                ball = await BallSpawnView.get_random(self.bot, schedule.pool)
+                ball.special = special
+                return await ball.spawn(channel)
+
+        results = await asyncio.gather(
+            *(spawn_one() for _ in range(amount)), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                log.error(f"An error occurred ({schedule.name})", exc_info=result)
+            if result is not True:
+                scheduled_spawn_failures.labels(schedule=schedule.name).inc()
+        return interval
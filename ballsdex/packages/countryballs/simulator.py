@@ -0,0 +1,440 @@
+"""
+Offline spawn and drop-rate simulator.
+
+Replays a synthetic or recorded message stream through the real spawn manager, ball and special
+selection, extra spawners and Starr Drop reward tables, without connecting to Discord. The
+catalog (balls, regimes and specials) is read from the database configured with
+``BALLSDEXBOT_DB_URL``.
+
+Time is virtual: the event loop jumps directly to the next scheduled callback instead of
+sleeping, so the 10 seconds message cooldowns of `SpawnCooldown` behave like in production
+while a simulated day completes in seconds.
+
+Usage::
+
+    python -m ballsdex.packages.countryballs.simulator --guilds 50 --hours 24 --seed 1
+    python -m ballsdex.packages.countryballs.simulator --replay messages.jsonl
+
+Recorded streams are JSON lines with the keys ``guild_id``, ``member_count``, ``author_id``,
+``content`` and ``timestamp`` (seconds since the start of the recording), sorted by timestamp.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import selectors
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+from rich import box
+from rich.console import Console
+from rich.table import Table
+from tortoise import Tortoise
+
+from ballsdex.core.models import Ball, Regime, Special, balls, regimes, specials
+from ballsdex.core.utils.specials import special_schedule
+from ballsdex.packages.countryballs.countryball import BallSpawnView
+from ballsdex.packages.countryballs.extra_spawns import EXTRA_SPAWN_SCHEDULES, SpawnSchedule
+
+if TYPE_CHECKING:
+    from ballsdex.packages.countryballs.spawn import BaseSpawnManager
+
+
+class VirtualSelector:
+    """
+    Wraps a selector so that waiting for I/O advances the virtual clock instead of blocking.
+    """
+
+    def __init__(self, selector: selectors.BaseSelector, loop: VirtualClockEventLoop):
+        self._selector = selector
+        self._loop = loop
+
+    def select(self, timeout: float | None = None):
+        events = self._selector.select(0)
+        if not events and timeout:
+            self._loop.virtual_time += timeout
+        return events
+
+    def __getattr__(self, name: str):
+        return getattr(self._selector, name)
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """
+    An event loop running on virtual time, starting at 0.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.virtual_time = 0.0
+        self._selector = VirtualSelector(self._selector, self)  # type: ignore
+
+    def time(self) -> float:
+        return self.virtual_time
+
+
+@dataclass
+class SimulatedMessage:
+    """
+    The subset of `discord.Message` read by the spawn managers.
+    """
+
+    guild: SimpleNamespace
+    author: SimpleNamespace
+    content: str
+    created_at: datetime
+    _state: SimpleNamespace
+    timestamp: float
+
+
+@dataclass
+class SimulationReport:
+    duration: float = 0
+    messages: int = 0
+    spawns: int = 0
+    extra_spawns: int = 0
+    message_cpu: float = 0
+    spawn_path_cpu: float = 0
+    spawns_per_guild: Counter[int] = field(default_factory=Counter)
+    balls: Counter[str] = field(default_factory=Counter)
+    specials: Counter[str] = field(default_factory=Counter)
+    drop_rarities: Counter[str] = field(default_factory=Counter)
+    drop_rewards: Counter[str] = field(default_factory=Counter)
+    drop_balls: Counter[str] = field(default_factory=Counter)
+
+
+def synthetic_stream(
+    rng: random.Random,
+    *,
+    start: datetime,
+    guilds: int,
+    member_count: int,
+    messages_per_hour: float,
+    chatters: int,
+    hours: float,
+) -> Iterator[SimulatedMessage]:
+    """
+    Generate Poisson-distributed messages for a number of identical guilds.
+    """
+    intents = SimpleNamespace(message_content=True)
+    events: list[tuple[float, int]] = []
+    for guild_index in range(guilds):
+        timestamp = 0.0
+        while True:
+            timestamp += rng.expovariate(messages_per_hour / 3600)
+            if timestamp > hours * 3600:
+                break
+            events.append((timestamp, guild_index))
+    events.sort()
+
+    guild_objects = [
+        SimpleNamespace(id=(i + 1) << 22, member_count=member_count) for i in range(guilds)
+    ]
+    for timestamp, guild_index in events:
+        content = "a" * rng.randint(1, 60)
+        yield SimulatedMessage(
+            guild=guild_objects[guild_index],
+            author=SimpleNamespace(id=rng.randint(1, chatters), bot=False),
+            content=content,
+            created_at=start + timedelta(seconds=timestamp),
+            _state=SimpleNamespace(intents=intents),
+            timestamp=timestamp,
+        )
+
+
+def recorded_stream(path: Path, *, start: datetime) -> list[SimulatedMessage]:
+    """
+    Read a recorded message stream from a JSON lines file.
+    """
+    intents = SimpleNamespace(message_content=True)
+    guilds: dict[int, SimpleNamespace] = {}
+    messages: list[SimulatedMessage] = []
+    with path.open() as file:
+        for line in file:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            guild = guilds.get(data["guild_id"])
+            if guild is None:
+                guild = guilds[data["guild_id"]] = SimpleNamespace(
+                    id=data["guild_id"], member_count=data["member_count"]
+                )
+            timestamp = float(data["timestamp"])
+            messages.append(
+                SimulatedMessage(
+                    guild=guild,
+                    author=SimpleNamespace(id=data["author_id"], bot=False),
+                    content=data.get("content", ""),
+                    created_at=start + timedelta(seconds=timestamp),
+                    _state=SimpleNamespace(intents=intents),
+                    timestamp=timestamp,
+                )
+            )
+    return messages
+
+
+class Simulator:
+    """
+    Drives the real spawn logic with a message stream and collects statistics.
+
+    Parameters
+    ----------
+    manager_path: str
+        Python path to the `BaseSpawnManager` implementation to simulate.
+    seed: int
+        Seed of the global random generator, used by the spawn logic.
+    start: datetime
+        Date of the beginning of the simulation, which determines the active specials.
+    """
+
+    def __init__(self, manager_path: str, seed: int, start: datetime):
+        random.seed(seed)
+        self.start = start
+        module_path, class_name = manager_path.rsplit(".", 1)
+        module = importlib.import_module(module_path)
+        self.manager: BaseSpawnManager = getattr(module, class_name)(None)
+        self.report = SimulationReport()
+        special_schedule.clock = self.now
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=asyncio.get_running_loop().time())
+
+    async def sample_spawn(
+        self, special: Special | None = None, pool: Callable[[Ball], bool] | None = None
+    ):
+        t1 = time.thread_time()
+        view = await BallSpawnView.get_random(None, pool)  # type: ignore
+        special = special or view.get_random_special()
+        self.report.spawn_path_cpu += time.thread_time() - t1
+
+        self.report.balls[view.model.country] += 1
+        self.report.specials[special.name if special else "None"] += 1
+
+    async def handle_message(self, message: SimulatedMessage):
+        result = await self.manager.handle_message(message)  # type: ignore
+        if result is False:
+            return
+        self.report.spawns += 1
+        self.report.spawns_per_guild[message.guild.id] += 1
+        await self.sample_spawn()
+
+    async def replay(self, stream: Iterable[SimulatedMessage]):
+        loop = asyncio.get_running_loop()
+        tasks: set[asyncio.Task] = set()
+        # tasks are interleaved, so CPU time is measured for the whole replay, then the part
+        # spent selecting balls and specials is subtracted
+        t1 = time.thread_time()
+        spawn_path_cpu = self.report.spawn_path_cpu
+        for message in stream:
+            delay = message.timestamp - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.report.messages += 1
+            # messages are dispatched concurrently, like discord.py does with events
+            task = asyncio.create_task(self.handle_message(message))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        self.report.message_cpu += (time.thread_time() - t1) - (
+            self.report.spawn_path_cpu - spawn_path_cpu
+        )
+
+    async def extra_spawner(self, schedule: SpawnSchedule, boost_count: int, duration: float):
+        loop = asyncio.get_running_loop()
+        channel = SimpleNamespace(guild=SimpleNamespace(premium_subscription_count=boost_count))
+        while loop.time() < duration:
+            interval, amount = schedule.cadence(channel)  # type: ignore
+            special = schedule.special() if schedule.special else None
+            for _ in range(amount):
+                self.report.extra_spawns += 1
+                await self.sample_spawn(special, schedule.pool)
+            await asyncio.sleep(interval)
+
+    def open_starr_drops(self, amount: int):
+        from ballsdex.packages.starrdrop.cog import pick_reward_ball, roll_drop
+
+        for _ in range(amount):
+            ounce, reward = roll_drop()
+            self.report.drop_rarities[ounce["name"]] += 1
+            self.report.drop_rewards[reward] += 1
+            if not (reward.endswith("pp") or reward.endswith("c")):
+                ball = pick_reward_ball(ounce, reward)
+                self.report.drop_balls[ball.country if ball else "None"] += 1
+
+    async def run(
+        self,
+        stream: Iterable[SimulatedMessage],
+        *,
+        duration: float,
+        boost_count: int | None,
+        starr_drops: int,
+    ):
+        coros = [self.replay(stream)]
+        if boost_count is not None:
+            coros.extend(
+                self.extra_spawner(schedule, boost_count, duration)
+                for schedule in EXTRA_SPAWN_SCHEDULES
+            )
+        await asyncio.gather(*coros)
+        self.report.duration = duration
+        self.open_starr_drops(starr_drops)
+
+
+async def load_catalog(db_url: str):
+    await Tortoise.init(
+        db_url=db_url, modules={"models": ["ballsdex.core.models"]}, _create_db=False
+    )
+    try:
+        balls.clear()
+        for ball in await Ball.all():
+            balls[ball.pk] = ball
+        regimes.clear()
+        for regime in await Regime.all():
+            regimes[regime.pk] = regime
+        specials.clear()
+        for special in await Special.all():
+            specials[special.pk] = special
+        special_schedule.rebuild(specials.values())
+    finally:
+        await Tortoise.close_connections()
+
+
+def rate_table(title: str, counter: Counter[str], total: int, hours: float) -> Table:
+    table = Table(title=title, box=box.SIMPLE)
+    table.add_column("Name", style="cyan")
+    table.add_column("Count", justify="right", style="green")
+    table.add_column("Rate", justify="right")
+    table.add_column("Per hour", justify="right")
+    for name, count in counter.most_common():
+        table.add_row(
+            name, str(count), f"{count / total:.3%}" if total else "-", f"{count / hours:.2f}"
+        )
+    return table
+
+
+def print_report(report: SimulationReport, *, top: int):
+    console = Console()
+    hours = max(report.duration / 3600, 1e-9)
+    total_spawns = report.spawns + report.extra_spawns
+
+    summary = Table(title="Summary", box=box.SIMPLE)
+    summary.add_column("Metric", style="cyan")
+    summary.add_column("Value", justify="right", style="green")
+    summary.add_row("Simulated time", f"{hours:.2f}h")
+    summary.add_row("Messages", str(report.messages))
+    summary.add_row("Message spawns", f"{report.spawns} ({report.spawns / hours:.2f}/h)")
+    summary.add_row("Extra spawns", f"{report.extra_spawns} ({report.extra_spawns / hours:.2f}/h)")
+    if report.spawns_per_guild:
+        summary.add_row(
+            "Spawns per guild per hour",
+            f"{report.spawns / len(report.spawns_per_guild) / hours:.3f}",
+        )
+    if report.messages:
+        summary.add_row("CPU per message", f"{report.message_cpu / report.messages * 1e6:.1f}µs")
+    if total_spawns:
+        summary.add_row(
+            "CPU per spawn selection", f"{report.spawn_path_cpu / total_spawns * 1e6:.1f}µs"
+        )
+    console.print(summary)
+
+    console.print(rate_table("Specials", report.specials, total_spawns, hours))
+    balls_counter = Counter(dict(report.balls.most_common(top)))
+    console.print(rate_table(f"Top {top} balls", balls_counter, total_spawns, hours))
+    if report.drop_rarities:
+        drops = sum(report.drop_rarities.values())
+        console.print(rate_table("Starr Drop rarities", report.drop_rarities, drops, hours))
+        console.print(rate_table("Starr Drop rewards", report.drop_rewards, drops, hours))
+        console.print(rate_table("Starr Drop balls", report.drop_balls, drops, hours))
+
+
+def parse_args(arguments: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="ballsdex.packages.countryballs.simulator",
+        description="Simulate spawn frequency and drop rates with the real spawn logic",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator")
+    parser.add_argument(
+        "--manager",
+        default="ballsdex.packages.countryballs.spawn.SpawnManager",
+        help="Python path to the spawn manager class",
+    )
+    parser.add_argument(
+        "--start",
+        type=datetime.fromisoformat,
+        help="ISO date where the simulation starts, determines active specials. Defaults to now",
+    )
+    parser.add_argument("--replay", type=Path, help="Replay a recorded JSON lines stream")
+    parser.add_argument("--guilds", type=int, default=10, help="Number of synthetic guilds")
+    parser.add_argument("--members", type=int, default=500, help="Members per synthetic guild")
+    parser.add_argument(
+        "--messages-per-hour", type=float, default=120, help="Messages per hour per guild"
+    )
+    parser.add_argument("--chatters", type=int, default=10, help="Active chatters per guild")
+    parser.add_argument(
+        "--hours", type=float, default=24, help="Simulated duration of the synthetic stream"
+    )
+    parser.add_argument(
+        "--boost-count", type=int, help="Also simulate the extra spawners with this boost count"
+    )
+    parser.add_argument("--starr-drops", type=int, default=0, help="Starr Drops to open")
+    parser.add_argument("--top", type=int, default=25, help="Number of balls to display")
+    return parser.parse_args(arguments)
+
+
+def main(arguments: list[str] | None = None):
+    args = parse_args(arguments)
+    db_url = os.environ.get("BALLSDEXBOT_DB_URL")
+    if not db_url:
+        raise SystemExit("You must provide a DB URL with the BALLSDEXBOT_DB_URL env var.")
+
+    # the catalog is loaded in real time, the database driver relies on real timeouts
+    asyncio.run(load_catalog(db_url))
+
+    start = args.start or datetime.now(timezone.utc)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    simulator = Simulator(args.manager, args.seed, start)
+    stream: Iterable[SimulatedMessage]
+    if args.replay:
+        stream = recorded_stream(args.replay, start=start)
+        duration = stream[-1].timestamp if stream else 0
+    else:
+        stream = synthetic_stream(
+            random.Random(args.seed),
+            start=start,
+            guilds=args.guilds,
+            member_count=args.members,
+            messages_per_hour=args.messages_per_hour,
+            chatters=args.chatters,
+            hours=args.hours,
+        )
+        duration = args.hours * 3600
+
+    loop = VirtualClockEventLoop()
+    try:
+        loop.run_until_complete(
+            simulator.run(
+                stream,
+                duration=duration,
+                boost_count=args.boost_count,
+                starr_drops=args.starr_drops,
+            )
+        )
+    finally:
+        loop.close()
+    print_report(simulator.report, top=args.top)
+
+
+if __name__ == "__main__":
+    main()
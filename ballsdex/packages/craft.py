@@ -5,10 +5,12 @@
 
 import discord
 from ballsdex.core.bot import BallsDexBot
-from ballsdex.core.models import BallInstance,Player,Special,Ball
+from ballsdex.core.models import BallInstance,Special,Ball
 from discord import app_commands
 from discord.ext import commands
 
+from ballsdex.core.utils.leaderboards import leaderboards
+from ballsdex.core.utils.players import player_cache
 from ballsdex.core.utils.sorting import sort_balls,SortingChoices
 from ballsdex.packages.balls.countryballs_paginator import CountryballsSelector
 from ballsdex.settings import settings
@@ -112,7 +114,7 @@ class CraftingSession:
         self.spname = await getspname(self.sp)
         self.bspname = f"**{(await Special.get(pk=self.sp)).name}** " if self.spname else ""
         self.specname = await getspname(self.spec)
-        player, _ = await Player.get_or_create(discord_id=self.interaction.user.id)
+        player, _ = await player_cache.get_or_create(self.interaction.user.id)
         self.player = player
         await player.fetch_related("balls")
         query = player.balls.all()
@@ -153,8 +155,8 @@ class CraftingSession:
         self.selector.pop.disabled = not self.selectedL
     async def craft(self,interaction:discord.Interaction):
         assert len(self.selectedL)==self.spr
-        player,_ = await Player.get_or_create(discord_id=interaction.user.id)
-        np,_ = await Player.get_or_create(discord_id=self.bot.user.id) # type: ignore
+        player,_ = await player_cache.get_or_create(interaction.user.id)
+        np,_ = await player_cache.get_or_create(self.bot.user.id) # type: ignore
         for b in self.selectedL:
             await b.refresh_from_db()
             if b.player_id != player.pk: # type: ignore
@@ -164,6 +166,7 @@ class CraftingSession:
             b.trade_player_id = b.player_id # type: ignore
             b.player_id = np.pk
             await b.save()
+            leaderboards.record_transfer(b, player.pk)
         new = self.selectedL[0]
         new.special_id = self.spec
         await new.save()
@@ -180,7 +183,7 @@ class QuickCraftingSession(CraftingSession):
     async def create(self):
         if not self.spr:
             self.spr = regimec[(await Ball.get(pk=self.ball)).regime_id]
-        player,_ = await Player.get_or_create(discord_id=self.interaction.user.id)
+        player,_ = await player_cache.get_or_create(self.interaction.user.id)
         await player.fetch_related("balls")
 
         fq = player.balls.all()
@@ -17,6 +17,8 @@ from ballsdex.core.models import (
     Regime,
     Player as PlayerModel,
 )
+from ballsdex.core.utils.catalog import catalog
+from ballsdex.core.utils.counters import counter_buffer
 from ballsdex.core.utils.transformers import (
     BallInstanceTransform,
     BallEnabledTransform,
@@ -95,13 +97,11 @@ class Credits(commands.GroupCog, group_name="credits"):
         if cost is None:
             await interaction.response.send_message(f"{brawler.country} can not currently be claimed.",ephemeral=True)
             return
-        if playerm.credits < cost:
+        if not await counter_buffer.spend(playerm.pk, "credits", cost):
             await interaction.response.send_message(f"You don't have enough credits to claim {brawler.country}!",ephemeral=True)
             return
         else:
             await interaction.response.defer(thinking=True)
-            playerm.credits -= cost
-            await playerm.save(update_fields=("credits",))
             inst = await BallInstance.create(
                 ball=brawler,
                 player=playerm,
@@ -159,19 +159,6 @@ class PowerPoints(commands.GroupCog, group_name="powerpoints"):
         brawler: BallInstance
             The Brawler you want to Upgrade.
         """
-        SKIN_REGIMES = [
-            22,
-            23,
-            24,
-            25,
-            26,
-            27,
-            37,
-            40,
-            39,
-            38,
-            35
-        ]
         playerm = await PlayerModel.get(discord_id=interaction.user.id)
         if not brawler or brawler.player != playerm:
             return
@@ -180,15 +167,13 @@ class PowerPoints(commands.GroupCog, group_name="powerpoints"):
         cost = self.NextUpgradeCost[plvl]
         if brawler.health_bonus >= 100 and brawler.attack_bonus >= 100 or cost is None:
             await interaction.response.send_message("This brawler can not be upgraded further.", ephemeral=True)
-        elif playerm.powerpoints >= cost:
+        elif await counter_buffer.spend(playerm.pk, "powerpoints", cost):
             await interaction.response.defer(thinking=True)
-            playerm.powerpoints -= cost
-            await playerm.save(update_fields=("powerpoints",))
             brawler.health_bonus += 10; brawler.attack_bonus += 10
             await brawler.save()
             data, file, view = await brawler.prepare_for_message(interaction)
             try:
-                await interaction.followup.send(f"{interaction.user.mention}, your {"Skin" if brawler.ball.regime_id in SKIN_REGIMES else "Brawler"} has been upgraded.\n\n{data}", file=file, view=view)
+                await interaction.followup.send(f"{interaction.user.mention}, your {catalog.noun(brawler.ball).capitalize()} has been upgraded.\n\n{data}", file=file, view=view)
             finally:
                 file.close()
                 log.debug(f"{interaction.user.id} upgraded a {brawler.id}")
@@ -283,8 +268,7 @@ class Currency(commands.Cog):
             choice = choice.replace("10", "")
             jackpot = jackpot.replace("10", ", You hit the Jackpot, You get 10x the reward!")
             cmnt *= 10
-        setattr(player, choice, getattr(player, choice) + cmnt)
-        await player.save(update_fields=(choice,))
+        counter_buffer.add(player.pk, **{choice: cmnt})
         cmd_msg = await interaction.followup.send(f"You received your {cmnt} {jackpot}\n{fortune_cookie_1}*{picked_fortune}*{fortune_cookie_2}", ephemeral=True)
         if interaction.guild and interaction.guild.id == sticker_server_id:
             await interaction.channel.send(stickers=sticker_array, reference=cmd_msg)
@@ -14,12 +14,17 @@ from discord.app_commands.translator import (
 from discord.ext import commands
 
 from ballsdex import __version__ as ballsdex_version
-from ballsdex.core.models import Ball, BallInstance, Player, Trade
+from ballsdex.core.models import Ball, BrawlerTrophies, Player, RegimeCategory
 from ballsdex.core.models import balls as countryballs
+from ballsdex.core.utils.counters import counter_buffer
 from ballsdex.core.utils.formatting import pagify
+from ballsdex.core.utils.leaderboards import BOARD_CAPACITY, leaderboards
+from ballsdex.core.utils.paginator import SimplePages
+from ballsdex.core.utils.players import player_cache
+from ballsdex.core.utils.profiles import profile_stats
 from ballsdex.core.utils.tortoise import row_count_estimate
+from ballsdex.core.utils.transformers import BallEnabledTransform
 from ballsdex.settings import settings
-from tortoise.expressions import Q
 
 from .license import LicenseInfo
 
@@ -245,7 +250,7 @@ class Info(commands.Cog):
         Show your collection progressions and currency amounts.
         """
         user_obj = user or interaction.user
-        player_obj, _ = await Player.get_or_create(discord_id=user_obj.id)
+        player_obj, _ = await player_cache.get_or_create(user_obj.id)
         brawler_emoji = self.bot.get_emoji(1372376567153557514)
         skin_emoji = self.bot.get_emoji(1373356124681535582)
         pps_emoji = self.bot.get_emoji(1364817571819425833)
@@ -253,31 +258,9 @@ class Info(commands.Cog):
         credits_emoji = self.bot.get_emoji(1364877745032794192)
         starrdrops_emoji = self.bot.get_emoji(1363188571099496699)
         collectibles_emoji = self.bot.get_emoji(1379120934732042240)
-        collectible_count = await BallInstance.filter(player=player_obj).count()
-        filters = {"player__discord_id": user_obj.id, "ball__enabled": True}
-        bot_brawlers = {x: y.emoji_id for x, y in countryballs.items() if y.enabled and 3 <= y.economy_id <= 9 and not 19 <= y.regime_id <= 21 and not y.economy_id == 16}
-        bot_skins = {x: y.emoji_id for x, y in countryballs.items() if y.enabled and (22 <= y.regime_id <= 27 or y.regime_id == 35 or 37 <= y.regime_id <= 40)}
-        owned_brawlers = set(
-            x[0]
-            for x in await BallInstance.filter(**filters).exclude(ball__regime_id=19).exclude(ball__regime_id=20).exclude(ball__regime_id=21).exclude(ball__regime_id=22).exclude(ball__regime_id=23).exclude(ball__regime_id=24).exclude(ball__regime_id=25).exclude(ball__regime_id=26).exclude(ball__regime_id=27).exclude(ball__regime_id=28).exclude(ball__regime_id=29).exclude(ball__regime_id=30).exclude(ball__regime_id=31).exclude(ball__regime_id=32).exclude(ball__regime_id=33).exclude(ball__regime_id=35).exclude(ball__regime_id=37).exclude(ball__regime_id=38).exclude(ball__regime_id=39).exclude(ball__regime_id=40)
-            .distinct()  # Do not query everything
-            .values_list("ball_id")
-            )
-        owned_skins = set(
-            x[0]
-            for x in await BallInstance.filter(**filters).exclude(ball__regime_id=5).exclude(ball__regime_id=6).exclude(ball__regime_id=7).exclude(ball__regime_id=8).exclude(ball__regime_id=16).exclude(ball__regime_id=19).exclude(ball__regime_id=20).exclude(ball__regime_id=21).exclude(ball__regime_id=28).exclude(ball__regime_id=29).exclude(ball__regime_id=30).exclude(ball__regime_id=31).exclude(ball__regime_id=32).exclude(ball__regime_id=33).exclude(ball__regime_id=34).exclude(ball__regime_id=36)
-            .distinct()  # Do not query everything
-            .values_list("ball_id")
-            )
-        trades = await Trade.filter(
-            Q(player1__discord_id=user_obj.id) | Q(player2__discord_id=user_obj.id)
-        ).values_list("player1__discord_id", "player2__discord_id")
-        trade_partners = set()
-        for p1, p2 in trades:
-            if p1 != user_obj.id:
-                trade_partners.add(p1)
-            if p2 != user_obj.id:
-                trade_partners.add(p2)
+        stats = await profile_stats(player_obj.pk)
+        owned_brawlers, total_brawlers = stats.completion(RegimeCategory.BRAWLER)
+        owned_skins, total_skins = stats.completion(RegimeCategory.SKIN)
         embed = discord.Embed(
             title=f"{user_obj.name}'s Profile",
             color=discord.Colour.from_str("#ffff00")
@@ -285,14 +268,81 @@ class Info(commands.Cog):
         embed.set_thumbnail(url=user_obj.display_avatar.url)
         embed.description = (
             f"## Statistics\n"
-            f"> {collectible_count}{collectibles_emoji}\n"
-            f"> {len(owned_brawlers)}/{len(bot_brawlers)}{brawler_emoji}\n"
-            f"> {len(owned_skins)}/{len(bot_skins)}{skin_emoji}\n"
-            f"> {len(trades):,} Trades Done {socials_emoji}\n"
-            f"> Traded With {len(trade_partners):,} Users {socials_emoji}\n"
+            f"> {stats.total}{collectibles_emoji}\n"
+            f"> {owned_brawlers}/{total_brawlers}{brawler_emoji}\n"
+            f"> {owned_skins}/{total_skins}{skin_emoji}\n"
+            f"> {stats.trades:,} Trades Done {socials_emoji}\n"
+            f"> Traded With {stats.partners:,} Users {socials_emoji}\n"
             f"## Resources\n"
-            f"> {player_obj.powerpoints}{pps_emoji}\n"
-            f"> {player_obj.credits}{credits_emoji}\n"
-            f"> {player_obj.sdcount}{starrdrops_emoji}\n"
+            f"> {counter_buffer.value(player_obj, 'powerpoints')}{pps_emoji}\n"
+            f"> {counter_buffer.value(player_obj, 'credits')}{credits_emoji}\n"
+            f"> {counter_buffer.value(player_obj, 'sdcount')}{starrdrops_emoji}\n"
         )
         await interaction.response.send_message(embed=embed)
+
+    @app_commands.command()
+    @app_commands.checks.cooldown(1, 10, key=lambda i: i.user.id)
+    @app_commands.choices(
+        board=[
+            app_commands.Choice(name="Trophies", value="trophies"),
+            app_commands.Choice(name="Collection", value="collection"),
+            app_commands.Choice(name="This server", value="server"),
+        ]
+    )
+    async def leaderboard(
+        self,
+        interaction: discord.Interaction["BallsDexBot"],
+        board: str = "trophies",
+        brawler: BallEnabledTransform | None = None,
+    ):
+        """
+        Show the best players of the bot or of this server.
+
+        Parameters
+        ----------
+        board: str
+            The ranking to show, trophies by default.
+        brawler: Ball
+            Rank the trophies won with this brawler instead.
+        """
+        if brawler:
+            ranking = None
+            title = f"Top trophies with {brawler.country}"
+            unit = "trophies"
+        elif board == "server":
+            if not interaction.guild_id:
+                await interaction.response.send_message(
+                    "This leaderboard is only available in servers.", ephemeral=True
+                )
+                return
+            ranking = leaderboards.guild(interaction.guild_id)
+            title = f"Top collections caught in {interaction.guild}"
+            unit = settings.plural_collectible_name
+        elif board == "collection":
+            ranking = leaderboards.collection
+            title = "Top collections"
+            unit = settings.plural_collectible_name
+        else:
+            ranking = leaderboards.trophies
+            title = "Top trophies"
+            unit = "trophies"
+
+        await interaction.response.defer(thinking=True)
+        if ranking is None:
+            # indexed on (ball_id, trophies), no need to keep a board in memory
+            entries = await BrawlerTrophies.top(brawler.pk, BOARD_CAPACITY)  # type: ignore
+        else:
+            entries = await ranking.top(BOARD_CAPACITY)
+        if not entries:
+            await interaction.followup.send("Nobody is ranked yet.")
+            return
+        discord_ids = dict(
+            await Player.filter(id__in=[x for x, _ in entries]).values_list("id", "discord_id")
+        )
+        pages = SimplePages(
+            [f"<@{discord_ids.get(x, 0)}> — {y:,} {unit}" for x, y in entries],
+            interaction=interaction,
+            per_page=10,
+        )
+        pages.embed.title = title
+        await pages.start()
@@ -1,4 +1,5 @@
 import zipfile
+from collections import defaultdict
 from io import BytesIO
 from typing import TYPE_CHECKING
 
@@ -10,6 +11,7 @@ from tortoise.exceptions import DoesNotExist
 from tortoise.expressions import Q
 
 from ballsdex.core.models import (
+    Ball,
     BallInstance,
     Block,
     DonationPolicy,
@@ -18,8 +20,18 @@ from ballsdex.core.models import (
     MentionPolicy,
 )
 from ballsdex.core.models import Player as PlayerModel
-from ballsdex.core.models import PrivacyPolicy, Trade, TradeCooldownPolicy, TradeObject, balls
+from ballsdex.core.models import (
+    PrivacyPolicy,
+    Special,
+    Trade,
+    TradeCooldownPolicy,
+    TradeObject,
+    balls,
+    bonus_stat,
+    specials,
+)
 from ballsdex.core.utils.buttons import ConfirmChoiceView
+from ballsdex.core.utils.display import display_cache
 from ballsdex.core.utils.enums import (
     DONATION_POLICY_MAP,
     FRIEND_POLICY_MAP,
@@ -28,6 +40,7 @@ from ballsdex.core.utils.enums import (
 )
 from ballsdex.core.utils.enums import TRADE_COOLDOWN_POLICY_MAP as TRADE_POLICY_MAP
 from ballsdex.core.utils.paginator import FieldPageSource, Pages
+from ballsdex.core.utils.rows import fetch_rows
 from ballsdex.settings import settings
 
 if TYPE_CHECKING:
@@ -78,7 +91,7 @@ class Player(commands.GroupCog):
             )
             return
         player.privacy_policy = PrivacyPolicy(policy.value)
-        await player.save()
+        await player.save(update_fields=("privacy_policy",))
         await interaction.response.send_message(
             f"Your privacy policy has been set to **{policy.name}**.", ephemeral=True
         )
@@ -137,7 +150,8 @@ class Player(commands.GroupCog):
         else:
             await interaction.response.send_message("Invalid input!", ephemeral=True)
             return
-        await player.save()  # do not save if the input is invalid
+        # do not save if the input is invalid
+        await player.save(update_fields=("donation_policy",))
 
     @policy.command()
     @app_commands.choices(
@@ -159,7 +173,7 @@ class Player(commands.GroupCog):
         """
         player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
         player.mention_policy = policy
-        await player.save()
+        await player.save(update_fields=("mention_policy",))
         await interaction.response.send_message(
             f"Your mention policy has been set to **{policy.name.lower()}**.", ephemeral=True
         )
@@ -182,7 +196,7 @@ class Player(commands.GroupCog):
         """
         player, _ = await PlayerModel.get_or_create(discord_id=interaction.user.id)
         player.friend_policy = policy
-        await player.save()
+        await player.save(update_fields=("friend_policy",))
         await interaction.response.send_message(
             f"Your friend request policy has been set to **{policy.name.lower()}**.",
             ephemeral=True,
@@ -499,42 +513,65 @@ async def get_items_csv(player: PlayerModel) -> BytesIO:
     """
     Get a CSV file with all items of the player.
     """
-    balls = await BallInstance.filter(player=player).prefetch_related(
-        "ball", "trade_player", "special"
+    rows = await fetch_rows(
+        BallInstance.filter(player=player),
+        "id",
+        "ball_id",
+        "catch_date",
+        "trade_player__discord_id",
+        "special_id",
+        "attack_bonus",
+        "health_bonus",
     )
-    txt = (
+    # balls and specials created after the last cache load are fetched once
+    ball_map = balls
+    if missing := {x.ball_id for x in rows} - balls.keys():
+        ball_map = {**balls, **{x.pk: x for x in await Ball.filter(id__in=missing)}}
+    special_map = specials
+    if missing := {x.special_id for x in rows if x.special_id} - specials.keys():
+        special_map = {**specials, **{x.pk: x for x in await Special.filter(id__in=missing)}}
+
+    lines = [
         f"id,hex id,{settings.collectible_name},catch date,trade_player"
         ",special,attack,attack bonus,hp,hp_bonus\n"
-    )
-    for ball in balls:
-        txt += (
-            f"{ball.id},{ball.id:0X},{ball.ball.country},{ball.catch_date},"  # type: ignore
-            f"{ball.trade_player.discord_id if ball.trade_player else 'None'},{ball.special},"
-            f"{ball.attack},{ball.attack_bonus},{ball.health},{ball.health_bonus}\n"
+    ]
+    for row in rows:
+        ball = ball_map[row.ball_id]
+        special = special_map.get(row.special_id)
+        lines.append(
+            f"{row.id},{row.id:0X},{display_cache.ball(ball).name},{row.catch_date},"
+            f"{row.trade_player__discord_id or 'None'},"
+            f"{display_cache.special(special).name if special else 'None'},"
+            f"{bonus_stat(ball.attack, row.attack_bonus)},{row.attack_bonus},"
+            f"{bonus_stat(ball.health, row.health_bonus)},{row.health_bonus}\n"
         )
-    return BytesIO(txt.encode("utf-8"))
+    return BytesIO("".join(lines).encode("utf-8"))
 
 
 async def get_trades_csv(player: PlayerModel) -> BytesIO:
     """
     Get a CSV file with all trades of the player.
     """
-    trade_history = (
-        await Trade.filter(Q(player1=player) | Q(player2=player))
-        .order_by("date")
-        .prefetch_related("player1", "player2")
+    trade_history = await fetch_rows(
+        Trade.filter(Q(player1=player) | Q(player2=player)).order_by("date"),
+        "id",
+        "date",
+        "player1_id",
+        "player2_id",
+        "player1__discord_id",
+        "player2__discord_id",
     )
-    txt = "id,date,player1,player2,player1 received,player2 received\n"
+    items: defaultdict[tuple[int, int], list[str]] = defaultdict(list)
+    for item in await TradeObject.filter(
+        trade_id__in=[x.id for x in trade_history]
+    ).prefetch_related("ballinstance"):
+        key = (item.trade_id, item.player_id)  # type: ignore
+        items[key].append(item.ballinstance.to_string())  # type: ignore
+    lines = ["id,date,player1,player2,player1 received,player2 received\n"]
     for trade in trade_history:
-        player1_items = await TradeObject.filter(
-            trade=trade, player=trade.player1
-        ).prefetch_related("ballinstance")
-        player2_items = await TradeObject.filter(
-            trade=trade, player=trade.player2
-        ).prefetch_related("ballinstance")
-        txt += (
-            f"{trade.id},{trade.date},{trade.player1.discord_id},{trade.player2.discord_id},"
-            f"{','.join([i.ballinstance.to_string() for i in player2_items])},"  # type: ignore
-            f"{','.join([i.ballinstance.to_string() for i in player1_items])}\n"  # type: ignore
+        lines.append(
+            f"{trade.id},{trade.date},{trade.player1__discord_id},{trade.player2__discord_id},"
+            f"{','.join(items[(trade.id, trade.player2_id)])},"
+            f"{','.join(items[(trade.id, trade.player1_id)])}\n"
         )
-    return BytesIO(txt.encode("utf-8"))
+    return BytesIO("".join(lines).encode("utf-8"))
@@ -9,14 +9,18 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from ballsdex.core.utils.logging import log_action
+from ballsdex.core.utils.counters import counter_buffer
+from ballsdex.core.utils.leaderboards import leaderboards
+from ballsdex.core.utils.owned_balls import owned_balls
 from tortoise.exceptions import BaseORMException, DoesNotExist
 from ballsdex.packages.admin.balls import save_file
 from ballsdex.packages.staff.cardmaker import merge_images
 from ballsdex.packages.staff.cardgenerator import CardGenerator
 # from ballsdex.packages.staff.customcard import CardConfig, draw_card
 from ballsdex.settings import settings
+from ballsdex.core.utils.players import player_cache
 from ballsdex.core.utils.transformers import BallTransform, SpecialTransform
-from ballsdex.core.models import Ball, Special, Player, BallInstance, Trade, TradeObject
+from ballsdex.core.models import Ball, Special, BallInstance, Trade, TradeObject
 
 if TYPE_CHECKING:
     from ballsdex.core.bot import BallsDexBot
@@ -207,7 +211,7 @@ class Staff(commands.GroupCog, group_name="staff"):
         amount: int,
         remove: bool | None = None
         ):
-            player, _ = await Player.get_or_create(discord_id=user.id)
+            player, _ = await player_cache.get_or_create(user.id)
             pp_emoji = interaction.client.get_emoji(1364817571819425833)
             credit_emoji = interaction.client.get_emoji(1364877745032794192)
             sd_emoji = interaction.client.get_emoji(1363188571099496699)
@@ -220,8 +224,7 @@ class Staff(commands.GroupCog, group_name="staff"):
             if remove and remove == True:
                 if currency_type.value == "powerpoints":
                     try:
-                        player.powerpoints -= amount
-                        await player.save()
+                        counter_buffer.add(player.pk, powerpoints=-amount)
                         await interaction.response.send_message(f"{interaction.user.mention} removed {amount} Power Points from {user.mention}! {pp_emoji}", ephemeral=False)
                         await log_action(f"{interaction.user.name} removed {amount} Power Points from {user.name}.", interaction.client)
                     except Exception as e:
@@ -229,8 +232,7 @@ class Staff(commands.GroupCog, group_name="staff"):
                         return
                 elif currency_type.value == "credits":
                     try:
-                        player.credits -= amount
-                        await player.save()
+                        counter_buffer.add(player.pk, credits=-amount)
                         await interaction.response.send_message(f"{interaction.user.mention} removed {amount} Credits from {user.mention}! {credit_emoji}", ephemeral=False)
                         await log_action(f"{interaction.user.name} removed {amount} Credits from {user.name}.", interaction.client)
                     except Exception as e:
@@ -238,8 +240,7 @@ class Staff(commands.GroupCog, group_name="staff"):
                         return
                 elif currency_type.value == "starrdrops":
                     try:
-                        player.sdcount -= amount
-                        await player.save()
+                        counter_buffer.add(player.pk, sdcount=-amount)
                         await interaction.response.send_message(f"{interaction.user.mention} removed {amount} Starr Drops from {user.mention}! {sd_emoji}", ephemeral=False)
                         await log_action(f"{interaction.user.name} removed {amount} Starr Drops from {user.name}.", interaction.client)
                     except Exception as e:
@@ -248,8 +249,7 @@ class Staff(commands.GroupCog, group_name="staff"):
             else:
                 if currency_type.value == "powerpoints":
                     try:
-                        player.powerpoints += amount
-                        await player.save()
+                        counter_buffer.add(player.pk, powerpoints=amount)
                         await interaction.response.send_message(f"{interaction.user.mention} gave {amount} Power Points to {user.mention}! {pp_emoji}", ephemeral=False)
                         await log_action(f"{interaction.user.name} gave {amount} Power Points to {user.name}.", interaction.client)
                     except Exception as e:
@@ -257,8 +257,7 @@ class Staff(commands.GroupCog, group_name="staff"):
                         return
                 elif currency_type.value == "credits":
                     try:
-                        player.credits += amount
-                        await player.save()
+                        counter_buffer.add(player.pk, credits=amount)
                         await interaction.response.send_message(f"{interaction.user.mention} gave {amount} Credits to {user.mention}! {credit_emoji}", ephemeral=False)
                         await log_action(f"{interaction.user.name} gave {amount} Credits to {user.name}.", interaction.client)
                     except Exception as e:
@@ -268,13 +267,12 @@ class Staff(commands.GroupCog, group_name="staff"):
                     if amount > 50:
                         await interaction.response.send_message("The amount can't exceed 50 Starr Drops!", ephemeral=True)
                         return
-                    elif amount + player.sdcount > 50:
-                        await interaction.response.send_message(f"This user has {player.sdcount} Starr Drops. The amount you tried to give will exceed the limit. {f"It is recommended to give {50-player.sdcount} Starr Drops maximum to reach the limit instead." if player.sdcount < 50 else "You can't give more drops until they uses them."}", ephemeral=True)
+                    elif amount + (sdcount := counter_buffer.value(player, "sdcount")) > 50:
+                        await interaction.response.send_message(f"This user has {sdcount} Starr Drops. The amount you tried to give will exceed the limit. {f"It is recommended to give {50-sdcount} Starr Drops maximum to reach the limit instead." if sdcount < 50 else "You can't give more drops until they uses them."}", ephemeral=True)
                         return
                     else:
                         try:
-                            player.sdcount += amount
-                            await player.save()
+                            counter_buffer.add(player.pk, sdcount=amount)
                             await interaction.response.send_message(f"{interaction.user.mention} gave {amount} Starr Drops to {user.mention}! {sd_emoji}", ephemeral=False)
                             await log_action(f"{interaction.user.name} gave {amount} Starr Drops to {user.name}.", interaction.client)
                         except Exception as e:
@@ -343,7 +341,7 @@ class Staff(commands.GroupCog, group_name="staff"):
             return
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        player, created = await Player.get_or_create(discord_id=user.id)
+        player, created = await player_cache.get_or_create(user.id)
         instance = await BallInstance.create(
             ball=countryball,
             player=player,
@@ -404,9 +402,11 @@ class Staff(commands.GroupCog, group_name="staff"):
                 f"The {settings.collectible_name} ID you gave does not exist.", ephemeral=True
             )
             return
-        player, _ = await Player.get_or_create(discord_id=user.id)
+        player, _ = await player_cache.get_or_create(user.id)
         ball.player = player
         await ball.save()
+        owned_balls.invalidate(original_player.pk)
+        leaderboards.record_transfer(ball, original_player.pk)
 
         trade = await Trade.create(player1=original_player, player2=player)
         await TradeObject.create(trade=trade, ballinstance=ball, player=original_player)
@@ -7,8 +7,10 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import Button, button
-from ballsdex.core.models import Ball, BallInstance, balls, Player
+from ballsdex.core.models import Ball, BallInstance, balls
 from ballsdex.core.customexceptions import NotAdminGuildError
+from ballsdex.core.utils.counters import counter_buffer
+from ballsdex.core.utils.players import player_cache
 from ballsdex.settings import settings
 from datetime import datetime, timedelta, timezone
 from collections import Counter
@@ -18,6 +20,79 @@ if TYPE_CHECKING:
 
 log = logging.getLogger("ballsdex.packages.starrdrop")
 
+RAW_DROP_RARITIES = [
+    ("rare", 50, 0.9),
+    ("super_rare", 28, 0.65),
+    ("epic", 15, 0.7),
+    ("mythic", 5, 0.8),
+    ("legendary", 2, 1.0),
+]
+DROP_RARITIES = [{"name": n, "weight": w, "multiplier": m} for n, w, m in RAW_DROP_RARITIES]
+DROP_RARITY_WEIGHTS = [
+    r["weight"] / sum(r["weight"] for r in DROP_RARITIES) for r in DROP_RARITIES
+]
+DROP_REWARDS = {
+    "rare": (["25pp", "100c", "rare_skin"], [33, 33, 33]),
+    "super_rare": (["50pp", "200c", "super_skin"], [33, 33, 33]),
+    "epic": (["100pp", "500c", "epic_skin"], [25, 25, 50]),
+    "mythic": (["1000c", "mythic_brawler", "mythic_skin"], [20, 40, 40]),
+    "legendary": (
+        ["legendary_brawler", "legendary_skin", "ultra_legendary", "ultimate_skin", "hypercharged_skin"],
+        [30, 45, 3, 17, 5],
+    ),
+}
+BRAWLER_REWARD_REGIMES = {
+    "mythic_brawler": {8},
+    "legendary_brawler": {16},
+    "ultra_legendary": {36}
+}
+SKIN_REWARD_REGIMES = {
+    "rare_skin": {22},
+    "super_skin": {23, 38},
+    "epic_skin": {24},
+    "mythic_skin": {39, 25},
+    "legendary_skin": {26},
+    "ultimate_skin": {37},
+    "hypercharged_skin": {40, 27}
+}
+
+
+def roll_drop() -> tuple[dict, str]:
+    """
+    Roll the rarity of a Starr Drop, then the reward it contains.
+
+    Returns
+    -------
+    tuple[dict, str]
+        The rarity entry from `DROP_RARITIES` and the reward key. Rewards ending with ``pp`` or
+        ``c`` are currencies, the others are keys of `BRAWLER_REWARD_REGIMES` or
+        `SKIN_REWARD_REGIMES`.
+    """
+    ounce = random.choices(DROP_RARITIES, weights=DROP_RARITY_WEIGHTS, k=1)[0]
+    rewards, weights = DROP_REWARDS[ounce["name"]]
+    return ounce, random.choices(rewards, weights=weights, k=1)[0]
+
+
+def pick_reward_ball(ounce: dict, reward: str) -> Ball | None:
+    """
+    Pick the ball given by a brawler or skin reward, or `None` if none is available.
+    """
+    ids = BRAWLER_REWARD_REGIMES.get(reward) or SKIN_REWARD_REGIMES.get(reward) or set()
+
+    available_balls = [
+        ball for ball in balls.values()
+        if ball.regime_id in ids and getattr(ball, "enabled", True)
+    ]
+    if not available_balls:
+        return None
+
+    base_rarity_weight = ounce["weight"]
+    rarity_weights = [
+        (ball.rarity if ball.rarity > 0 else base_rarity_weight) ** (1 / ounce["multiplier"])
+        for ball in available_balls
+    ]
+    return random.choices(available_balls, weights=rarity_weights, k=1)[0]
+
 
 class ContinueView(discord.ui.View):
     def __init__(self, author: discord.User | discord.Member):
@@ -55,24 +130,17 @@ class StarrDrop(commands.Cog):
         """
         Open one or more of your Starr Drops.
         """
-        player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        player, _ = await player_cache.get_or_create(interaction.user.id)
 
         openamount = min(10, amount)
 
-        if player.sdcount < openamount:
+        if not await counter_buffer.spend(player.pk, "sdcount", openamount):
             await interaction.response.send_message(
                 "You don't have enough Starr Drops, get them by catching Brawlers or Skins!",
                 ephemeral=True
             )
             return
 
-        raw_rarities = [
-            ("rare", 50, 0.9),
-            ("super_rare", 28, 0.65),
-            ("epic", 15, 0.7),
-            ("mythic", 5, 0.8),
-            ("legendary", 2, 1.0),
-        ]
         DROP_RARITY_EMOJIS = {
             "rare": 1330493249235714189,
             "super_rare": 1330493410884456528,
@@ -81,12 +149,6 @@ class StarrDrop(commands.Cog):
             "legendary": 1330493465221529713
         }
         DROP_RARITY_EMOJI = ""
-        rarities = [{"name": n, "weight": w, "multiplier": m} for n, w, m in raw_rarities]
-        total = sum(r["weight"] for r in rarities)
-        normalized_weights = [r["weight"] / total for r in rarities]
-
-        player.sdcount -= openamount
-        await player.save(update_fields=("sdcount",))
 
         totalcredits = 0
         totalpps = 0
@@ -96,32 +158,12 @@ class StarrDrop(commands.Cog):
             ounces = []
 
         for i in range(openamount):
-            ounce = random.choices(rarities, weights=normalized_weights, k=1)[0]
+            ounce, reward = roll_drop()
             if openamount > 1:
                 ounces.append(ounce)
 
             rarity = ounce["name"]
-            reward = None
-
-            if rarity == "rare":
-                reward = random.choices(["25pp", "100c", "rare_skin"], weights=[33, 33, 33], k=1)[0]
-                DROP_RARITY_EMOJI = interaction.client.get_emoji(DROP_RARITY_EMOJIS.get(rarity))
-            elif rarity == "super_rare":
-                reward = random.choices(["50pp", "200c", "super_skin"], weights=[33, 33, 33], k=1)[0]
-                DROP_RARITY_EMOJI = interaction.client.get_emoji(DROP_RARITY_EMOJIS.get(rarity))
-            elif rarity == "epic":
-                reward = random.choices(["100pp", "500c", "epic_skin"], weights=[25, 25, 50], k=1)[0]
-                DROP_RARITY_EMOJI = interaction.client.get_emoji(DROP_RARITY_EMOJIS.get(rarity))
-            elif rarity == "mythic":
-                reward = random.choices(["1000c", "mythic_brawler", "mythic_skin"], weights=[20, 40, 40], k=1)[0]
-                DROP_RARITY_EMOJI = interaction.client.get_emoji(DROP_RARITY_EMOJIS.get(rarity))
-            elif rarity == "legendary":
-                DROP_RARITY_EMOJI = interaction.client.get_emoji(DROP_RARITY_EMOJIS.get(rarity))
-                reward = random.choices(
-                    ["legendary_brawler", "legendary_skin", "ultra_legendary", "ultimate_skin", "hypercharged_skin"],
-                    weights=[30, 45, 3, 17, 5],
-                    k=1
-                )[0]
+            DROP_RARITY_EMOJI = interaction.client.get_emoji(DROP_RARITY_EMOJIS.get(rarity))
 
             if reward.endswith("pp") or reward.endswith("c"):
                 amount = int(reward.rstrip("pc"))
@@ -154,39 +196,11 @@ class StarrDrop(commands.Cog):
                 else:
                     totalrewards.append(f"{mj} {amount} {currency_type.replace("_", " ").title()}")
             else:
-                brawler_ids = {
-                    "mythic_brawler": {8},
-                    "legendary_brawler": {16},
-                    "ultra_legendary": {36}
-                }
-                skin_ids = {
-                    "rare_skin": {22},
-                    "super_skin": {23, 38},
-                    "epic_skin": {24},
-                    "mythic_skin": {39, 25},
-                    "legendary_skin": {26},
-                    "ultimate_skin": {37},
-                    "hypercharged_skin": {40, 27}
-                }
-
-                ids = brawler_ids.get(reward) or skin_ids.get(reward) or set()
-
-                available_balls = [
-                    ball for ball in balls.values()
-                    if ball.regime_id in ids and getattr(ball, "enabled", True)
-                ]
-
-                if not available_balls:
+                claimed_ball = pick_reward_ball(ounce, reward)
+                if not claimed_ball:
                     await interaction.followup.send("There are no brawlers available to claim at the moment.", ephemeral=True)
                     return
 
-                base_rarity_weight = ounce["weight"]
-                rarity_weights = [
-                    (ball.rarity if ball.rarity > 0 else base_rarity_weight) ** (1 / ounce["multiplier"])
-                    for ball in available_balls
-                ]
-                claimed_ball = random.choices(available_balls, weights=rarity_weights, k=1)[0]
-
                 ball_instance = await BallInstance.create(
                     ball=claimed_ball,
                     player=player,
@@ -213,12 +227,7 @@ class StarrDrop(commands.Cog):
                 else:
                     totalrewards.append(f"{self.bot.get_emoji(claimed_ball.emoji_id)} [{claimed_ball.country}](<https://brawldex.fandom.com/wiki/{claimed_ball.country.replace(" ", "_")}>)")
 
-        if totalcredits > 0:
-            player.credits += totalcredits
-        if totalpps > 0:
-            player.powerpoints += totalpps
-        if totalcredits > 0 or totalpps > 0:
-            await player.save(update_fields=("credits", "powerpoints"))
+        counter_buffer.add(player.pk, credits=totalcredits, powerpoints=totalpps)
 
         if openamount > 1:
             rarity_names = [r["name"].replace("_", " ").title() for r in ounces]
@@ -243,34 +252,32 @@ class StarrDrop(commands.Cog):
     @app_commands.guilds(*settings.admin_guild_ids)
     @app_commands.checks.cooldown(1, 86400, key=lambda i: i.user.id)
     async def claim_brawlpass_drops(self, interaction: discord.Interaction["BallsDexBot"]):
-        player, _ = await Player.get_or_create(discord_id=interaction.user.id)
+        player, _ = await player_cache.get_or_create(interaction.user.id)
         try:
             bp_type, bp_msg = await interaction.client.brawl_pass_check(interaction)
         except NotAdminGuildError as e:
             log.error("Not possible to execute this command here", exc_info=e)
             return
+        sdcount = counter_buffer.value(player, "sdcount")
         if bp_type == "Brawl Pass Plus":
-            if player.sdcount == 50:
+            if sdcount == 50:
                 await interaction.response.send_message("Your inventory is full!", ephemeral=True)
                 return
-            elif player.sdcount + 2 > 50:
-                player.sdcount += 1
-                await player.save()
+            elif sdcount + 2 > 50:
+                counter_buffer.add(player.pk, sdcount=1)
                 await interaction.response.send_message("You have Brawl Pass Plus, however, the inventory limit may exceed if 2 Starr Drops are given, so gave one Starr Drop instead.", epheremal=True)
                 log.debug(f"{bp_msg} However, 2 Starr Drops may exceed the limits, so only one Starr Drop is given instead. (User ID: {interaction.user.id})")
             else:
-                player.sdcount += 2
-                await player.save()
+                counter_buffer.add(player.pk, sdcount=2)
                 await interaction.response.send_message("Successfully claimed 2 Starr Drops since you have Brawl Pass Plus!", ephemeral=True)
                 log.debug(f"{bp_msg} 2 Starr Drops are given. (User ID: {interaction.user.id})")
                        
         elif bp_type == "Brawl Pass":
-             if player.sdcount == 50:
+             if sdcount == 50:
                 await interaction.response.send_message("Your inventory is full!", ephemeral=True)
                 return
              else:
-                player.sdcount += 1
-                await player.save()
+                counter_buffer.add(player.pk, sdcount=1)
                 await interaction.response.send_message("Successfully claimed a Starr Drop since you have Brawl Pass!", ephemeral=True)
                 log.debug(f"{bp_msg} A Starr Drop is given. (User ID: {interaction.user.id})")
 
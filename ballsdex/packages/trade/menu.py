@@ -12,6 +12,8 @@ from discord.utils import format_dt, utcnow
 from ballsdex.core.models import BallInstance, Player, Trade, TradeCooldownPolicy, TradeObject
 from ballsdex.core.utils import menus
 from ballsdex.core.utils.buttons import ConfirmChoiceView
+from ballsdex.core.utils.display import display_cache
+from ballsdex.core.utils.leaderboards import leaderboards
 from ballsdex.core.utils.paginator import Pages
 from ballsdex.packages.balls.countryballs_paginator import CountryballsViewer
 from ballsdex.packages.trade.display import fill_trade_embed_fields
@@ -378,6 +380,7 @@ class TradeMenu:
         for countryball in valid_transferable_countryballs:
             await countryball.unlock()
             await countryball.save()
+            leaderboards.record_transfer(countryball, countryball.trade_player.pk)
 
     async def confirm(self, trader: TradingUser) -> bool:
         """
@@ -451,15 +454,15 @@ class CountryballsSelector(Pages):
         for ball in balls:
             if ball.is_tradeable is False:
                 continue
-            emoji = self.bot.get_emoji(int(ball.countryball.emoji_id))
+            fragments = display_cache.ball(ball.countryball)
             favorite = f"{settings.favorited_collectible_emoji} " if ball.favorite else ""
             special = ball.special_emoji(self.bot, True)
             options.append(
                 discord.SelectOption(
-                    label=f"{favorite}{special}#{ball.pk:0X} {ball.countryball.country}",
+                    label=f"{favorite}{special}#{ball.pk:0X} {fragments.name}",
                     description=f"ATK: {ball.attack_bonus:+d}% • HP: {ball.health_bonus:+d}% • "
                     f"Caught on {ball.catch_date.strftime('%d/%m/%y %H:%M')}",
-                    emoji=emoji,
+                    emoji=fragments.emoji,
                     value=f"{ball.pk}",
                     default=ball in self.balls_selected,
                 )
@@ -62,6 +62,10 @@ class Settings:
         List of packages the bot will load upon startup
     spawn_manager: str
         Python path to a class implementing `BaseSpawnManager`, handling cooldowns and anti-cheat
+    catch_accent_insensitive: bool
+        Ignore accents when comparing the names given to catch countryballs
+    catch_typo_tolerant: bool
+        Accept names given to catch countryballs with one character wrong, missing or extra
     webhook_url: str | None
         URL of a Discord webhook for admin notifications
     client_id: str
@@ -126,6 +130,8 @@ class Settings:
     wrong_messages: list[str] = field(default_factory=list)
     spawn_messages: list[str] = field(default_factory=list)
     slow_messages: list[str] = field(default_factory=list)
+    catch_accent_insensitive: bool = False
+    catch_typo_tolerant: bool = False
 
 
 settings = Settings()
@@ -201,6 +207,8 @@ def read_settings(path: "Path"):
         settings.slow_messages = catch.get("slow_msgs") or [
             "{user} Sorry, this {collectible} was caught already!"
         ]
+        settings.catch_accent_insensitive = catch.get("accent-insensitive", False)
+        settings.catch_typo_tolerant = catch.get("typo-tolerant", False)
 
     log.info("Settings loaded.")
 
@@ -356,6 +364,12 @@ catch:
   # the message that appears when a user is to slow to catch a ball
   slow_msgs:
     - "{user} Sorry, this {collectible} was caught already!"
+
+  # ignore accents in the names given to catch, "pokemon" would match "Pokémon"
+  accent-insensitive: false
+
+  # accept names with one character wrong, missing or extra (only for names of 5+ characters)
+  typo-tolerant: false
   """  # noqa: W291
     )
 
@@ -0,0 +1,115 @@
+import asyncio
+import importlib
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Awaitable, Callable, TypeVar
+
+import pytest
+from tortoise import Tortoise
+
+from ballsdex.core.utils.owned_balls import owned_balls
+from ballsdex.core.utils.players import player_cache
+
+T = TypeVar("T")
+
+TEST_DB_URL = os.environ.get("BALLSDEXBOT_TEST_DB_URL")
+ADMIN_PANEL = Path(__file__).parent.parent / "admin_panel"
+
+# created by the migrations, not part of the models
+FUNCTIONS = (
+    "inventory_apply",
+    "inventory_track",
+    "ballinstance_sort_keys",
+    "ball_sort_keys",
+    "regime_sort_keys",
+)
+
+
+def load_migration(name: str) -> ModuleType:
+    return importlib.import_module(f"bd_models.migrations.{name}")
+
+
+def _drop_schema(cursor: Any, tables: list[str]):
+    for table in tables:
+        cursor.execute(f'DROP TABLE IF EXISTS "{table}" CASCADE')
+    for function in FUNCTIONS:
+        cursor.execute(f"DROP FUNCTION IF EXISTS {function} CASCADE")
+
+
+@pytest.fixture(scope="session")
+def django_connection():
+    """
+    The connection of the admin panel to the test database, where the tables of its models
+    and the triggers of its migrations are created for the session.
+
+    The whole migration history cannot be replayed, as the first tables were created by the
+    bot before the admin panel existed.
+    """
+    if not TEST_DB_URL:
+        pytest.skip("BALLSDEXBOT_TEST_DB_URL is not set")
+    sys.path.append(str(ADMIN_PANEL))
+    os.environ["BALLSDEXBOT_DB_URL"] = TEST_DB_URL
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "admin_panel.settings")
+
+    import django
+    from django.apps import apps
+    from django.db import connection
+
+    django.setup()
+    models = [x for x in apps.get_app_config("bd_models").get_models() if x._meta.managed]
+    tables = [x._meta.db_table for x in models]
+    with connection.cursor() as cursor:
+        _drop_schema(cursor, tables)
+    with connection.schema_editor() as editor:
+        for model in models:
+            editor.create_model(model)
+        inventory = load_migration("0013_inventorycount_inventorytotal")
+        sort_keys = load_migration("0015_ballinstance_sort_keys")
+        for statement in (
+            inventory.APPLY_FUNCTION,
+            inventory.TRACK_FUNCTION,
+            *inventory.TRIGGERS,
+            sort_keys.INSTANCE_FUNCTION,
+            sort_keys.BALL_FUNCTION,
+            sort_keys.REGIME_FUNCTION,
+            *sort_keys.TRIGGERS,
+        ):
+            editor.execute(statement)
+    yield connection
+    with connection.cursor() as cursor:
+        _drop_schema(cursor, tables)
+    connection.close()
+
+
+@pytest.fixture
+def database(django_connection: Any) -> Callable[[Callable[[], Awaitable[T]]], T]:
+    """
+    Empty the test database, and return a function running a coroutine function with Tortoise
+    connected to it.
+    """
+    from django.apps import apps
+
+    tables = ", ".join(
+        f'"{x._meta.db_table}"'
+        for x in apps.get_app_config("bd_models").get_models()
+        if x._meta.managed
+    )
+    with django_connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+    # the caches of the bot would otherwise describe the rows of the previous test
+    owned_balls.clear()
+    player_cache.clear()
+
+    def run(function: Callable[[], Awaitable[T]]) -> T:
+        async def main() -> T:
+            await Tortoise.init(db_url=TEST_DB_URL, modules={"models": ["ballsdex.core.models"]})
+            try:
+                return await function()
+            finally:
+                await Tortoise.close_connections()
+
+        return asyncio.run(main())
+
+    return run
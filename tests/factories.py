@@ -0,0 +1,39 @@
+"""
+Rows of the test database, with every required field filled.
+"""
+
+from typing import Any
+
+from ballsdex.core.models import Ball, BallInstance, Player, Regime, Special
+
+
+async def create_regime(name: str = "Rare", **kwargs: Any) -> Regime:
+    return await Regime.create(name=name, background="regime.png", **kwargs)
+
+
+async def create_ball(country: str, regime: Regime, **kwargs: Any) -> Ball:
+    values: dict[str, Any] = dict(
+        health=100,
+        attack=100,
+        rarity=1,
+        emoji_id=100000000000000000,
+        wild_card="wild.png",
+        collection_card="card.png",
+        credits="",
+        capacity_name="",
+        capacity_description="",
+    )
+    values.update(kwargs)
+    return await Ball.create(country=country, regime=regime, **values)
+
+
+async def create_special(name: str = "Shiny", **kwargs: Any) -> Special:
+    return await Special.create(name=name, rarity=0.1, **kwargs)
+
+
+async def create_player(discord_id: int, **kwargs: Any) -> Player:
+    return await Player.create(discord_id=discord_id, **kwargs)
+
+
+async def create_instance(ball: Ball, player: Player, **kwargs: Any) -> BallInstance:
+    return await BallInstance.create(ball=ball, player=player, **kwargs)
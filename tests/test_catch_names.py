@@ -0,0 +1,95 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from ballsdex.core.utils.catch_names import CatchNameIndex, normalize_name
+
+
+def make_ball(pk: int, country: str, catch_names: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(pk=pk, country=country, catch_names=catch_names, translations=None)
+
+
+def levenshtein(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def test_normalize_name():
+    assert normalize_name("  Mr.   P  ") == "mr. p"
+    assert normalize_name("El Primo’s") == "el primo's"
+    assert normalize_name("Pokémon") == "pokémon"
+    assert normalize_name("Pokémon", strip_accents=True) == "pokemon"
+
+
+def test_exact_names():
+    index = CatchNameIndex()
+    ball = make_ball(1, "El Primo", "primo;elprimo")
+    assert index.match(ball, "el primo")
+    assert index.match(ball, " PRIMO ")
+    assert index.match(ball, "elprimo")
+    assert not index.match(ball, "el prim")
+
+
+@pytest.mark.parametrize(
+    "guess",
+    [
+        "abcde",  # exact
+        "abde",  # missing character
+        "abcxde",  # extra character
+        "abxde",  # wrong character
+        "xbcde",  # wrong first character
+        "abcdx",  # wrong last character
+        "bcde",  # missing first character
+    ],
+)
+def test_one_typo_accepted(guess: str):
+    index = CatchNameIndex(typo_tolerant=True)
+    assert index.match(make_ball(1, "abcde"), guess)
+
+
+@pytest.mark.parametrize(
+    "guess",
+    [
+        "bcdef",  # shares the deletion "bcde" but at different positions
+        "badce",  # two swaps
+        "abxye",  # two wrong characters
+        "abc",  # two missing characters
+        "abcdexy",  # two extra characters
+        "edcba",
+    ],
+)
+def test_two_typos_rejected(guess: str):
+    index = CatchNameIndex(typo_tolerant=True)
+    assert not index.match(make_ball(1, "abcde"), guess)
+
+
+def test_short_names_need_exact_guesses():
+    index = CatchNameIndex(typo_tolerant=True)
+    ball = make_ball(1, "Bibi", "bea")
+    assert index.match(ball, "bibi")
+    assert not index.match(ball, "bibo")
+    assert not index.match(ball, "bia")
+
+
+def test_typos_disabled():
+    index = CatchNameIndex()
+    assert not index.match(make_ball(1, "abcde"), "abxde")
+
+
+def test_typos_match_edit_distance():
+    rng = random.Random(1234)
+    alphabet = "abc"
+    index = CatchNameIndex(typo_tolerant=True)
+    for pk in range(200):
+        names = ["".join(rng.choices(alphabet, k=rng.randint(5, 7))) for _ in range(2)]
+        ball = make_ball(pk, names[0], names[1])
+        for _ in range(20):
+            guess = "".join(rng.choices(alphabet, k=rng.randint(4, 8)))
+            expected = any(levenshtein(guess, x) <= 1 for x in names)
+            assert index.match(ball, guess) == expected, (names, guess)
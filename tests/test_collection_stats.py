@@ -0,0 +1,116 @@
+import asyncio
+import random
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Iterable
+
+import pytest
+from tortoise import Tortoise
+
+from ballsdex.core.models import BallInstance
+from ballsdex.core.utils.inventory import collection_stats
+from tests.factories import create_ball, create_player, create_regime, create_special
+
+PLAYER_ID = 100000000000000000
+
+
+def counted_stats(instances: Iterable[BallInstance]) -> tuple[int, int, dict[int, int]]:
+    """
+    The counting /balls stats did in Python before, on the prefetched instances.
+    """
+    instances = list(instances)
+    specials: defaultdict[int, int] = defaultdict(int)
+    for instance in instances:
+        if instance.special:
+            specials[instance.special.pk] += 1
+    traded = len([x for x in instances if x.trade_player])
+    return len(instances), traded, dict(specials)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_collection_stats_match_the_counted_instances(database, seed: int):
+    rng = random.Random(seed)
+
+    async def run():
+        regime = await create_regime()
+        balls = [await create_ball(f"Ball {i}", regime) for i in range(4)]
+        specials = [await create_special(f"Special {i}") for i in range(3)]
+        players = [await create_player(PLAYER_ID + i) for i in range(3)]
+        await BallInstance.bulk_create(
+            [
+                BallInstance(
+                    ball=rng.choice(balls),
+                    player=rng.choice(players),
+                    trade_player=rng.choice([None, None, *players]),
+                    special=rng.choice([None, None, None, *specials]),
+                )
+                for _ in range(200)
+            ]
+        )
+
+        results = []
+        for player in players:
+            for ball in [None, *balls]:
+                query = BallInstance.filter(player=player).prefetch_related(
+                    "player", "trade_player", "special"
+                )
+                if ball:
+                    query = query.filter(ball=ball)
+                expected = counted_stats(await query)
+                actual = await collection_stats(player.pk, ball_id=ball.pk if ball else None)
+                results.append((expected, actual))
+        # a player without instances
+        empty = await create_player(PLAYER_ID + 10)
+        results.append(((0, 0, {}), await collection_stats(empty.pk)))
+        return results
+
+    for expected, actual in database(run):
+        assert actual == expected
+
+
+class GroupingConnection:
+    """
+    Answers the collection query from fixture instances, grouped by special like the database.
+    """
+
+    def __init__(self, instances: list[SimpleNamespace]):
+        self.instances = instances
+        self.queries: list[tuple[str, list]] = []
+
+    async def execute_query(self, query: str, values: list):
+        self.queries.append((query, values))
+        player_id, *ball_id = values
+        groups: dict[int | None, dict] = {}
+        for instance in self.instances:
+            if instance.player_id != player_id or (ball_id and instance.ball_id != ball_id[0]):
+                continue
+            special_id = instance.special.pk if instance.special else None
+            row = groups.setdefault(
+                special_id, {"special_id": special_id, "count": 0, "traded": 0}
+            )
+            row["count"] += 1
+            row["traded"] += instance.trade_player is not None
+        return len(groups), list(groups.values())
+
+
+@pytest.mark.parametrize("ball_id", [None, 1])
+def test_collection_stats_rows(monkeypatch: pytest.MonkeyPatch, ball_id: int | None):
+    rng = random.Random(0)
+    instances = [
+        SimpleNamespace(
+            player_id=rng.choice([1, 2]),
+            ball_id=rng.choice([1, 2]),
+            trade_player=rng.choice([None, SimpleNamespace(pk=3)]),
+            special=rng.choice([None, None, SimpleNamespace(pk=1), SimpleNamespace(pk=2)]),
+        )
+        for _ in range(100)
+    ]
+    connection = GroupingConnection(instances)
+    monkeypatch.setattr(Tortoise, "get_connection", lambda name: connection)
+
+    stats = asyncio.run(collection_stats(1, ball_id=ball_id))
+    owned = [x for x in instances if x.player_id == 1 and ball_id in (None, x.ball_id)]
+    assert stats == counted_stats(owned)  # type: ignore
+    query, values = connection.queries[0]
+    assert values == ([1] if ball_id is None else [1, ball_id])
+    assert ("ball_id = $2" in query) == (ball_id is not None)
@@ -0,0 +1,331 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import discord
+import pytest
+from tortoise import Tortoise
+
+from ballsdex.core.models import (
+    Ball,
+    BallInstance,
+    BrawlerTrophies,
+    DonationPolicy,
+    FriendPolicy,
+    MentionPolicy,
+    Player,
+    PrivacyPolicy,
+    Regime,
+    Spawn,
+    TradeCooldownPolicy,
+    balls,
+    catch_day,
+    regimes,
+)
+from ballsdex.core.utils.players import PlayerIdentity
+from ballsdex.packages.countryballs import countryball
+from ballsdex.packages.countryballs.countryball import AlreadyCaughtError, BallSpawnView
+from tests.factories import create_ball, create_instance, create_player, create_regime
+
+PLAYER_ID = 100000000000000000
+
+
+def make_view(spawn_id: int | None) -> BallSpawnView:
+    view = BallSpawnView(None, None)  # type: ignore
+    view.catch_button = discord.ui.Button()
+    view.spawn_id = spawn_id
+    return view
+
+
+def test_claim_once():
+    async def run():
+        view = make_view(1)
+        assert view.claim()
+        assert not view.claim()
+        assert view.catch_button.disabled
+        view.release()
+        assert 1 not in countryball.catching
+        # the view itself stays caught
+        assert not view.claim()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("views", [1, 5])
+def test_concurrent_catches_create_one_instance(views: int):
+    async def run():
+        created: list[int] = []
+
+        async def write_catch(user, *, player, guild):
+            # yield to the other catches while the instance is being written
+            for _ in range(3):
+                await asyncio.sleep(0)
+            created.append(user)
+            return user, True, 1, False
+
+        # several views of the same spawn, like the restored views of a restarted process
+        spawn_views = [make_view(42) for _ in range(views)]
+        for view in spawn_views:
+            view._catch_ball = write_catch  # type: ignore
+
+        results = await asyncio.gather(
+            *(
+                spawn_views[i % views].catch_ball(i, player=None, guild=None)  # type: ignore
+                for i in range(50)
+            ),
+            return_exceptions=True,
+        )
+        assert len(created) == 1
+        assert sum(not isinstance(x, AlreadyCaughtError) for x in results) == 1
+        assert 42 not in countryball.catching
+
+    asyncio.run(run())
+
+
+def test_failed_catch_releases_the_spawn():
+    async def run():
+        async def fail(user, *, player, guild):
+            raise RuntimeError
+
+        view = make_view(7)
+        view._catch_ball = fail  # type: ignore
+        with pytest.raises(RuntimeError):
+            await view.catch_ball(None, player=None, guild=None)  # type: ignore
+        assert 7 not in countryball.catching
+
+    asyncio.run(run())
+
+
+class CountingConnection:
+    """
+    Stands for the transaction connection and records the statements of a catch.
+    """
+
+    def __init__(self, row: dict):
+        self.row = row
+        self.queries: list[str] = []
+
+    async def execute_query(self, query: str, values: list | None = None):
+        self.queries.append(query)
+        return 1, [self.row]
+
+
+def catch_with(monkeypatch: pytest.MonkeyPatch, row: dict) -> tuple[CountingConnection, tuple]:
+    """
+    Catch a spawn of a ball through a stubbed connection returning this row, and return the
+    connection with the result of the catch.
+    """
+    connection = CountingConnection(row)
+
+    @asynccontextmanager
+    async def transaction():
+        yield connection
+
+    monkeypatch.setattr(countryball, "in_transaction", transaction)
+    monkeypatch.setattr(countryball.leaderboards, "record_catch", lambda *args: None)
+
+    async def run():
+        await Tortoise.init(
+            db_url="sqlite://:memory:", modules={"models": ["ballsdex.core.models"]}
+        )
+        try:
+            regime = Regime(id=1, name="Rare")
+            monkeypatch.setitem(regimes, 1, regime)
+            view = make_view(3)
+            view.model = Ball(id=5, country="Shelly", regime_id=1)
+            view.model._saved_in_db = True
+            view.bot = SimpleNamespace(catch_log=set())
+            view.message = SimpleNamespace(created_at=datetime.now(timezone.utc))
+            view.get_random_special = lambda: None  # type: ignore
+            player = PlayerIdentity(
+                pk=1,
+                discord_id=123,
+                donation_policy=DonationPolicy.ALWAYS_ACCEPT,
+                privacy_policy=PrivacyPolicy.ALLOW,
+                mention_policy=MentionPolicy.ALLOW,
+                friend_policy=FriendPolicy.ALLOW,
+                trade_cooldown_policy=TradeCooldownPolicy.COOLDOWN,
+            )
+            user = SimpleNamespace(id=123)
+            return await view.catch_ball(user, player=player, guild=None)  # type: ignore
+        finally:
+            await Tortoise.close_connections()
+
+    return connection, asyncio.run(run())
+
+
+CAUGHT_ROW = {
+    "id": 10,
+    "player_id": 1,
+    "dailycaught": 4,
+    "sdcount": 2,
+    "trophies": 30,
+    "fullsd": False,
+    "is_new": True,
+}
+
+
+def test_catch_is_a_single_statement(monkeypatch: pytest.MonkeyPatch):
+    connection, (instance, is_new, dailycaught, fullsd) = catch_with(monkeypatch, CAUGHT_ROW)
+    assert connection.queries == [countryball.CATCH_QUERY]
+    # one statement, not a script
+    assert ";" not in countryball.CATCH_QUERY
+    assert (instance.pk, instance.ball_id, instance.player_id) == (10, 5, 1)
+    assert (is_new, dailycaught, fullsd) == (True, 4, False)
+
+
+def test_catch_of_a_caught_spawn(monkeypatch: pytest.MonkeyPatch):
+    with pytest.raises(AlreadyCaughtError):
+        catch_with(monkeypatch, {**CAUGHT_ROW, "id": None, "player_id": None})
+
+
+class NoClaims(set):
+    """
+    Replaces the spawns claimed by this process, so that every catch reaches the database as if
+    it came from another process.
+    """
+
+    def add(self, element):
+        pass
+
+
+@pytest.fixture
+def catch_setup(monkeypatch: pytest.MonkeyPatch):
+    """
+    Return a coroutine function creating a tracked ball and its regime in the test database,
+    registered in the caches of the bot. Every catch earns 7 trophies.
+    """
+    monkeypatch.setattr(countryball, "TROPHY_OPTIONS", [7])
+    monkeypatch.setattr(countryball, "TROPHY_WEIGHTS", [1])
+    monkeypatch.setattr(countryball.leaderboards, "record_catch", lambda *args: None)
+    monkeypatch.setattr(countryball.leaderboards, "record_transfer", lambda *args: None)
+    monkeypatch.setattr(countryball.leaderboards.trophies, "set", lambda *args: None)
+
+    async def setup() -> Ball:
+        regime = await create_regime()
+        monkeypatch.setitem(regimes, regime.pk, regime)
+        ball = await create_ball("Shelly", regime)
+        monkeypatch.setitem(balls, ball.pk, ball)
+        return ball
+
+    return setup
+
+
+async def spawn_of(ball: Ball, **kwargs) -> Spawn:
+    return await Spawn.create(
+        ball=ball, expires_at=datetime.now(timezone.utc) + timedelta(minutes=5), **kwargs
+    )
+
+
+async def view_of(spawn: Spawn) -> BallSpawnView:
+    """
+    The view handling an interaction with this spawn, rebuilt from its saved state.
+    """
+    state = await Spawn.get(pk=spawn.pk).prefetch_related("ballinstance__player")
+    bot = SimpleNamespace(catch_log=set())
+    message = SimpleNamespace(created_at=datetime.now(timezone.utc), content="")
+    view = BallSpawnView.from_state(bot, state, message)  # type: ignore
+    view.catch_button = discord.ui.Button()
+    view.get_random_special = lambda: None  # type: ignore
+    return view
+
+
+async def catch(spawn: Spawn, player: Player) -> tuple[BallInstance, bool, int, bool]:
+    view = await view_of(spawn)
+    user = SimpleNamespace(id=player.discord_id)
+    return await view.catch_ball(
+        user, player=PlayerIdentity.from_player(player), guild=None  # type: ignore
+    )
+
+
+def test_catch_writes_the_instance_and_counters(database, catch_setup):
+    async def run():
+        ball = await catch_setup()
+        # last counted on a previous catch day
+        player = await create_player(
+            PLAYER_ID,
+            dailycaught=5,
+            dailycaught_day=catch_day() - timedelta(days=1),
+            sdcount=2,
+            trophies=100,
+        )
+        results = []
+        for _ in range(2):
+            spawn = await spawn_of(ball)
+            instance, is_new, dailycaught, fullsd = await catch(spawn, player)
+            await player.refresh_from_db()
+            await spawn.refresh_from_db()
+            saved = await BallInstance.get(pk=instance.pk)
+            results.append(
+                (
+                    (saved.ball_id, saved.player_id, saved.spawn_id)
+                    == (ball.pk, player.pk, spawn.pk),
+                    spawn.caught,
+                    is_new,
+                    dailycaught,
+                    fullsd,
+                    (player.dailycaught, player.dailycaught_day, player.sdcount, player.trophies),
+                    await BrawlerTrophies.filter(player=player).values_list("ball_id", "trophies"),
+                )
+            )
+        return results, await BallInstance.all().count()
+
+    (first, second), instances = database(run)
+    today = catch_day()
+    assert first == (True, True, True, 1, False, (1, today, 3, 107), [(1, 7)])
+    assert second == (True, True, False, 2, False, (2, today, 3, 114), [(1, 14)])
+    assert instances == 2
+
+
+def test_catch_of_a_transferred_instance_is_counted(database, catch_setup):
+    async def run():
+        ball = await catch_setup()
+        owner = await create_player(PLAYER_ID)
+        catcher = await create_player(PLAYER_ID + 1)
+        instance = await create_instance(ball, owner)
+        spawn = await spawn_of(ball, ballinstance=instance)
+        result = await catch(spawn, catcher)
+        await catcher.refresh_from_db()
+        await instance.refresh_from_db()
+        await spawn.refresh_from_db()
+        return (
+            result[1:],
+            (instance.player_id, instance.trade_player_id),
+            spawn.caught,
+            (catcher.dailycaught, catcher.sdcount, catcher.trophies),
+            await BrawlerTrophies.filter(player=catcher).values_list("ball_id", "trophies"),
+            await BallInstance.all().count(),
+        )
+
+    assert database(run) == ((True, 1, False), (2, 1), True, (1, 1, 7), [(1, 7)], 1)
+
+
+def test_catches_from_several_processes_create_one_instance(
+    database, catch_setup, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(countryball, "catching", NoClaims())
+
+    async def run():
+        ball = await catch_setup()
+        players = [await create_player(PLAYER_ID + i) for i in range(2)]
+        spawn = await spawn_of(ball)
+        # a view per process, built from the same spawn
+        views = [await view_of(spawn) for _ in players]
+        results = await asyncio.gather(
+            *(
+                view.catch_ball(
+                    SimpleNamespace(id=player.discord_id),  # type: ignore
+                    player=PlayerIdentity.from_player(player),
+                    guild=None,
+                )
+                for view, player in zip(views, players)
+            ),
+            return_exceptions=True,
+        )
+        return results, await BallInstance.filter(spawn_id=spawn.pk).count()
+
+    results, instances = database(run)
+    assert instances == 1
+    assert sum(isinstance(x, AlreadyCaughtError) for x in results) == 1
+    assert sum(isinstance(x, tuple) for x in results) == 1
@@ -0,0 +1,181 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from tortoise import Tortoise
+
+from ballsdex.core.models import Ball, BallInstance, Player, Spawn, Trade, TradeObject, regimes
+from ballsdex.core.utils.inventory import (
+    ball_counts,
+    inventory_totals,
+    rebuild_inventory,
+    verify_inventory,
+)
+from ballsdex.core.utils.leaderboards import leaderboards
+from ballsdex.core.utils.players import PlayerIdentity
+from ballsdex.packages.countryballs.countryball import BallSpawnView
+from ballsdex.packages.trade.menu import TradeMenu
+from tests.factories import (
+    create_ball,
+    create_instance,
+    create_player,
+    create_regime,
+    create_special,
+)
+
+PLAYER_ID = 100000000000000000
+
+
+@pytest.fixture(autouse=True)
+def no_leaderboards(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(leaderboards, "record_catch", lambda *args: None)
+    monkeypatch.setattr(leaderboards, "record_transfer", lambda *args: None)
+
+
+async def setup(monkeypatch: pytest.MonkeyPatch) -> tuple[list[Ball], list[Player]]:
+    regime = await create_regime()
+    monkeypatch.setitem(regimes, regime.pk, regime)
+    balls = [await create_ball(x, regime) for x in ("Shelly", "Colt", "Bull")]
+    players = [await create_player(PLAYER_ID + i) for i in range(3)]
+    return balls, players
+
+
+async def catch(ball: Ball, player: Player, spawn_id: int, **kwargs) -> BallInstance:
+    view = BallSpawnView(SimpleNamespace(catch_log=set()), ball)  # type: ignore
+    view.message = SimpleNamespace(created_at=datetime.now(timezone.utc))  # type: ignore
+    view.spawn_id = spawn_id
+    for name, value in kwargs.items():
+        setattr(view, name, value)
+    view.get_random_special = lambda: None  # type: ignore
+    identity = PlayerIdentity.from_player(player)
+    user = SimpleNamespace(id=player.discord_id)
+    instance, *_ = await view._catch_ball(user, player=identity, guild=None)  # type: ignore
+    return instance
+
+
+def test_catch(database, monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        balls, players = await setup(monkeypatch)
+        special = await create_special()
+        await catch(balls[0], players[0], 1)
+        await catch(balls[0], players[0], 2, special=special)
+        await catch(balls[1], players[1], 3)
+        return (
+            await verify_inventory(),
+            await inventory_totals(players[0].pk),
+            await ball_counts(players[0].pk),
+        )
+
+    assert database(run) == ([], (2, 1), {1: 2})
+
+
+def test_trade(database, monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        balls, players = await setup(monkeypatch)
+        given = [await create_instance(x, players[0]) for x in balls[:2]]
+        received = [await create_instance(balls[2], players[1])]
+        await create_instance(balls[2], players[0])
+
+        menu = TradeMenu.__new__(TradeMenu)
+        menu.trader1 = SimpleNamespace(player=players[0], proposal=given)  # type: ignore
+        menu.trader2 = SimpleNamespace(player=players[1], proposal=received)  # type: ignore
+        for instance in given + received:
+            await instance.fetch_related("player")
+        await menu.perform_trade()
+        return (
+            await verify_inventory(),
+            await ball_counts(players[0].pk),
+            await ball_counts(players[1].pk),
+        )
+
+    assert database(run) == ([], {3: 2}, {1: 1, 2: 1})
+
+
+def test_donate(database, monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        balls, players = await setup(monkeypatch)
+        instance = await create_instance(balls[0], players[0], favorite=True)
+        # as done by /balls give
+        instance.player = players[1]
+        instance.trade_player = players[0]
+        instance.favorite = False
+        await instance.save()
+        trade = await Trade.create(player1=players[0], player2=players[1])
+        await TradeObject.create(trade=trade, ballinstance=instance, player=players[0])
+        return (
+            await verify_inventory(),
+            await inventory_totals(players[0].pk),
+            await inventory_totals(players[1].pk),
+        )
+
+    assert database(run) == ([], (0, 0), (1, 0))
+
+
+def test_spawn_of_an_instance(database, monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        balls, players = await setup(monkeypatch)
+        instance = await create_instance(balls[0], players[0])
+        await instance.fetch_related("player")
+        spawn = await Spawn.create(
+            ball=balls[0],
+            ballinstance=instance,
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=5),
+        )
+        await catch(balls[0], players[1], spawn.pk, ballinstance=instance)
+        return await verify_inventory(), await ball_counts(players[1].pk)
+
+    assert database(run) == ([], {1: 1})
+
+
+def test_craft(database, monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        balls, players = await setup(monkeypatch)
+        special = await create_special()
+        # the bot player receives the instances consumed by the craft
+        bot = players[2]
+        selected = [await create_instance(balls[0], players[0]) for _ in range(3)]
+        # as done by CraftingSession.craft
+        for instance in selected[1:]:
+            instance.trade_player_id = instance.player_id
+            instance.player_id = bot.pk
+            await instance.save()
+        selected[0].special_id = special.pk
+        await selected[0].save()
+        return (
+            await verify_inventory(),
+            await inventory_totals(players[0].pk),
+            await inventory_totals(bot.pk),
+        )
+
+    assert database(run) == ([], (1, 1), (2, 0))
+
+
+def test_delete(database, monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        balls, players = await setup(monkeypatch)
+        instances = [await create_instance(x, players[0]) for x in balls]
+        await create_instance(balls[0], players[1])
+        await instances[0].delete()
+        await BallInstance.filter(player_id=players[0].pk, ball_id=balls[1].pk).delete()
+        first = await verify_inventory(), await ball_counts(players[0].pk)
+        # everything a player owns at once
+        await BallInstance.filter(player_id=players[1].pk).delete()
+        return first, await verify_inventory(), await inventory_totals(players[1].pk)
+
+    assert database(run) == (([], {3: 1}), [], (0, 0))
+
+
+def test_rebuild(database, monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        balls, players = await setup(monkeypatch)
+        await create_instance(balls[0], players[0])
+        await create_instance(balls[1], players[1])
+        connection = Tortoise.get_connection("default")
+        await connection.execute_query(
+            "UPDATE inventorycount SET count = 5 WHERE player_id = $1", [players[0].pk]
+        )
+        broken = await verify_inventory()
+        await rebuild_inventory(players[0].pk)
+        return broken == [players[0].pk], await verify_inventory()
+
+    assert database(run) == (True, [])
@@ -0,0 +1,112 @@
+import asyncio
+import random
+
+import pytest
+
+from ballsdex.core.utils.leaderboards import Board
+
+
+class Ranking:
+    """
+    The exact scores of every player, ranked like the queries of the leaderboards.
+    """
+
+    def __init__(self):
+        self.scores: dict[int, int] = {}
+
+    def rows(self) -> list[tuple[int, int]]:
+        return sorted(
+            ((x, y) for x, y in self.scores.items() if y > 0), key=lambda x: (-x[1], x[0])
+        )
+
+    async def query(self, limit: int) -> list[tuple[int, int]]:
+        return self.rows()[:limit]
+
+
+def check(board: Board, ranking: Ranking):
+    # every player scoring more than the ceiling is on the board with its exact score
+    expected = [x for x in ranking.rows() if x[1] > board.ceiling]
+    assert board.ranking == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_board_matches_the_full_ranking(seed: int):
+    rng = random.Random(seed)
+    ranking = Ranking()
+    board = Board(ranking.query, capacity=5)
+
+    async def run():
+        await board.reconcile()
+        for _ in range(500):
+            player_id = rng.randrange(30)
+            score = ranking.scores.get(player_id, 0)
+            action = rng.random()
+            if action < 0.3:
+                score = rng.randrange(50)
+                ranking.scores[player_id] = score
+                board.set(player_id, score)
+            elif action < 0.9:
+                delta = rng.randint(-min(score, 5), 5)
+                ranking.scores[player_id] = score + delta
+                board.add(player_id, delta)
+            elif action < 0.97:
+                offset = rng.randrange(5)
+                page = await board.top(rng.randint(1, 5), offset)
+                assert page == ranking.rows()[offset : offset + len(page)]
+            else:
+                await board.reconcile()
+                assert board.ranking == ranking.rows()[: len(board.ranking)]
+            check(board, ranking)
+            assert await board.verify()
+
+    asyncio.run(run())
+
+
+def test_reconcile_keeps_the_top_rows():
+    ranking = Ranking()
+    ranking.scores = {1: 10, 2: 30, 3: 20, 4: 5}
+    board = Board(ranking.query, capacity=2)
+    asyncio.run(board.reconcile())
+    assert board.scores == {2: 30, 3: 20}
+    assert board.floor == 10
+    assert board.ranking == [(2, 30), (3, 20)]
+
+
+def test_bounds_hide_uncertain_entries():
+    ranking = Ranking()
+    ranking.scores = {1: 10, 2: 30, 3: 20, 4: 5}
+    board = Board(ranking.query, capacity=2)
+    asyncio.run(board.reconcile())
+    # player 4 may now score anything up to floor + 15, above player 3
+    board.add(4, 15)
+    assert board.ceiling == 25
+    assert board.ranking == [(2, 30)]
+    assert board.dirty
+    # known exactly again
+    board.set(4, 20)
+    assert board.ceiling == 20
+    # player 3 was evicted for player 4, it may still score as much
+    assert board.ranking == [(2, 30)]
+
+
+def test_lowered_bound_reveals_entries():
+    ranking = Ranking()
+    ranking.scores = {1: 10, 2: 30, 3: 20, 4: 5}
+    board = Board(ranking.query, capacity=2)
+    asyncio.run(board.reconcile())
+    board.add(4, 15)
+    assert board.ranking == [(2, 30)]
+    board.add(4, -15)
+    assert board.ceiling == 10
+    assert board.ranking == [(2, 30), (3, 20)]
+
+
+def test_eviction_bounds_the_evicted_player():
+    board = Board(Ranking().query, capacity=2)
+    board.set(1, 10)
+    board.set(2, 20)
+    board.set(3, 30)
+    assert board.scores == {2: 20, 3: 30}
+    assert board.bounds == {1: 10}
+    assert board.ceiling == 10
+    assert board.ranking == [(3, 30), (2, 20)]
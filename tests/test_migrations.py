@@ -0,0 +1,35 @@
+from typing import Any
+
+# differences left from the tables created by the bot before the admin panel existed
+PREVIOUS_DIFFERENCES = {
+    ("AlterModelOptions", "ball", None),
+    ("AlterModelOptions", "ballinstance", None),
+    ("AddField", "player", "credits"),
+    ("AddField", "player", "dailycaught"),
+    ("AddField", "player", "powerpoints"),
+    ("AddField", "player", "sdcount"),
+    ("AddField", "player", "trophies"),
+    ("AlterField", "ball", "country"),
+    ("AlterField", "ball", "credits"),
+    ("AlterField", "special", "catch_phrase"),
+}
+
+
+def test_migrations_describe_the_models(django_connection: Any):
+    from django.apps import apps
+    from django.db.migrations.autodetector import MigrationAutodetector
+    from django.db.migrations.loader import MigrationLoader
+    from django.db.migrations.state import ProjectState
+
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    changes = MigrationAutodetector(loader.project_state(), ProjectState.from_apps(apps)).changes(
+        graph=loader.graph
+    )
+    differences = set()
+    for migration in changes.get("bd_models", []):
+        for operation in migration.operations:
+            if hasattr(operation, "model_name"):
+                differences.add((type(operation).__name__, operation.model_name, operation.name))
+            else:
+                differences.add((type(operation).__name__, operation.name, None))
+    assert differences <= PREVIOUS_DIFFERENCES
@@ -0,0 +1,128 @@
+import asyncio
+import random
+
+import pytest
+
+from ballsdex.core.models import BallInstance
+from ballsdex.core.utils import owned_balls as owned_balls_module
+from ballsdex.core.utils.owned_balls import OwnedBallsCache, ids_to_mask, mask_to_ids, owned_balls
+from tests.factories import create_ball, create_instance, create_player, create_regime
+
+PLAYER_ID = 100000000000000000
+
+
+def test_mask_round_trip():
+    ball_ids = {1, 2, 63, 64, 1000}
+    assert mask_to_ids(ids_to_mask(ball_ids)) == ball_ids
+    assert ids_to_mask([]) == 0
+    assert mask_to_ids(0) == set()
+
+
+class SlowInventory:
+    """
+    Stands for `InventoryCount`, its queries only return once released.
+    """
+
+    def __init__(self, ball_ids: list[int]):
+        self.ball_ids = ball_ids
+        self.released = asyncio.Event()
+        self.queries = 0
+
+    def filter(self, **kwargs):
+        return self
+
+    async def _values(self) -> list[int]:
+        self.queries += 1
+        await self.released.wait()
+        return self.ball_ids
+
+    def values_list(self, *fields, flat: bool = False):
+        return self._values()
+
+
+async def start_loads(
+    monkeypatch: pytest.MonkeyPatch, cache: OwnedBallsCache, loads: int = 1
+) -> tuple[SlowInventory, list[asyncio.Task]]:
+    inventory = SlowInventory([1, 2])
+    monkeypatch.setattr(owned_balls_module, "InventoryCount", inventory)
+    tasks = [asyncio.create_task(cache.load(1)) for _ in range(loads)]
+    while inventory.queries < loads:
+        await asyncio.sleep(0)
+    return inventory, tasks
+
+
+def test_add_during_a_load(monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        cache = OwnedBallsCache()
+        inventory, tasks = await start_loads(monkeypatch, cache, loads=2)
+        # caught after the inventory was read
+        cache.add(1, 5)
+        cache.add(2, 6)
+        inventory.released.set()
+        masks = await asyncio.gather(*tasks)
+        return masks, cache.cache.get(1), cache.cache.get(2), cache.loading
+
+    masks, cached, other, loading = asyncio.run(run())
+    assert masks == [ids_to_mask([1, 2, 5])] * 2
+    assert cached == ids_to_mask([1, 2, 5])
+    assert other is None
+    assert loading == {}
+
+
+def test_invalidate_during_a_load(monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        cache = OwnedBallsCache()
+        inventory, (task,) = await start_loads(monkeypatch, cache)
+        # traded away after the inventory was read, the loaded mask may be outdated
+        cache.invalidate(1)
+        inventory.released.set()
+        return await task, cache.cache.get(1)
+
+    mask, cached = asyncio.run(run())
+    assert mask == ids_to_mask([1, 2])
+    assert cached is None
+
+
+def test_failed_load(monkeypatch: pytest.MonkeyPatch):
+    async def run():
+        cache = OwnedBallsCache()
+        inventory, (task,) = await start_loads(monkeypatch, cache)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return cache.cache.get(1), cache.loading
+
+    assert asyncio.run(run()) == (None, {})
+
+
+def test_masks_match_the_inventory(database):
+    rng = random.Random(0)
+
+    async def run():
+        regime = await create_regime()
+        balls = [await create_ball(f"Ball {i}", regime) for i in range(6)]
+        players = [await create_player(PLAYER_ID + i) for i in range(4)]
+        instances: list[BallInstance] = []
+        for _ in range(300):
+            action = rng.random()
+            if action < 0.4 or not instances:
+                player = rng.choice(players)
+                instances.append(await create_instance(rng.choice(balls), player))
+            elif action < 0.7:
+                instance = rng.choice(instances)
+                instance.trade_player_id = instance.player_id
+                instance.player_id = rng.choice(players).pk
+                await instance.save()
+            elif action < 0.85:
+                instance = instances.pop(rng.randrange(len(instances)))
+                await instance.delete()
+            else:
+                player = rng.choice(players)
+                await owned_balls.get(player.pk)
+            assert await owned_balls.check() == []
+        return [await owned_balls.ball_ids(x.pk) for x in players], [
+            {x.ball_id for x in instances if x.player_id == player.pk} for player in players
+        ]
+
+    masks, expected = database(run)
+    assert masks == expected
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+from ballsdex.core.models import BallInstance, Trade
+from ballsdex.core.utils.rows import fetch_rows, row_type
+from tests.factories import create_ball, create_instance, create_player, create_regime
+
+PLAYER_ID = 100000000000000000
+
+
+def test_row_type_is_created_once():
+    row = row_type(BallInstance, ("id", "ball_id"))
+    assert row is row_type(BallInstance, ("id", "ball_id"))
+    assert row is not row_type(BallInstance, ("ball_id", "id"))
+    assert row.__name__ == "BallInstanceRow"
+    assert row._fields == ("id", "ball_id")
+
+
+def test_fetch_rows_like_models(database):
+    fields = (
+        "id",
+        "ball_id",
+        "catch_date",
+        "trade_player__discord_id",
+        "attack_bonus",
+        "health_bonus",
+    )
+
+    async def run():
+        regime = await create_regime()
+        balls = [await create_ball(x, regime) for x in ("Shelly", "Colt")]
+        player, other = [await create_player(PLAYER_ID + i) for i in range(2)]
+        for i in range(10):
+            await create_instance(
+                balls[i % 2],
+                player,
+                trade_player=other if i % 3 == 0 else None,
+                attack_bonus=i,
+                health_bonus=-i,
+                catch_date=datetime(2026, 1, i + 1, tzinfo=timezone.utc),
+            )
+        await create_instance(balls[0], other)
+        queryset = BallInstance.filter(player=player).order_by("-id")
+        rows = await fetch_rows(queryset, *fields)
+        models = await queryset.prefetch_related("trade_player")
+        trades = await fetch_rows(Trade.all(), "id")
+        return rows, models, trades
+
+    rows, models, trades = database(run)
+    assert trades == []
+    assert [type(x) for x in rows] == [row_type(BallInstance, fields)] * len(models)
+    assert [tuple(x) for x in rows] == [
+        (
+            x.id,
+            x.ball_id,
+            x.catch_date,
+            x.trade_player.discord_id if x.trade_player else None,
+            x.attack_bonus,
+            x.health_bonus,
+        )
+        for x in models
+    ]
+    assert rows[0].trade_player__discord_id == PLAYER_ID + 1
+    assert rows[0].id > rows[-1].id
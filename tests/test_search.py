@@ -0,0 +1,228 @@
+import random
+import string
+from types import SimpleNamespace
+
+import pytest
+from tortoise.expressions import RawSQL
+
+from ballsdex.core.models import Ball
+from ballsdex.core.utils.search import (
+    MAX_INSTANCE_ID,
+    AutocompleteSessions,
+    BallSearchIndex,
+    hex_id_ranges,
+    normalize_query,
+)
+from tests.factories import create_ball, create_regime
+
+ALPHABET = string.ascii_lowercase + "  '-"
+
+
+def make_ball(pk: int, country: str, catch_names: str | None, translations: str | None):
+    return SimpleNamespace(
+        pk=pk, country=country, catch_names=catch_names, translations=translations
+    )
+
+
+def searched_text(ball) -> str:
+    """
+    The text of a ball the autocompletion used to match in the database, without the ID.
+    """
+    return f"{ball.country} {ball.catch_names or ''} {ball.translations or ''}"
+
+
+def matched_before(balls, value: str) -> set[int]:
+    """
+    The balls the previous ``ILIKE`` filter matched, for queries without accents.
+    """
+    value = value.replace(".", "").lower()
+    return {x.pk for x in balls if value in searched_text(x).lower()}
+
+
+def random_words(rng: random.Random) -> str:
+    return " ".join(
+        "".join(rng.choices(string.ascii_letters, k=rng.randint(2, 8)))
+        for _ in range(rng.randint(1, 3))
+    )
+
+
+def random_balls(rng: random.Random, count: int = 50):
+    return [
+        make_ball(
+            i,
+            random_words(rng),
+            ";".join(random_words(rng) for _ in range(rng.randint(1, 3))),
+            random_words(rng),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def random_query(rng: random.Random, balls) -> str:
+    if rng.random() < 0.3:
+        return "".join(rng.choices(ALPHABET, k=rng.randint(1, 3)))
+    text = searched_text(rng.choice(balls))
+    start = rng.randrange(len(text))
+    query = text[start : start + rng.randint(1, 8)]
+    return query.upper() if rng.random() < 0.3 else query
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Shelly", "shelly"),
+        ("  El   Primo ", "el primo"),
+        ("Pokémon", "pokemon"),
+        ("ÉCLAIR", "eclair"),
+        ("Ｆｕｌｌ", "full"),
+        ("Rock’n’roll", "rock'n'roll"),
+        ("Straße", "strasse"),
+    ],
+)
+def test_normalize_query(text: str, expected: str):
+    assert normalize_query(text) == expected
+
+
+@pytest.mark.parametrize("prefix", ["1", "a", "1A", "fF", "10", "abc", "7ff"])
+def test_hex_id_ranges(prefix: str):
+    ranges = hex_id_ranges(prefix)
+    for instance_id in range(1, 20_000):
+        expected = f"{instance_id:x}".startswith(prefix.lower())
+        assert any(start <= instance_id < end for start, end in ranges) == expected
+    # a range per number of digits, the last one capped to the largest ID
+    assert ranges[-1][1] <= MAX_INSTANCE_ID + 1
+    assert len(ranges) <= 16
+
+
+def test_hex_id_ranges_of_the_largest_ids():
+    assert hex_id_ranges("7fffffffffffffff") == [(MAX_INSTANCE_ID, MAX_INSTANCE_ID + 1)]
+    assert hex_id_ranges("8000000000000000") == []
+    assert hex_id_ranges("8") == [(8 << 4 * i, (9 << 4 * i)) for i in range(15)]
+
+
+@pytest.mark.parametrize("prefix", ["", "0", "01", "g", "1g", "shelly", "#1"])
+def test_hex_id_ranges_of_other_queries(prefix: str):
+    assert hex_id_ranges(prefix) == []
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matching_like_the_previous_filter(seed: int):
+    rng = random.Random(seed)
+    balls = random_balls(rng)
+    index = BallSearchIndex()
+    index.rebuild(balls[:40])  # type: ignore
+    for _ in range(200):
+        value = random_query(rng, balls)
+        query = normalize_query(value.replace(".", ""))
+        if not query or query != value.replace(".", "").lower():
+            # whitespace is collapsed now, it used to be matched as typed
+            continue
+        # the balls missing from the index are indexed on first use
+        assert set(index.matching(balls, query)) == matched_before(balls, value)  # type: ignore
+
+
+def test_matching_ignores_accents_and_missing_fields():
+    balls = [
+        make_ball(1, "Pokémon", None, None),
+        make_ball(2, "Shelly", "shel;shelby", None),
+        make_ball(3, "Colt", None, "Kolt;Colté"),
+    ]
+    index = BallSearchIndex()
+    index.rebuild(balls)  # type: ignore
+    assert index.matching(balls, normalize_query("POKEMON")) == [1]  # type: ignore
+    assert index.matching(balls, normalize_query("colte")) == [3]  # type: ignore
+    assert index.matching(balls, normalize_query("shelby")) == [2]  # type: ignore
+    assert index.matching(balls, normalize_query("none")) == []  # type: ignore
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_narrow_like_matching(seed: int):
+    rng = random.Random(seed)
+    balls = random_balls(rng)
+    index = BallSearchIndex()
+    index.rebuild(balls)  # type: ignore
+    for _ in range(100):
+        text = normalize_query(searched_text(rng.choice(balls)))
+        start = rng.randrange(len(text))
+        query = text[start : start + 1]
+        ball_ids = index.matching(balls, query)  # type: ignore
+        # each keystroke extends the previous query
+        for end in range(start + 2, min(start + 8, len(text)) + 1):
+            query = text[start:end]
+            ball_ids = index.narrow(ball_ids, query)
+            assert ball_ids == index.matching(balls, query)  # type: ignore
+
+
+def test_exact():
+    balls = [
+        make_ball(1, "El Primo", "primo", None),
+        make_ball(2, "Pokémon", None, None),
+        make_ball(3, "Primo", None, None),
+    ]
+    index = BallSearchIndex()
+    assert index.exact(balls, "el primo") == [1]  # type: ignore
+    assert index.exact(balls, "PRIMO") == [3]  # type: ignore
+    assert index.exact(balls, "pokemon") == [2]  # type: ignore
+    assert index.exact(balls, "prim") == []  # type: ignore
+
+
+def test_rebuild_bumps_the_version():
+    index = BallSearchIndex()
+    index.rebuild([make_ball(1, "Shelly", None, None)])  # type: ignore
+    version = index.version
+    index.rebuild([make_ball(2, "Colt", None, None)])  # type: ignore
+    assert index.version == version + 1
+    assert index.narrow([1, 2], "shelly") == []
+
+
+def test_autocomplete_sessions():
+    sessions: AutocompleteSessions[list[int]] = AutocompleteSessions()
+    assert sessions.get("user", "sh", 1) is None
+    sessions.set("user", "sh", 1, [1, 2])
+    assert sessions.get("user", "she", 1) == [1, 2]
+    assert sessions.get("user", "sh", 1) == [1, 2]
+    # a deleted character or another context starts over
+    assert sessions.get("user", "s", 1) is None
+    assert sessions.get("user", "she", 2) is None
+    assert sessions.get("other", "she", 1) is None
+
+
+def test_matching_like_the_database(database):
+    rng = random.Random(0)
+
+    async def run():
+        regime = await create_regime()
+        balls = []
+        for i, ball in enumerate(random_balls(rng, 30)):
+            balls.append(
+                await create_ball(
+                    f"{ball.country} {i}",
+                    regime,
+                    catch_names=ball.catch_names if i % 3 else None,
+                    translations=ball.translations if i % 4 else None,
+                )
+            )
+        index = BallSearchIndex()
+        index.rebuild(balls)
+        results = []
+        for _ in range(100):
+            value = random_query(rng, balls)
+            query = normalize_query(value.replace(".", ""))
+            if not query or query != value.replace(".", "").lower():
+                continue
+            # the previous filter, without the instance ID
+            matched = await (
+                Ball.annotate(
+                    searchable=RawSQL(
+                        "country || ' ' || COALESCE(catch_names, '') || ' ' || "
+                        "COALESCE(translations, '')"
+                    )
+                )
+                .filter(searchable__icontains=value.replace(".", ""))
+                .values_list("id", flat=True)
+            )
+            results.append((set(index.matching(balls, query)), set(matched)))
+        return results
+
+    for actual, expected in database(run):
+        assert actual == expected
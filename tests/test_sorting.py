@@ -0,0 +1,139 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from ballsdex.core.models import BallInstance
+from ballsdex.core.utils.paginator import KeysetPageSource
+from ballsdex.core.utils.sorting import SortingChoices, ordered_balls
+from tests.conftest import load_migration
+from tests.factories import (
+    create_ball,
+    create_instance,
+    create_player,
+    create_regime,
+    create_special,
+)
+
+PLAYER_ID = 100000000000000000
+
+# duplicates are read from the inventory counts, not from an index
+INDEXED_SORTS = [None, *(x for x in SortingChoices if x != SortingChoices.duplicates)]
+
+
+async def create_inventories():
+    regimes = [await create_regime(f"Regime {i}", rarity_rank=i) for i in range(3)]
+    regimes.append(await create_regime("Unranked"))
+    balls = [
+        await create_ball(
+            f"Ball {i}",
+            regimes[i % 4],
+            health=random.randint(1, 500),
+            attack=random.randint(1, 500),
+        )
+        for i in range(20)
+    ]
+    special = await create_special()
+    players = [await create_player(PLAYER_ID + i) for i in range(5)]
+    await BallInstance.bulk_create(
+        [
+            BallInstance(
+                ball=random.choice(balls),
+                player=player,
+                special=special if random.random() < 0.1 else None,
+                health_bonus=random.randint(-20, 20),
+                attack_bonus=random.randint(-20, 20),
+                favorite=random.random() < 0.1,
+            )
+            for player in players
+            for _ in range(60)
+        ]
+    )
+    return players
+
+
+async def plan(sql: str) -> str:
+    async with in_transaction() as connection:
+        # The table is too small for the costs to favor an index. Disabled nodes are still used
+        # when nothing else is possible: a sort is left only if no index gives the order.
+        await connection.execute_script("SET LOCAL enable_seqscan = off")
+        await connection.execute_script("SET LOCAL enable_sort = off")
+        _, rows = await connection.execute_query(f"EXPLAIN {sql}")
+    return "\n".join(x["QUERY PLAN"] for x in rows)
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize("sort", INDEXED_SORTS, ids=lambda x: x.name if x else "favorite")
+def test_sort_reads_an_index(database, sort: SortingChoices | None, reverse: bool):
+    async def run():
+        players = await create_inventories()
+        await Tortoise.get_connection("default").execute_script("ANALYZE")
+        queryset, ordering = ordered_balls(
+            sort, BallInstance.filter(player_id=players[0].pk), reverse=reverse
+        )
+        first_page = await plan(queryset.limit(26).sql(params_inline=True))
+
+        # the next page of a keyset pagination starts from the last row of the previous one
+        source = KeysetPageSource(queryset, ordering, per_page=25)
+        rows = await queryset.limit(25)
+        next_page = queryset.filter(source._after(rows[-1])).limit(26)
+        return first_page, await plan(next_page.sql(params_inline=True))
+
+    for query_plan in database(run):
+        assert "Index Scan" in query_plan, query_plan
+        assert "Sort" not in query_plan, query_plan
+
+
+def test_sort_keys_follow_the_catalog(database):
+    async def run():
+        regime = await create_regime(rarity_rank=3)
+        ball = await create_ball("Shelly", regime, health=100, attack=50)
+        player = await create_player(PLAYER_ID)
+        instance = await create_instance(ball, player, health_bonus=5, attack_bonus=-5)
+        await instance.refresh_from_db()
+        keys = [(instance.sort_country, instance.sort_rarity)]
+        keys.append((instance.sort_health, instance.sort_attack))
+
+        ball.country = "Colt"
+        ball.health = 200
+        await ball.save()
+        regime.rarity_rank = None
+        await regime.save()
+        await instance.refresh_from_db()
+        keys.append((instance.sort_country, instance.sort_rarity))
+        keys.append((instance.sort_health, instance.sort_attack))
+        return keys
+
+    no_rank = load_migration("0015_ballinstance_sort_keys").NO_RARITY_RANK
+    assert database(run) == [("Shelly", 3), (105, 45), ("Colt", no_rank), (205, 45)]
+
+
+def test_sort_keys_fill(database, django_connection, monkeypatch: pytest.MonkeyPatch):
+    migration = load_migration("0015_ballinstance_sort_keys")
+    # several batches, the last one partial
+    monkeypatch.setattr(migration, "FILL_BATCH_SIZE", 7)
+
+    async def create():
+        players = await create_inventories()
+        return {
+            x.pk: (x.sort_country, x.sort_rarity, x.sort_health, x.sort_attack)
+            for x in await BallInstance.filter(player_id__in=[x.pk for x in players])
+        }
+
+    expected = database(create)
+    with django_connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE ballinstance SET sort_country = '', sort_rarity = 0, sort_health = 0, "
+            "sort_attack = 0"
+        )
+    migration.fill_sort_keys(None, SimpleNamespace(connection=django_connection))
+
+    async def read():
+        return {
+            x.pk: (x.sort_country, x.sort_rarity, x.sort_health, x.sort_attack)
+            for x in await BallInstance.all()
+        }
+
+    assert database(read) == expected
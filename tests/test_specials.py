@@ -0,0 +1,141 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from ballsdex.core.utils.specials import SpecialSchedule
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def make_special(
+    name: str,
+    rarity: float,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> SimpleNamespace:
+    return SimpleNamespace(name=name, rarity=rarity, start_date=start, end_date=end)
+
+
+class Clock:
+    def __init__(self, time: datetime):
+        self.time = time
+
+    def __call__(self) -> datetime:
+        return self.time
+
+
+def make_schedule(time: datetime, *specials: SimpleNamespace) -> tuple[SpecialSchedule, Clock]:
+    clock = Clock(time)
+    schedule = SpecialSchedule(clock)
+    schedule.rebuild(specials)  # type: ignore
+    return schedule, clock
+
+
+def active(schedule: SpecialSchedule) -> list[str]:
+    return [x.name for x in schedule.current().population if x]
+
+
+EVENT = make_special("Event", 0.1, START, START + timedelta(days=1))
+
+
+@pytest.mark.parametrize(
+    "time, expected",
+    [
+        (START - MICROSECOND, []),
+        (START, ["Event"]),
+        (START + timedelta(hours=12), ["Event"]),
+        # end dates are inclusive
+        (START + timedelta(days=1), ["Event"]),
+        (START + timedelta(days=1) + MICROSECOND, []),
+    ],
+)
+def test_window_boundaries(time: datetime, expected: list[str]):
+    schedule, _ = make_schedule(time, EVENT)
+    assert active(schedule) == expected
+
+
+def test_boundaries_crossed_by_the_clock():
+    schedule, clock = make_schedule(START - MICROSECOND, EVENT)
+    assert active(schedule) == []
+    clock.time = START
+    assert active(schedule) == ["Event"]
+    window = schedule.current()
+    # reused until the end boundary
+    clock.time = START + timedelta(days=1)
+    assert schedule.current() is window
+    clock.time += MICROSECOND
+    assert active(schedule) == []
+
+
+def test_permanent_specials():
+    permanent = make_special("Shiny", 0.01)
+    schedule, clock = make_schedule(START, permanent, EVENT)
+    assert active(schedule) == ["Shiny", "Event"]
+    clock.time = datetime.max.replace(tzinfo=timezone.utc)
+    assert active(schedule) == ["Shiny"]
+    clock.time = datetime.min.replace(tzinfo=timezone.utc)
+    assert active(schedule) == ["Shiny"]
+
+
+def test_overlapping_events():
+    first = make_special("First", 0.1, START, START + timedelta(days=10))
+    second = make_special("Second", 0.2, START + timedelta(days=5), START + timedelta(days=15))
+    schedule, clock = make_schedule(START + timedelta(days=2), first, second)
+    assert active(schedule) == ["First"]
+    assert schedule.current().cum_weights == pytest.approx([0.1, 1])
+
+    clock.time = START + timedelta(days=5)
+    assert active(schedule) == ["First", "Second"]
+    assert schedule.current().cum_weights == pytest.approx([0.1, 0.3, 1])
+    assert schedule.current().start == START + timedelta(days=5)
+    assert schedule.current().end == START + timedelta(days=10) + MICROSECOND
+
+    clock.time = START + timedelta(days=10) + MICROSECOND
+    assert active(schedule) == ["Second"]
+    clock.time = START + timedelta(days=15) + MICROSECOND
+    assert active(schedule) == []
+
+
+def test_rebuild_drops_the_window():
+    schedule, _ = make_schedule(START, EVENT)
+    assert active(schedule) == ["Event"]
+    schedule.rebuild([])
+    assert active(schedule) == []
+
+
+def test_pick_without_specials():
+    schedule, _ = make_schedule(START)
+    assert schedule.pick(random.Random(0)) is None
+
+
+def test_weighted_pick():
+    rare = make_special("Rare", 0.05, START, START + timedelta(days=1))
+    common = make_special("Common", 0.25)
+    schedule, _ = make_schedule(START, rare, common)
+    rng = random.Random(42)
+    draws = 40_000
+    counts = Counter(getattr(schedule.pick(rng), "name", None) for _ in range(draws))
+    for name, weight in (("Rare", 0.05), ("Common", 0.25), (None, 0.7)):
+        assert counts[name] / draws == pytest.approx(weight, abs=0.01)
+
+
+def test_pick_matches_random_choices():
+    specials = [make_special(f"Special {i}", 0.1 * i, START) for i in range(1, 4)]
+    schedule, _ = make_schedule(START, *specials)
+    population = [*specials, None]
+    weights = [0.1, 0.2, 0.3, 0.4]
+    expected = random.Random(7).choices(population, weights, k=100)
+    rng = random.Random(7)
+    assert [schedule.pick(rng) for _ in range(100)] == expected
+
+
+def test_common_weight_is_never_negative():
+    specials = [make_special(f"Special {i}", 0.75, START) for i in range(2)]
+    schedule, _ = make_schedule(START, *specials)
+    assert schedule.current().cum_weights == pytest.approx([0.75, 1.5, 1.5])
+    rng = random.Random(0)
+    assert all(schedule.pick(rng) is not None for _ in range(1000))